@@ -59,6 +59,7 @@ class AccountNestedMixin(views.NestedObjectViewMixin):
 
 
 class AccountPublicNestedMixin(AccountNestedMixin):
+    public_cache = ['list']
     account_permission_classes = [
         BudgetObjPermission(
             get_budget=lambda obj: obj.budget,
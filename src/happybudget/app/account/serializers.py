@@ -7,7 +7,8 @@ from happybudget.app.group.serializers import GroupSerializer
 from happybudget.app.markup.serializers import MarkupSerializer
 from happybudget.app.subaccount.serializers import SubAccountPdfSerializer
 from happybudget.app.serializers import ModelSerializer
-from happybudget.app.tabling.serializers import row_order_serializer
+from happybudget.app.tabling.serializers import (
+    row_order_serializer, ValuesSerializer)
 
 from .models import Account, BudgetAccount, TemplateAccount
 
@@ -91,6 +92,21 @@ class TemplateAccountDetailSerializer(TemplateAccountSerializer):
             "ancestors", "table")
 
 
+class AccountValuesSerializer(ValuesSerializer):
+    columns = ('accumulated_value', )
+
+    def get_nominal_value_attribute(self, row):
+        return row['accumulated_value']
+
+
+class BudgetAccountValuesSerializer(AccountValuesSerializer):
+    serializer_class = BudgetAccountSerializer
+
+
+class TemplateAccountValuesSerializer(AccountValuesSerializer):
+    serializer_class = TemplateAccountSerializer
+
+
 class AccountPdfSerializer(AccountSimpleSerializer):
     type = serializers.CharField(read_only=True, source='pdf_type')
     nominal_value = serializers.FloatField(read_only=True)
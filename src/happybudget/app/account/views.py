@@ -14,7 +14,9 @@ from happybudget.app.markup.models import Markup
 from happybudget.app.markup.serializers import MarkupSerializer
 from happybudget.app.subaccount.serializers import (
     BudgetSubAccountSerializer,
-    TemplateSubAccountSerializer
+    TemplateSubAccountSerializer,
+    BudgetSubAccountValuesSerializer,
+    TemplateSubAccountValuesSerializer
 )
 from happybudget.app.subaccount.views import GenericSubAccountViewSet
 from happybudget.app.template.permissions import TemplateObjPermission
@@ -112,6 +114,13 @@ class AccountChildrenViewSet(
     (1) GET /accounts/<pk>/subaccounts
     (2) POST /accounts/<pk>/subaccounts
     """
+    read_from_replica = True
+    conditional = ['list']
+    values_serializer_classes = [
+        BudgetSubAccountValuesSerializer,
+        TemplateSubAccountValuesSerializer
+    ]
+
     @property
     def child_instance_cls(self):
         return self.instance.child_instance_cls
@@ -149,6 +158,9 @@ class GenericAccountViewSet(views.GenericViewSet):
         ]),
     )
 
+    def get_last_modified(self):
+        return self.instance.budget.updated_at
+
 
 @register_bulk_operations(
     base_cls=lambda context: context.view.instance_cls,
@@ -202,6 +214,8 @@ class AccountViewSet(
     (5) PATCH /accounts/<pk>/bulk-create-children/
     """
     queryset_cls = Account
+    conditional = ['retrieve']
+    public_cache = ['retrieve']
     permission_classes = [
         BudgetObjPermission(
             get_budget=lambda obj: obj.budget,
@@ -1,3 +1,5 @@
+from django.contrib.contenttypes.models import ContentType
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
 from happybudget.lib.drf.fields import GenericRelatedField
@@ -8,13 +10,16 @@ from happybudget.app.contact.models import Contact
 from happybudget.app.io.models import Attachment
 from happybudget.app.io.serializers import SimpleAttachmentSerializer
 from happybudget.app.markup.models import Markup
-from happybudget.app.markup.serializers import MarkupSimpleSerializer
-from happybudget.app.tabling.serializers import row_order_serializer
+from happybudget.app.markup.serializers import (
+    MarkupSimpleSerializer, MarkupSimpleValuesSerializer)
+from happybudget.app.tabling.serializers import (
+    row_order_serializer, ValuesSerializer)
 from happybudget.app.tagging.fields import TagField
 from happybudget.app.tagging.serializers import TagSerializer, ColorSerializer
 from happybudget.app.serializers import ModelSerializer
 from happybudget.app.subaccount.models import BudgetSubAccount
-from happybudget.app.subaccount.serializers import SubAccountAsOwnerSerializer
+from happybudget.app.subaccount.serializers import (
+    SubAccountAsOwnerSerializer, SubAccountAsOwnerValuesSerializer)
 from happybudget.app.user.fields import OwnershipPrimaryKeyRelatedField
 
 from .models import Actual, ActualType
@@ -142,3 +147,34 @@ class ActualSerializer(TaggedActualSerializer):
 @row_order_serializer(table_filter=lambda d: {'budget_id': d.budget.id})
 class ActualDetailSerializer(ActualSerializer):
     pass
+
+
+class ActualValuesSerializer(ValuesSerializer):
+    serializer_class = ActualSerializer
+    columns = ('content_type_id', 'object_id')
+    owner_serializer_classes = [
+        (BudgetSubAccount, SubAccountAsOwnerValuesSerializer),
+        (Markup, MarkupSimpleValuesSerializer),
+    ]
+
+    @cached_property
+    def owners(self):
+        owners = {}
+        for model_cls, serializer_cls in self.owner_serializer_classes:
+            content_type = ContentType.objects.get_for_model(model_cls)
+            serializer = serializer_cls(model_cls.objects.filter(
+                pk__in=self.queryset.filter(content_type=content_type)
+                .values('object_id')
+            ))
+            for data in serializer.data:
+                owners[(content_type.pk, data['id'])] = data
+        return owners
+
+    def represent_owner(self, row):
+        # Consistent with the generic foreign key, an owner that no longer
+        # exists is represented as None.
+        return self.owners.get((row['content_type_id'], row['object_id']))
+
+    def represent_attachments(self, row):
+        return self.serialize_related(
+            row, 'attachments', SimpleAttachmentSerializer)
@@ -0,0 +1,114 @@
+import collections
+import copy
+import threading
+import time
+
+from django.conf import settings
+
+
+CachedToken = collections.namedtuple(
+    'CachedToken', ['user', 'expires_at', 'generation'])
+
+
+class TokenCache:
+    """
+    A bounded, per-process LRU cache that stores the :obj:`User` associated
+    with a JWT token that has already been verified.
+
+    Verifying the JWT token stored in the cookies of a request requires
+    verifying the token's signature, checking the token against the blacklist
+    and fetching the :obj:`User` associated with the token from the database.
+    Since the same token is sent with every request the :obj:`User` makes until
+    the token is refreshed, the result of the verification can be reused for
+    subsequent requests.
+
+    Entries in the cache are keyed by the raw token, which includes the token's
+    signature, and are considered stale when any of the following occur:
+
+    (1) The refresh expiration of the token has passed.
+    (2) The entry has been in the cache longer than `JWT_TOKEN_CACHE_TTL`.
+    (3) The revocation generation of the :obj:`User` has changed since the
+        entry was stored, which happens when the :obj:`User` is saved, deleted
+        or logged out.
+
+    Since the cache is per-process, revoking the tokens of a :obj:`User` in one
+    process does not revoke them in other processes - which is why the
+    lifetime of each entry is also bounded by `JWT_TOKEN_CACHE_TTL`.
+
+    The cache is disabled when `JWT_TOKEN_CACHE_SIZE` is 0.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._generations = collections.defaultdict(int)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def max_size(self):
+        return settings.JWT_TOKEN_CACHE_SIZE
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, token):
+        """
+        Returns a copy of the :obj:`User` associated with the provided token if
+        the token was previously verified and the entry is not stale, otherwise
+        returns None.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time() \
+                    or entry.generation != self._generations[entry.user.pk]:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            user = entry.user
+        # A copy is returned such that values attributed to the User over the
+        # course of the request do not leak into subsequent requests.
+        return copy.deepcopy(user)
+
+    def set(self, token, user, expires_at):
+        """
+        Stores the provided :obj:`User` for the provided token, which must
+        have already been verified, until the provided expiration timestamp
+        or the configured TTL - whichever comes first.
+        """
+        if not self.enabled:
+            return
+        expires_at = min(
+            expires_at,
+            time.time() + settings.JWT_TOKEN_CACHE_TTL.total_seconds()
+        )
+        with self._lock:
+            self._entries[token] = CachedToken(
+                user=copy.deepcopy(user),
+                expires_at=expires_at,
+                generation=self._generations[user.pk]
+            )
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def revoke(self, user):
+        """
+        Invalidates all of the cached tokens associated with the provided
+        :obj:`User`, or the provided :obj:`User` ID.
+        """
+        with self._lock:
+            self._generations[getattr(user, 'pk', user)] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache()
@@ -73,7 +73,7 @@ def get_session_user(request, cache_stripe_info=True):
                 and cache_stripe_info \
                 and not permissions.request_is_admin(request):
             raw_token = parse_token_from_request(request)
-            token_user, token_obj = parse_token(raw_token)
+            token_user, token_obj = parse_token(raw_token, cache=True)
             # Unless the request indicates to force reload the data from Stripe's
             # API, use the billing related values from Stripe in the JWT token
             # to attribute the user.
@@ -90,7 +90,7 @@ def get_session_user(request, cache_stripe_info=True):
                     token_user.cache_stripe_from_token(token_obj)
             # Store the cached cookie user for subsequent middlewares so we
             # can avoid parsing the token multiple times (since it involves
-            # a DB query).
+            # a DB query when the verified token is not already cached).
             request._cached_cookie_user = token_user
         request._cached_user = session_user
     return request._cached_user
@@ -128,7 +128,7 @@ def get_cookie_user(request):
                 request._cached_cookie_user = session_user
             else:
                 raw_token = parse_token_from_request(request)
-                token_user, token_obj = parse_token(raw_token)
+                token_user, token_obj = parse_token(raw_token, cache=True)
                 if token_user.is_fully_authenticated:
                     assert token_obj is not None
                     # We want to also prepopulate billing related values on
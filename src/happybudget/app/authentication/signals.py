@@ -1,8 +1,11 @@
 from django import dispatch
+from django.contrib.auth.signals import user_logged_out
 
 from happybudget.app import signals
 from happybudget.app.budget.cache import budget_instance_cache
+from happybudget.app.user.models import User
 
+from .cache import token_cache
 from .models import PublicToken
 
 
@@ -16,3 +19,15 @@ def public_token_to_save(instance, **kwargs):
 def public_token_to_delete(instance, **kwargs):
     # Right now, the PulicToken model is only used for Budget(s).
     budget_instance_cache.invalidate(instance.instance)
+
+
+@dispatch.receiver(signals.post_save, sender=User)
+@dispatch.receiver(signals.post_delete, sender=User)
+def user_changed(instance, **kwargs):
+    token_cache.revoke(instance)
+
+
+@dispatch.receiver(user_logged_out)
+def user_logged_out_handler(user, **kwargs):
+    if user is not None:
+        token_cache.revoke(user)
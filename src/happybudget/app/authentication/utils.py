@@ -8,6 +8,7 @@ from rest_framework_simplejwt.settings import api_settings
 from happybudget.lib.utils import empty
 from happybudget.app.user.contrib import AnonymousUser
 
+from .cache import token_cache
 from .exceptions import BaseTokenError, InvalidToken, ExpiredToken
 from .models import AnonymousPublicToken, PublicToken
 from .tokens import AuthToken
@@ -56,12 +57,23 @@ def parse_public_token(token=empty, request=None, instance=None, public=False):
         return public_token
 
 
-def parse_token(token=empty, request=None, token_cls=None):
+def parse_token(token=empty, request=None, token_cls=None, cache=False):
+    """
+    Parses and verifies the provided JWT token, or the JWT token stored in the
+    cookies of the provided request, returning the :obj:`User` associated with
+    the token and the token itself.
+
+    If `cache` is True and the token is an :obj:`AuthToken`, the verification
+    of the token will be skipped if the token was already verified recently,
+    in which case the :obj:`User` will be returned from the
+    :obj:`happybudget.app.authentication.cache.TokenCache` instead of the
+    database.
+    """
     assert token is not empty or request is not None, \
         "Either the request or token must be provided."
     if token is empty:
         token = parse_token_from_request(request)
-        return parse_token(token=token, token_cls=token_cls)
+        return parse_token(token=token, token_cls=token_cls, cache=cache)
 
     assert token is None or isinstance(token, str), \
         "The token must be a valid string or None."
@@ -70,6 +82,14 @@ def parse_token(token=empty, request=None, token_cls=None):
         return AnonymousUser(), None
 
     token_cls = token_cls or AuthToken
+    cache = cache and token_cls is AuthToken
+    if cache:
+        user = token_cache.get(token)
+        if user is not None:
+            token_obj = token_cls(token, verify=False)
+            token_obj.set_exp()
+            return user, token_obj
+
     try:
         token_obj = token_cls(token, verify=False)
     except BaseTokenError as e:
@@ -102,4 +122,6 @@ def parse_token(token=empty, request=None, token_cls=None):
         logger.info("The provided token is invalid.")
         raise InvalidToken(user_id=user_id) from e
 
+    if cache:
+        token_cache.set(token, user, token_obj[exp_claim])
     return user, token_obj
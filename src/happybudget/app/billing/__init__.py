@@ -5,5 +5,7 @@ from stripe import Customer, Product, Subscription, SubscriptionSchedule  # noqa
 from .stripe_customer import StripeCustomer  # noqa
 from .constants import *  # noqa
 from .config import *  # noqa
+from .http_client import MetricsHTTPClient
 
 stripe.api_key = settings.STRIPE_API_SECRET
+stripe.default_http_client = MetricsHTTPClient()
@@ -0,0 +1,195 @@
+import collections
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from stripe.util import convert_to_stripe_object
+
+from happybudget.app import metrics
+
+
+logger = logging.getLogger('happybudget')
+
+
+StripeCacheStats = collections.namedtuple(
+    'StripeCacheStats', ['hits', 'misses'])
+
+
+class StripeCache:
+    """
+    A TTL cache for objects retrieved from Stripe's API that is shared by all
+    of the requests handled by a process, and when the cache is enabled, all
+    of the processes using the same Redis cache.
+
+    Looking up the billing status or product of a :obj:`User`, or the products
+    and prices available for purchase, would otherwise require a blocking HTTP
+    request to Stripe's API - which is especially costly since these lookups
+    are performed in the permission checks of many endpoints.
+
+    Objects are stored in one of two places:
+
+    (1) The Django cache (Redis), when `CACHE_ENABLED` is True, such that the
+        objects are shared by all processes.
+    (2) A process-wide, in-memory store, when `CACHE_ENABLED` is False.
+
+    An in-memory layer is never placed in front of the Django cache, since
+    invalidating an object only clears the memory of the process that the
+    invalidation is performed in - and every other process would continue to
+    serve the invalidated object.
+
+    Both stores hold the serialized form of the Stripe object, such that
+    modifications made to an object returned from the cache do not affect
+    the cached object.
+
+    Cached objects expire after `STRIPE_CACHE_TTL`, and are explicitly
+    invalidated when Stripe notifies the application of changes to the object
+    via the webhook endpoint, or when the application changes the object
+    itself (e.g. after a checkout).  Setting `STRIPE_CACHE_TTL` to 0 disables
+    the cache.
+
+    Note:
+    ----
+    Without a shared cache, invalidations only apply to the process that
+    receives the webhook event or changes the object.  The other Gunicorn and
+    Celery processes can serve the invalidated object until it expires, so
+    `STRIPE_CACHE_TTL` is the upper bound on how stale a billing status or
+    product can be when `CACHE_ENABLED` is False.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def ttl(self):
+        return settings.STRIPE_CACHE_TTL.total_seconds()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    @property
+    def shared(self):
+        return settings.CACHE_ENABLED
+
+    @property
+    def stats(self):
+        return StripeCacheStats(hits=self._hits, misses=self._misses)
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def cache_key(object_type, obj_id=None):
+        if obj_id is None:
+            return f"stripe-{object_type}"
+        return f"stripe-{object_type}-{obj_id}"
+
+    @staticmethod
+    def serialize(value):
+        if isinstance(value, list):
+            return [v.to_dict_recursive() for v in value]
+        elif value is not None:
+            return value.to_dict_recursive()
+        return None
+
+    @staticmethod
+    def deserialize(value):
+        if isinstance(value, list):
+            return [convert_to_stripe_object(v) for v in value]
+        elif value is not None:
+            return convert_to_stripe_object(value)
+        return None
+
+    def _get(self, key):
+        if self.shared:
+            value = cache.get(key, default=self)
+            if value is not self:
+                return True, value
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    return True, value
+                del self._entries[key]
+        return False, None
+
+    def _set(self, key, value):
+        if self.shared:
+            cache.set(key, value, self.ttl)
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+
+    def get(self, object_type, obj_id, fetch):
+        """
+        Returns the Stripe object of the provided type and ID from the cache,
+        retrieving it via the provided callable and storing it in the cache if
+        it is not already cached.
+
+        The provided callable can return a single Stripe object, a list of
+        Stripe objects or None.
+        """
+        if not self.enabled:
+            return fetch()
+        key = self.cache_key(object_type, obj_id)
+        found, value = self._get(key)
+        if found:
+            with self._lock:
+                self._hits += 1
+            metrics.CACHE_REQUESTS.inc(cache='stripe', result='hit')
+            return self.deserialize(value)
+        with self._lock:
+            self._misses += 1
+        metrics.CACHE_REQUESTS.inc(cache='stripe', result='miss')
+        value = fetch()
+        self._set(key, self.serialize(value))
+        return value
+
+    def invalidate(self, object_type, obj_id=None):
+        key = self.cache_key(object_type, obj_id)
+        logger.debug(f"Invalidating Stripe cache key {key}.")
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.shared:
+            cache.delete(key)
+
+    def invalidate_customer(self, customer_id):
+        self.invalidate('customer', customer_id)
+        self.invalidate('customer-subscription', customer_id)
+
+    def invalidate_event(self, event):
+        """
+        Invalidates the cached Stripe objects that are affected by the
+        provided event that was received from Stripe's webhook.
+        """
+        obj = event['data']['object']
+        object_type = obj.get('object')
+        if object_type == 'customer':
+            self.invalidate_customer(obj['id'])
+        elif object_type == 'product':
+            self.invalidate('product', obj['id'])
+            self.invalidate('products')
+        elif object_type == 'price':
+            self.invalidate('prices')
+        # Events for objects that belong to a customer, like subscriptions and
+        # invoices, affect the data cached for that customer.
+        customer = obj.get('customer')
+        if customer is not None:
+            self.invalidate_customer(getattr(customer, 'id', customer))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+stripe_cache = StripeCache()
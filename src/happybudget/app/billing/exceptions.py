@@ -19,6 +19,7 @@ class BillingErrorCodes:
     STRIPE_REQUEST_ERROR = "stripe_request_error"
     CHECKOUT_ERROR = "checkout_error"
     CHECKOUT_SESSION_INACTIVE = "checkout_session_inactive"
+    INVALID_WEBHOOK = "invalid_webhook"
 
 
 class BillingError(exceptions.BadRequest):
@@ -42,6 +43,12 @@ class StripeBadRequest(BillingError):
     default_detail = _("There was a Stripe error.")
 
 
+class InvalidWebhookError(BillingError):
+    error_type = 'billing'
+    default_code = BillingErrorCodes.INVALID_WEBHOOK
+    default_detail = _("The webhook event could not be verified.")
+
+
 class ProductPermissionError(
         ProductPermissionIdMixin, exceptions.PermissionErr):
     default_detail = _("The account is not subscribed to the correct product.")
@@ -0,0 +1,25 @@
+from stripe.http_client import new_default_http_client
+
+from happybudget.app import metrics
+
+
+class MetricsHTTPClient:
+    """
+    Wraps the HTTP client that Stripe's library uses to communicate with
+    Stripe's API such that the requests made to Stripe's API are tracked in
+    the application metrics.
+    """
+
+    def __init__(self, client=None):
+        self._client = client or new_default_http_client()
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def request_with_retries(self, *args, **kwargs):
+        with metrics.track_outbound('stripe'):
+            return self._client.request_with_retries(*args, **kwargs)
+
+    def request_stream_with_retries(self, *args, **kwargs):
+        with metrics.track_outbound('stripe'):
+            return self._client.request_stream_with_retries(*args, **kwargs)
@@ -3,6 +3,8 @@ import logging
 from django.utils.functional import cached_property
 
 from happybudget.conf import suppress_with_setting
+
+from .cache import stripe_cache
 from .utils import (
     get_product_internal_id, request_until_all_received, subscription_status)
 from . import stripe
@@ -109,10 +111,12 @@ class StripeCustomer:
 
     def flush_cache(self, keys=None):
         """
-        Clears @cached_stripe_property(s) on the instance from local memory
-        so that subsequent access of the property will force the cache to
-        be reloaded from Stripe's API.
+        Clears @cached_stripe_property(s) on the instance from local memory,
+        along with the Stripe objects associated with the customer in the
+        shared :obj:`StripeCache`, so that subsequent access of the property
+        will force the cache to be reloaded from Stripe's API.
         """
+        stripe_cache.invalidate_customer(self.stripe_id)
         keys = keys or []
         properties = self.stripe_cached_properties[:]
         if keys:
@@ -127,9 +131,13 @@ class StripeCustomer:
     @cached_stripe_property
     def data(self):
         try:
-            return stripe.Customer.retrieve(self.stripe_id, expand=[
-                'subscriptions'
-            ])
+            return stripe_cache.get(
+                'customer',
+                self.stripe_id,
+                lambda: stripe.Customer.retrieve(self.stripe_id, expand=[
+                    'subscriptions'
+                ])
+            )
         except stripe.error.InvalidRequestError as exc:
             # This exception shouldn't be raised, but if so we should log it
             # as it indicates a customer that somehow has an invalid stripe_id.
@@ -154,14 +162,20 @@ class StripeCustomer:
             # By default, the Customer object only includes active subscriptions.
             # To retrieve cancelled subscriptions, we need to list the
             # subscriptions by customer.
-            inactive_subscriptions = stripe.Subscription.list(
-                customer=self.stripe_id,
-                status='all',
-                limit=1
+            def retrieve_inactive_subscription():
+                inactive_subscriptions = stripe.Subscription.list(
+                    customer=self.stripe_id,
+                    status='all',
+                    limit=1
+                )
+                if inactive_subscriptions:
+                    return inactive_subscriptions.data[0]
+                return None
+            return stripe_cache.get(
+                'customer-subscription',
+                self.stripe_id,
+                retrieve_inactive_subscription
             )
-            if inactive_subscriptions:
-                return inactive_subscriptions.data[0]
-            return None
         return self.data.subscriptions.data[0]
 
     @property
@@ -2,7 +2,7 @@ from django.urls import path
 
 from .views import (
     ProductView, CheckoutSessionViewSet, SyncCheckoutSessionViewSet,
-    PortalSessionViewSet, SubscriptionView)
+    PortalSessionViewSet, SubscriptionView, StripeWebhookView)
 
 
 app_name = "billing"
@@ -44,5 +44,12 @@ urlpatterns = [
             hidden=lambda settings: not settings.BILLING_ENABLED
         ),
         name='sync-checkout-session'
+    ),
+    path(
+        'webhook/',
+        StripeWebhookView.as_view(
+            hidden=lambda settings: not settings.BILLING_ENABLED
+        ),
+        name='webhook'
     )
 ]
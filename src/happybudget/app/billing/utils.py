@@ -2,6 +2,7 @@ import datetime
 import logging
 import time
 
+from .cache import stripe_cache
 from .constants import StripeSubscriptionStatus, BillingStatus
 from .exceptions import StripeBadRequest, UnconfiguredProductException
 from . import stripe
@@ -13,7 +14,8 @@ logger = logging.getLogger('happybudget')
 def get_product_internal_id(product):
     product_id = product
     if not isinstance(product, stripe.Product):
-        product = stripe.Product.retrieve(product)
+        product = stripe_cache.get(
+            'product', product, lambda: stripe.Product.retrieve(product_id))
     else:
         product_id = product.id
     if 'internal_id' not in product.metadata:
@@ -82,7 +84,8 @@ def request_until_all_received(func, *args, **kwargs):
 
 def get_products():
     try:
-        products = request_until_all_received(stripe.Product.list, active=True)
+        products = stripe_cache.get('products', None, lambda: (
+            request_until_all_received(stripe.Product.list, active=True)))
     except stripe.error.InvalidRequestError as exc:
         logger.error(
             "Stripe HTTP Error: Could not retrieve products from Stripe.",
@@ -95,7 +98,8 @@ def get_products():
             "Could not retrieve products from Stripe.") from exc
     else:
         try:
-            prices = request_until_all_received(stripe.Price.list)
+            prices = stripe_cache.get('prices', None, lambda: (
+                request_until_all_received(stripe.Price.list)))
         except stripe.error.InvalidRequestError as exc:
             logger.error(
                 "Stripe HTTP Error: Could not retrieve prices from Stripe.",
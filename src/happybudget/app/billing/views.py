@@ -1,11 +1,15 @@
 import logging
 
+from django.conf import settings
+from django.http import Http404
+
 from rest_framework import mixins, response, status
 
-from happybudget.app import views, cache
+from happybudget.app import views, cache, permissions
 from happybudget.app.user.serializers import UserSerializer
 
-from .exceptions import StripeBadRequest
+from .cache import stripe_cache
+from .exceptions import StripeBadRequest, InvalidWebhookError
 from .permissions import (
     IsStripeCustomerPermission,
     IsNotStripeCustomerPermission
@@ -116,3 +120,33 @@ class ProductView(mixins.ListModelMixin, views.GenericViewSet):
 
     def get_queryset(self):
         return get_products()
+
+
+class StripeWebhookView(views.GenericView):
+    """
+    Receives events from Stripe's webhook such that the Stripe objects cached
+    in the :obj:`StripeCache` that are affected by the event are invalidated.
+
+    The endpoint is disabled when `STRIPE_WEBHOOK_SECRET` is not configured,
+    since the events cannot be verified without it.
+    """
+    authentication_classes = []
+    permission_classes = (permissions.AllowAny, )
+
+    def post(self, request, *args, **kwargs):
+        if not settings.STRIPE_WEBHOOK_SECRET:
+            raise Http404()
+        try:
+            event = stripe.Webhook.construct_event(
+                request.body,
+                request.META.get('HTTP_STRIPE_SIGNATURE'),
+                settings.STRIPE_WEBHOOK_SECRET
+            )
+        except (ValueError, stripe.error.SignatureVerificationError) as e:
+            logger.warning(
+                "Received a Stripe webhook event that could not be verified.",
+                extra={'error': str(e)}
+            )
+            raise InvalidWebhookError() from e
+        stripe_cache.invalidate_event(event)
+        return response.Response(status=status.HTTP_200_OK)
@@ -0,0 +1,132 @@
+from django.contrib.contenttypes.models import ContentType
+from django.utils.functional import cached_property
+
+from happybudget.lib.utils import ensure_iterable
+
+from happybudget.app.collaborator.models import Collaborator
+from happybudget.app.user.mixins import get_ownership_field
+
+
+class BudgetAccess:
+    """
+    Represents the access that the :obj:`User` associated with a request has
+    to a specific :obj:`Budget`, in regard to the following considerations:
+
+    (1) Whether or not the :obj:`User` owns the :obj:`Budget`.
+    (2) The access type of the :obj:`User` if they are a collaborator on the
+        :obj:`Budget`.
+    (3) Whether or not the public token on the request grants access to the
+        :obj:`Budget`.
+    (4) Whether or not the :obj:`User` is entitled to the :obj:`Budget` based
+        on the products they are subscribed to.
+
+    Each consideration is lazily evaluated the first time it is accessed and
+    then remembered for the lifetime of the request.  This is important because
+    on nested endpoints, the same :obj:`Budget` is permissioned several times
+    per request - once for the nested object lookup, once for the view's object
+    level permissions and again in the context of bulk actions - and each
+    permission class would otherwise perform its own queries.
+
+    The :obj:`BudgetAccess` should not be instantiated directly, but obtained
+    via :obj:`get_budget_access` such that it is shared by every permission
+    class that is evaluated in the context of the same request.
+    """
+    def __init__(self, request, budget):
+        self.request = request
+        self.budget = budget
+        self._has_products = {}
+
+    @property
+    def user(self):
+        return self.request.user
+
+    @cached_property
+    def content_type(self):
+        return ContentType.objects.get_for_model(type(self.budget))
+
+    @property
+    def is_annotated(self):
+        """
+        Returns whether or not the :obj:`Budget` was annotated with the access
+        of the :obj:`User` associated with the request via
+        :obj:`BudgetQuerier.annotate_access`, in which case the access can be
+        determined without performing any additional queries.
+        """
+        return self.user is not None and self.user.is_authenticated \
+            and getattr(self.budget, 'access_user_id', None) == self.user.pk
+
+    @cached_property
+    def is_owner(self):
+        if self.is_annotated:
+            return self.budget.user_is_owner
+        # Compare the ID of the owner instead of the owner itself such that we
+        # do not need to query for the User.
+        field = self.budget._meta.get_field(
+            get_ownership_field(type(self.budget)))
+        return self.user is not None and self.user.is_authenticated \
+            and getattr(self.budget, field.attname) == self.user.pk
+
+    @cached_property
+    def collaborator_access_type(self):
+        """
+        Returns the access type of the :obj:`Collaborator` associated with the
+        :obj:`User` and the :obj:`Budget`, or None if the :obj:`User` is not
+        a collaborator on the :obj:`Budget`.
+        """
+        if self.user is None or not self.user.is_authenticated:
+            return None
+        elif self.is_annotated:
+            return self.budget.user_access_type
+        return Collaborator.objects.filter(
+            content_type=self.content_type,
+            object_id=self.budget.pk,
+            user=self.user
+        ).values_list('access_type', flat=True).first()
+
+    @property
+    def is_collaborator(self):
+        return self.collaborator_access_type is not None
+
+    @cached_property
+    def is_public(self):
+        public_token = self.request.public_token
+        return public_token.is_authenticated \
+            and public_token.instance == self.budget
+
+    @cached_property
+    def is_first_created(self):
+        return self.budget.is_first_created
+
+    def has_products(self, products):
+        key = products
+        if products != '__any__':
+            key = tuple(ensure_iterable(products))
+        if key not in self._has_products:
+            self._has_products[key] = self.user.has_product(products)
+        return self._has_products[key]
+
+
+def get_budget_access(request, budget):
+    """
+    Returns the :obj:`BudgetAccess` for the :obj:`User` associated with the
+    provided request and the provided :obj:`Budget`, creating it if it was
+    not already created earlier in the request.
+
+    The :obj:`BudgetAccess` instances are stored on the underlying
+    :obj:`django.http.HttpRequest`, not the :obj:`rest_framework.request.Request`
+    that wraps it, such that they are shared between the middleware, the
+    view's object lookup and any serializer that has the request in its
+    context.
+    """
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_cached_budget_access'):
+        http_request._cached_budget_access = {}
+
+    key = (
+        getattr(request.user, 'pk', None),
+        ContentType.objects.get_for_model(type(budget)).pk,
+        budget.pk
+    )
+    if key not in http_request._cached_budget_access:
+        http_request._cached_budget_access[key] = BudgetAccess(request, budget)
+    return http_request._cached_budget_access[key]
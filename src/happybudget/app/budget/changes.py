@@ -0,0 +1,174 @@
+"""
+Recording of the rows of a :obj:`Budget` or :obj:`Template` whose calculated
+values change as a result of a write, such that clients can be provided with
+just the rows that changed instead of the entire :obj:`Budget` or
+:obj:`Template`.
+
+While inside of the :obj:`recording` context, the rows whose calculated values
+change are collected as they are saved.  When the changes are flushed, the
+`version` of each affected :obj:`Budget` or :obj:`Template` is incremented and
+the rows are stored as having changed at that version, such that the rows that
+changed after a given version can be determined with a single query.
+
+Note that changes are only recorded inside of the :obj:`recording` context,
+which is entered for requests that may write by the
+:obj:`happybudget.app.middleware.BudgetChangesMiddleware`.  Changes that are
+performed programmatically outside of that context are not recorded.
+"""
+import collections
+import contextlib
+import threading
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+
+from happybudget.lib.utils import ensure_iterable
+
+from .models import BaseBudget, BudgetChange
+
+
+ROW_TYPES = ('budget', 'account', 'subaccount')
+
+
+class ChangeRecorder(threading.local):
+    def __init__(self):
+        self.depth = 0
+        self.changes = collections.defaultdict(set)
+
+
+recorder = ChangeRecorder()
+
+
+class recording(contextlib.ContextDecorator):
+    """
+    Context manager or function decorator that records the rows whose
+    calculated values change inside of the context and flushes the recorded
+    changes when the outermost context exits without an error.
+    """
+    def __enter__(self):
+        recorder.depth += 1
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        recorder.depth -= 1
+        if recorder.depth == 0:
+            if exc_type is None:
+                flush()
+            recorder.changes.clear()
+        return False
+
+    def discard(self):
+        """
+        Discards the changes that were recorded but not yet flushed, which is
+        necessary when the writes that caused them were rolled back.
+        """
+        recorder.changes.clear()
+
+
+def calculated_values_changed(instance):
+    # Fields that were deferred when the instance was loaded cannot have
+    # changed.
+    previous = instance.get_last_saved_data()
+    return any([
+        f in previous and f in instance.__dict__
+        and instance.__dict__[f] != previous[f]
+        for f in instance.CALCULATED_FIELDS
+    ])
+
+
+def record(instances):
+    """
+    Records the provided :obj:`Budget`, :obj:`Template`, :obj:`Account` or
+    :obj:`SubAccount` instances as having changed if their calculated values
+    changed since they were last saved.  This must be called before the
+    instances are saved, or from the `post_save` signal, since saving the
+    instance resets the values that the changes are determined relative to.
+    """
+    if recorder.depth == 0:
+        return
+    for instance in ensure_iterable(instances):
+        if calculated_values_changed(instance):
+            budget = instance
+            if not isinstance(instance, BaseBudget):
+                budget = instance.budget
+            recorder.changes[budget.pk].add((type(instance), instance.pk))
+
+
+def record_rows(budget_pk, model_cls, pks):
+    """
+    Records the rows of the provided model class with the provided primary
+    keys as having changed, for writes that are not performed through model
+    instances - like set based updates.
+    """
+    if recorder.depth == 0:
+        return
+    recorder.changes[budget_pk].update([(model_cls, pk) for pk in pks])
+
+
+def flush():
+    """
+    Persists the changes that were recorded since the last flush, returning
+    the new version of each :obj:`Budget` or :obj:`Template` that changed
+    indexed by its primary key.
+    """
+    changes = dict(recorder.changes)
+    recorder.changes.clear()
+    if not changes:
+        return {}
+
+    # The version bump and the changed rows are committed together, such that
+    # a client never observes a new version without the rows that changed at
+    # that version.  The rows of the budgets are locked, in a consistent
+    # order, such that concurrent flushes for the same budget are serialized.
+    with transaction.atomic():
+        budgets = BaseBudget.non_polymorphic.filter(pk__in=changes)
+        list(budgets.select_for_update().order_by('pk').values_list('pk'))
+        budgets.update(version=models.F('version') + 1)
+        # Budgets that were deleted after the changes were recorded will not
+        # be included.
+        versions = dict(budgets.values_list('pk', 'version'))
+
+        stale = models.Q(pk__in=[])
+        created = []
+        for budget_pk, version in versions.items():
+            rows = collections.defaultdict(list)
+            for model_cls, pk in changes[budget_pk]:
+                rows[ContentType.objects.get_for_model(model_cls)].append(pk)
+            for content_type, pks in rows.items():
+                stale |= models.Q(content_type=content_type, object_id__in=pks)
+                created += [BudgetChange(
+                    budget_id=budget_pk,
+                    content_type=content_type,
+                    object_id=pk,
+                    version=version
+                ) for pk in pks]
+        BudgetChange.objects.filter(stale).delete()
+        BudgetChange.objects.bulk_create(created)
+    return versions
+
+
+def get_changes(budget, since):
+    """
+    Returns the calculated values of the rows of the provided :obj:`Budget`
+    or :obj:`Template` that changed after the provided version, with a fixed
+    number of queries per type of row.
+    """
+    pks = collections.defaultdict(list)
+    changed = BudgetChange.objects.filter(budget=budget, version__gt=since)
+    for content_type_id, object_id in changed.values_list(
+            'content_type_id', 'object_id'):
+        pks[content_type_id].append(object_id)
+
+    data = []
+    for content_type_id in pks:
+        model_cls = ContentType.objects.get_for_id(content_type_id) \
+            .model_class()
+        # Rows that were deleted after they changed will not be included.
+        rows = model_cls.objects.filter(pk__in=pks[content_type_id]) \
+            .order_by('pk') \
+            .values('pk', *model_cls.CALCULATED_FIELDS)
+        for row in rows:
+            pk = row.pop('pk')
+            data.append({'id': pk, 'type': model_cls.type, **row})
+    # Order the rows from the top of the budget tree downwards.
+    return sorted(data, key=lambda r: (ROW_TYPES.index(r['type']), r['id']))
@@ -0,0 +1,331 @@
+"""
+Exports of the line items and actuals of a :obj:`BaseBudget` as rows of a
+spreadsheet.
+
+The rows are generated lazily, iterating over the relevant querysets with
+`iterator(chunk_size=...)` - which uses server side cursors when the database
+supports them - such that the memory used to export a budget does not grow
+with the size of the budget.  The line items are exported one chunk of
+`EXPORT_ACCOUNT_CHUNK_SIZE` accounts at a time, loading the subaccounts nested
+under each chunk with one query per level of nesting.  Since the subaccounts
+are exported depth first, those of a chunk of accounts are held in memory
+until the chunk is exported - so the memory used is bounded by the size of the
+subtrees of that many accounts, not by the size of the budget.  The
+many-to-many relationships of each row, such as the fringes and markups, are
+resolved once per chunk of rows instead of once per row.
+
+Since the rows are streamed, the queries are performed while the response is
+consumed - after the view has returned.  This means that they are not
+performed inside of the request's transaction (`ATOMIC_REQUESTS`) and are not
+routed to the read replica or included in the request metrics.  Each query
+is performed in autocommit mode against the primary database, so an export
+of a budget that is being edited concurrently may reflect some of the edits
+and not others.
+"""
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils.text import slugify
+
+from happybudget.lib.utils import conditionally_separate_strings
+from happybudget.lib.utils.spreadsheets import (
+    SpreadsheetFormats, CONTENT_TYPES, stream_spreadsheet)
+
+from happybudget.app import exceptions
+from happybudget.app.actual.models import Actual
+from happybudget.app.markup.models import Markup
+
+
+PATH_SEPARATOR = " / "
+
+LINE_COLUMNS = [
+    'Path', 'Type', 'Identifier', 'Description', 'Contact', 'Quantity', 'Unit',
+    'Multiplier', 'Rate', 'Fringes', 'Markups', 'Nominal Value',
+    'Fringe Contribution', 'Markup Contribution', 'Estimated', 'Actual',
+    'Variance'
+]
+
+ACTUAL_COLUMNS = [
+    'Name', 'Owner', 'Date', 'Type', 'Contact', 'Purchase Order',
+    'Payment ID', 'Notes', 'Value'
+]
+
+ACCOUNT_FIELDS = (
+    'pk', 'identifier', 'description', 'accumulated_value', 'actual',
+    'accumulated_fringe_contribution', 'markup_contribution',
+    'accumulated_markup_contribution'
+)
+
+SUBACCOUNT_FIELDS = ACCOUNT_FIELDS + (
+    'quantity', 'rate', 'multiplier', 'unit__title', 'fringe_contribution',
+    'has_children'
+)
+
+ACTUAL_FIELDS = (
+    'name', 'date', 'actual_type__title', 'contact__first_name',
+    'contact__last_name', 'purchase_order', 'payment_id', 'notes', 'value',
+    'content_type_id', 'object_id'
+)
+
+MARKUP_LABEL_FIELDS = ('identifier', 'description')
+
+
+def chunked(iterable, chunk_size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def label(*values):
+    """
+    Returns the first of the provided values that is not empty, which is used
+    to label instances by their identifier or, in its absence, description.
+    """
+    return ([v for v in values if v] + [""])[0]
+
+
+def related_labels(through, source_field, target_field, ids, fields):
+    """
+    Returns the comma separated labels of the instances related to each of
+    the provided IDs via the provided many-to-many through model, indexed by
+    the ID.
+    """
+    labels = dict([(pk, []) for pk in ids])
+    rows = through.objects.filter(**{f'{source_field}__in': ids}) \
+        .order_by(f'{target_field}__pk') \
+        .values_list(source_field, *[f'{target_field}__{f}' for f in fields])
+    for row in rows:
+        labels[row[0]].append(label(*row[1:]))
+    return dict([
+        (k, ", ".join([v for v in vs if v])) for k, vs in labels.items()])
+
+
+class BudgetExport:
+    """
+    Generates the rows of the spreadsheet exports of the provided
+    :obj:`BaseBudget`.
+
+    The line items are exported depth first, such that each
+    :obj:`Account` is followed by its :obj:`SubAccount`(s), each of which is
+    followed by its own children, with the full path of identifiers from the
+    :obj:`Account` included in each row.
+    """
+
+    def __init__(self, budget, chunk_size=None, account_chunk_size=None):
+        self.budget = budget
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self.account_chunk_size = account_chunk_size \
+            or settings.EXPORT_ACCOUNT_CHUNK_SIZE
+
+    @property
+    def account_cls(self):
+        return self.budget.account_cls
+
+    @property
+    def subaccount_cls(self):
+        return self.budget.subaccount_cls
+
+    def line_row(self, path, row, instance_type, fringes, markups, contact):
+        nominal_value = row['accumulated_value']
+        fringe_contribution = row['accumulated_fringe_contribution']
+        if instance_type == 'subaccount':
+            fringe_contribution += row['fringe_contribution']
+            # The nominal value of a SubAccount without children is not
+            # stored, but derived from its quantity, rate and multiplier.
+            if not row['has_children']:
+                nominal_value = 0.0
+                if row['quantity'] is not None and row['rate'] is not None:
+                    nominal_value = row['quantity'] * row['rate'] \
+                        * (row['multiplier'] or 1.0)
+        markup_contribution = row['markup_contribution'] \
+            + row['accumulated_markup_contribution']
+        estimated = nominal_value + fringe_contribution + markup_contribution
+        return [
+            PATH_SEPARATOR.join(path),
+            instance_type,
+            row['identifier'],
+            row['description'],
+            contact,
+            row.get('quantity'),
+            row.get('unit__title'),
+            row.get('multiplier'),
+            row.get('rate'),
+            fringes,
+            markups,
+            nominal_value,
+            fringe_contribution,
+            markup_contribution,
+            estimated,
+            row['actual'],
+            estimated - row['actual']
+        ]
+
+    def iterate_accounts(self):
+        qs = self.account_cls.objects.filter(parent=self.budget) \
+            .order_by('order').values(*ACCOUNT_FIELDS)
+        content_type = ContentType.objects.get_for_model(self.account_cls)
+        through = self.account_cls.markups.through
+        for chunk in chunked(
+                qs.iterator(self.chunk_size), self.account_chunk_size):
+            ids = [row['pk'] for row in chunk]
+            markups = related_labels(
+                through, 'account_id', 'markup', ids, MARKUP_LABEL_FIELDS)
+            children = self.load_subaccounts(content_type, ids)
+            for row in chunk:
+                path = [label(row['identifier'], row['description'])]
+                yield self.line_row(
+                    path, row, 'account', "", markups[row['pk']], None)
+                yield from self.iterate_subaccounts(
+                    children, content_type.pk, row['pk'], path)
+
+    def load_subaccounts(self, content_type, object_ids):
+        """
+        Loads the :obj:`SubAccount`(s) nested under the parents of the
+        provided content type and IDs, along with the labels of their
+        :obj:`Fringe`(s) and :obj:`Markup`(s), indexed by the content type ID
+        and ID of the parent of each :obj:`SubAccount`.
+
+        Each level of nesting is streamed with a single query, and the labels
+        of each chunk of rows in the level with a single query for each
+        relationship, such that the number of queries does not grow with the
+        number of parents.
+        """
+        subaccount_content_type = ContentType.objects.get_for_model(
+            self.subaccount_cls)
+        grandchildren = self.subaccount_cls.objects.filter(
+            content_type=subaccount_content_type,
+            object_id=models.OuterRef('pk')
+        )
+        fields = SUBACCOUNT_FIELDS + ('content_type_id', 'object_id')
+        if hasattr(self.subaccount_cls, 'contact'):
+            fields += ('contact__first_name', 'contact__last_name')
+
+        through = self.subaccount_cls.markups.through
+        fringe_through = self.subaccount_cls.fringes.through
+        children = {}
+        while object_ids:
+            level = self.subaccount_cls.objects \
+                .filter(content_type=content_type, object_id__in=object_ids) \
+                .annotate(has_children=models.Exists(grandchildren)) \
+                .order_by('order') \
+                .values(*fields)
+            object_ids = []
+            for chunk in chunked(
+                    level.iterator(self.chunk_size), self.chunk_size):
+                ids = [row['pk'] for row in chunk]
+                markups = related_labels(through, 'subaccount_id', 'markup',
+                    ids, MARKUP_LABEL_FIELDS)
+                fringes = related_labels(
+                    fringe_through, 'subaccount_id', 'fringe', ids, ('name', ))
+                for row in chunk:
+                    row['markups'] = markups[row['pk']]
+                    row['fringes'] = fringes[row['pk']]
+                    children.setdefault(
+                        (row['content_type_id'], row['object_id']), []) \
+                        .append(row)
+                    if row['has_children']:
+                        object_ids.append(row['pk'])
+            content_type = subaccount_content_type
+        return children
+
+    def iterate_subaccounts(self, children, content_type_id, object_id,
+            parent_path):
+        for row in children.get((content_type_id, object_id), []):
+            path = parent_path + [label(row['identifier'], row['description'])]
+            contact = None
+            if 'contact__first_name' in row:
+                contact = conditionally_separate_strings([
+                    row['contact__first_name'],
+                    row['contact__last_name']
+                ]) or None
+            yield self.line_row(
+                path,
+                row,
+                'subaccount',
+                row['fringes'],
+                row['markups'],
+                contact
+            )
+            if row['has_children']:
+                content_type = ContentType.objects.get_for_model(
+                    self.subaccount_cls)
+                yield from self.iterate_subaccounts(
+                    children, content_type.pk, row['pk'], path)
+
+    def lines(self):
+        return self.iterate_accounts()
+
+    def owner_labels(self, chunk):
+        """
+        Returns the labels of the owners of the provided actuals, which can
+        either be :obj:`SubAccount`(s) or :obj:`Markup`(s), indexed by the
+        content type and ID of each owner.
+        """
+        labels = {}
+        owners = {}
+        for row in chunk:
+            if row['object_id'] is not None:
+                owners.setdefault(row['content_type_id'], set()).add(
+                    row['object_id'])
+        for content_type_id, ids in owners.items():
+            model_cls = ContentType.objects.get_for_id(content_type_id) \
+                .model_class()
+            if model_cls not in (self.subaccount_cls, Markup):
+                continue
+            # Since we only need the fields of the base model, use the non
+            # polymorphic manager when it exists.
+            manager = getattr(model_cls, 'non_polymorphic', model_cls.objects)
+            for pk, identifier, description in manager.filter(pk__in=ids) \
+                    .values_list('pk', 'identifier', 'description'):
+                labels[(content_type_id, pk)] = label(identifier, description)
+        return labels
+
+    def actuals(self):
+        qs = Actual.objects.filter(budget=self.budget).order_by('order') \
+            .values(*ACTUAL_FIELDS)
+        for chunk in chunked(qs.iterator(self.chunk_size), self.chunk_size):
+            owners = self.owner_labels(chunk)
+            for row in chunk:
+                yield [
+                    row['name'],
+                    owners.get((row['content_type_id'], row['object_id'])),
+                    row['date'],
+                    row['actual_type__title'],
+                    conditionally_separate_strings([
+                        row['contact__first_name'],
+                        row['contact__last_name']
+                    ]) or None,
+                    row['purchase_order'],
+                    row['payment_id'],
+                    row['notes'],
+                    row['value']
+                ]
+
+
+def export_response(request, budget, name, header, rows):
+    """
+    Returns a :obj:`StreamingHttpResponse` that streams the provided rows as
+    a spreadsheet attachment, in the format indicated by the `file_type` query
+    parameter of the request.
+    """
+    file_format = request.query_params.get(
+        'file_type', SpreadsheetFormats.CSV)
+    if file_format not in SpreadsheetFormats.__all__:
+        raise exceptions.BadRequest(
+            f"The file type {file_format} is not supported.  Supported file "
+            f"types are {', '.join(SpreadsheetFormats.__all__)}."
+        )
+    response = StreamingHttpResponse(
+        stream_spreadsheet(file_format, header, rows, sheet_name=name),
+        content_type=CONTENT_TYPES[file_format]
+    )
+    filename = slugify(f"{budget.name} {name}") or name.lower()
+    response['Content-Disposition'] = \
+        f'attachment; filename="{filename}.{file_format}"'
+    return response
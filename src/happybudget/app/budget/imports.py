@@ -0,0 +1,247 @@
+"""
+Imports of the line items and actuals of a :obj:`BaseBudget` from the rows of
+a CSV document, performed by an :obj:`happybudget.app.io.imports.ImportJob`.
+
+The columns of the imported documents mirror the columns of the spreadsheet
+exports of a :obj:`BaseBudget`, such that an exported document can be
+imported into another :obj:`BaseBudget` after the columns that are derived,
+such as the estimated values, are removed.
+"""
+from django.contrib.contenttypes.models import ContentType
+
+from rest_framework import serializers
+
+from happybudget.app.account.cache import (
+    account_instance_cache, account_children_cache)
+from happybudget.app.actual.models import Actual, ActualType
+from happybudget.app.io.imports import (
+    Importer, LookupField, AMBIGUOUS, build_lookup, normalize_label)
+from happybudget.app.subaccount.models import SubAccountUnit
+
+from .cache import (
+    budget_instance_cache, budget_children_cache, budget_actuals_cache,
+    budget_actuals_owners_cache)
+
+
+def contact_lookup(user):
+    contacts = user.created_contacts.only('pk', 'first_name', 'last_name',
+        'email')
+    return build_lookup(
+        [(c.full_name, c) for c in contacts]
+        + [(c.email, c) for c in contacts]
+    )
+
+
+class SubAccountRowSerializer(serializers.Serializer):
+    account = serializers.CharField(max_length=128)
+    identifier = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    description = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    quantity = serializers.FloatField(required=False, allow_null=True)
+    rate = serializers.FloatField(required=False, allow_null=True)
+    multiplier = serializers.IntegerField(required=False, allow_null=True)
+    unit = LookupField(lookup='units', name='unit')
+    fringes = LookupField(lookup='fringes', name='fringe', separator=',')
+    contact = LookupField(lookup='contacts', name='contact')
+
+    def validate_account(self, value):
+        if self.context['accounts'].get(normalize_label(value)) is AMBIGUOUS:
+            raise serializers.ValidationError(
+                f'More than one account exists with the label "{value}".')
+        return value
+
+
+class SubAccountImporter(Importer):
+    """
+    Imports the rows of a CSV document as :obj:`SubAccount`(s) of the
+    :obj:`Account`(s) of a :obj:`BaseBudget`, where the `account` column of
+    each row is the identifier of the :obj:`Account` that the
+    :obj:`SubAccount` belongs to.  :obj:`Account`(s) that do not exist yet
+    are created.
+
+    Since the :obj:`SubAccount`(s) are bulk created, the calculation that
+    would otherwise be performed when each :obj:`SubAccount` is saved is
+    performed after every batch was inserted.  Only the primary keys of the
+    imported :obj:`SubAccount`(s) are retained until then, and they are
+    reloaded and recalculated one batch at a time - which means that the
+    :obj:`Account`(s) they belong to are recalculated once per batch.
+    """
+    serializer_class = SubAccountRowSerializer
+    required_columns = ('account', )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created = []
+        self.accounts = {}
+
+    @property
+    def account_cls(self):
+        return self.budget.account_cls
+
+    @property
+    def subaccount_cls(self):
+        return self.budget.subaccount_cls
+
+    def get_lookups(self):
+        lookups = {
+            'accounts': build_lookup([
+                (a.identifier, a) for a in
+                self.account_cls.objects.filter(parent=self.budget)
+            ]),
+            'units': build_lookup([
+                (u.title, u) for u in SubAccountUnit.objects.all()]),
+            'fringes': build_lookup([
+                (f.name, f) for f in self.budget.fringes.all()]),
+            'contacts': {}
+        }
+        # Only the SubAccount(s) in the budget domain can be assigned a
+        # Contact.
+        if hasattr(self.subaccount_cls, 'contact'):
+            lookups['contacts'] = contact_lookup(self.user)
+        return lookups
+
+    def instantiate(self, data):
+        account = data.pop('account')
+        fringes = data.pop('fringes', None) or []
+        if not hasattr(self.subaccount_cls, 'contact'):
+            data.pop('contact', None)
+        return (
+            account,
+            self.subaccount_cls(**data, **self.user_fields()),
+            fringes
+        )
+
+    def get_or_create_accounts(self, labels):
+        """
+        Returns the :obj:`Account`(s) that the provided identifiers refer to,
+        bulk creating the :obj:`Account`(s) that do not exist yet.
+        """
+        lookup = self.lookups['accounts']
+        missing = dict([
+            (normalize_label(label), label) for label in labels
+            if normalize_label(label) not in lookup
+        ])
+        if missing:
+            created = self.account_cls.objects.bulk_create([
+                self.account_cls(
+                    parent=self.budget,
+                    identifier=label,
+                    **self.user_fields()
+                ) for label in missing.values()
+            ], return_created_objects=True)
+            for key, account in zip(missing, created):
+                # The polymorphic bulk create reinstantiates the created
+                # instances, which means that the parent cached on the original
+                # instance is lost.
+                account.parent = self.budget
+                lookup[key] = account
+        return [lookup[normalize_label(label)] for label in labels]
+
+    def insert(self, instances):
+        accounts = self.get_or_create_accounts([obj[0] for obj in instances])
+        subaccounts = []
+        for account, (_, subaccount, _) in zip(accounts, instances):
+            subaccount.parent = account
+            subaccounts.append(subaccount)
+        created = self.subaccount_cls.objects.bulk_create(
+            subaccounts, return_created_objects=True)
+
+        through = []
+        for subaccount, (_, _, fringes) in zip(created, instances):
+            through += [self.subaccount_cls.fringes.through(
+                fringe_id=fringe.pk,
+                subaccount_id=subaccount.pk
+            ) for fringe in set(fringes)]
+        self.subaccount_cls.fringes.through.objects.bulk_create(through)
+
+        self.created += [subaccount.pk for subaccount in created]
+        self.accounts.update([(account.pk, account) for account in accounts])
+
+    def finalize(self):
+        if not self.created:
+            return
+        for i in range(0, len(self.created), self.batch_size):
+            subaccounts = list(self.subaccount_cls.objects.filter(
+                pk__in=self.created[i:i + self.batch_size]))
+            # Reattaching the parent prevents each instance from having to
+            # query for its parent when it is recalculated.
+            for subaccount in subaccounts:
+                subaccount.parent = self.accounts[subaccount.object_id]
+            self.subaccount_cls.objects.bulk_calculate_all(subaccounts)
+
+        accounts = list(self.accounts.values())
+        budget_instance_cache.invalidate(self.budget)
+        budget_children_cache.invalidate(self.budget)
+        account_instance_cache.invalidate(accounts)
+        account_children_cache.invalidate(accounts)
+        if self.budget.domain == 'budget':
+            budget_actuals_owners_cache.invalidate(self.budget)
+        self.subaccount_cls.objects.mark_budgets_updated(
+            [self.budget], self.user)
+
+
+class ActualRowSerializer(serializers.Serializer):
+    name = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    owner = LookupField(lookup='owners', name='sub account')
+    date = serializers.DateField(required=False, allow_null=True)
+    type = LookupField(
+        lookup='actual_types', name='actual type', source='actual_type')
+    contact = LookupField(lookup='contacts', name='contact')
+    purchase_order = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    payment_id = serializers.CharField(
+        required=False, allow_null=True, max_length=50)
+    notes = serializers.CharField(
+        required=False, allow_null=True, max_length=256)
+    value = serializers.FloatField(required=False, allow_null=True)
+
+
+class ActualImporter(Importer):
+    """
+    Imports the rows of a CSV document as :obj:`Actual`(s) of a
+    :obj:`Budget`, where the `owner` column of each row is the identifier of
+    the :obj:`SubAccount` that the :obj:`Actual` is assigned to.
+
+    Since the :obj:`Actual`(s) are bulk created, the actualization of their
+    owners is performed once for all of the imported :obj:`Actual`(s) after
+    every batch was inserted.
+    """
+    serializer_class = ActualRowSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owners = set([])
+        self.content_type = ContentType.objects.get_for_model(
+            self.budget.subaccount_cls)
+
+    def get_lookups(self):
+        # The owners are only used to set the generic relationship on the
+        # created Actual(s), so only their primary keys are needed.
+        owners = self.budget.subaccount_cls.objects \
+            .filter_by_budget(self.budget).values_list('identifier', 'pk')
+        return {
+            'owners': build_lookup(owners),
+            'actual_types': build_lookup([
+                (t.title, t) for t in ActualType.objects.all()]),
+            'contacts': contact_lookup(self.user)
+        }
+
+    def instantiate(self, data):
+        owner = data.pop('owner', None)
+        if owner is not None:
+            data.update(content_type=self.content_type, object_id=owner)
+        return Actual(budget=self.budget, **data, **self.user_fields())
+
+    def insert(self, instances):
+        Actual.objects.bulk_create(instances)
+        self.owners.update([
+            obj.object_id for obj in instances if obj.object_id is not None])
+
+    def finalize(self):
+        if self.owners:
+            Actual.objects.bulk_actualize_all(list(
+                self.budget.subaccount_cls.objects.filter(pk__in=self.owners)))
+        budget_actuals_cache.invalidate(self.budget)
+        Actual.objects.mark_budgets_updated([self.budget], self.user)
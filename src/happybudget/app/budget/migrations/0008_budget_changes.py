@@ -0,0 +1,46 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('budget', '0007_using_base_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='basebudget',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='BudgetChange',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID'
+                )),
+                ('object_id', models.PositiveIntegerField()),
+                ('version', models.PositiveIntegerField()),
+                ('budget', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='changes',
+                    to='budget.basebudget'
+                )),
+                ('content_type', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to='contenttypes.contenttype'
+                )),
+            ],
+            options={
+                'verbose_name': 'Budget Change',
+                'verbose_name_plural': 'Budget Changes',
+                'unique_together': {('budget', 'content_type', 'object_id')},
+                'index_together': {('budget', 'version')},
+            },
+        ),
+    ]
@@ -41,6 +41,9 @@ class BaseBudgetNestedMixin(views.NestedObjectViewMixin):
     def content_type(self):
         return ContentType.objects.get_for_model(type(self.budget))
 
+    def get_last_modified(self):
+        return self.budget.updated_at
+
 
 class BudgetNestedMixin(BaseBudgetNestedMixin):
     """
@@ -51,6 +54,7 @@ class BudgetNestedMixin(BaseBudgetNestedMixin):
 
 
 class BaseBudgetPublicNestedMixin(BaseBudgetNestedMixin):
+    public_cache = ['list']
     budget_permission_classes = [
         BudgetObjPermission(
             public=True,
@@ -1,6 +1,7 @@
 import copy
 
 from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
 from happybudget.lib.utils import cumulative_sum
@@ -48,6 +49,10 @@ class BaseBudget(BudgetingTreePolymorphicModel, ModelOwnershipMixin):
     accumulated_markup_contribution = models.FloatField(default=0.0)
 
     is_deleting = models.BooleanField(default=False)
+    # Incremented each time that the changes to the calculated values of the
+    # rows that belong to the budget are recorded.  See
+    # :obj:`happybudget.app.budget.changes`.
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     groups = GenericRelation(Group)
     children_markups = GenericRelation(Markup)
@@ -181,3 +186,36 @@ class Budget(BaseBudget):
         if any(alterations) and commit:
             self.save()
         return any(alterations)
+
+
+class BudgetChange(models.Model):
+    """
+    Denotes the version of a :obj:`Budget` or :obj:`Template` at which the
+    calculated values of one of its rows (the :obj:`Budget` or :obj:`Template`
+    itself, an :obj:`Account` or a :obj:`SubAccount`) last changed.
+
+    Only the most recent change of each row is stored, such that the number of
+    stored changes is bounded by the size of the :obj:`Budget` or
+    :obj:`Template`.
+    """
+    budget = models.ForeignKey(
+        to='budget.BaseBudget',
+        on_delete=models.CASCADE,
+        related_name='changes'
+    )
+    content_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE
+    )
+    object_id = models.PositiveIntegerField()
+    version = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = "Budget Change"
+        verbose_name_plural = "Budget Changes"
+        unique_together = (('budget', 'content_type', 'object_id'))
+        index_together = (('budget', 'version'))
+
+    def __str__(self):
+        return "Change to %s %s at version %s" % (
+            self.content_type.model, self.object_id, self.version)
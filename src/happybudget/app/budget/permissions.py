@@ -6,6 +6,7 @@ from happybudget.app.billing.permissions import BaseProductPermission
 from happybudget.app.budgeting.permissions import IsDomain
 from happybudget.app.collaborator.permissions import IsCollaborator
 
+from .access import get_budget_access
 from .models import Budget
 
 
@@ -15,6 +16,26 @@ class IsBudgetDomain(IsDomain):
         super().__init__(*args, **kwargs)
 
 
+class IsBudgetOwner(permissions.IsOwner):
+    """
+    Object level permission that ensures that the :obj:`Budget` that an
+    actively logged in user is accessing was created by that user, using the
+    :obj:`BudgetAccess` of the request.
+    """
+    def has_object_permission(self, request, view, obj):
+        return get_budget_access(request, obj).is_owner
+
+
+class IsBudgetPublic(permissions.IsPublic):
+    """
+    Permission that ensures that the public token included with the request
+    grants access to the :obj:`Budget`, using the :obj:`BudgetAccess` of the
+    request.
+    """
+    def has_object_permission(self, request, view, obj):
+        return get_budget_access(request, obj).is_public
+
+
 class ProductPermission(BaseProductPermission):
     """
     Permissions whether or not the :obj:`User` has access to a given
@@ -33,14 +54,12 @@ class ProductPermission(BaseProductPermission):
         assert isinstance(obj, Budget), \
             f"Permission class {self.__class__.__name__} is only applicable " \
             "for Budget related models."
-        assert hasattr(obj, 'user_owner'), \
-            f"Permission class {self.__class__.__name__} should always be " \
-            "used for models that dictate ownership."
-        assert obj.user_owner == request.user, \
+        access = get_budget_access(request, obj)
+        assert access.is_owner, \
             f"Permission class {self.__class__.__name__} should always be " \
             "preceeded by a permission class that guarantees ownership."
-        if not self.user_has_products(request.user):
-            return obj.is_first_created
+        if not access.has_products(self.products):
+            return access.is_first_created
         return True
 
 
@@ -73,6 +92,11 @@ class BudgetObjPermission(permissions.OR):
     (3) Budget Product Permissions
     (4) Collaboration on Budget or Related Models
     (5) Public or View Only Access to Budget or Related Models
+
+    Each of the above considerations is determined from the :obj:`BudgetAccess`
+    of the request, such that it is only evaluated once per :obj:`Budget` for
+    the entire request, regardless of how many times the :obj:`Budget` is
+    permissioned.
     """
     def __init__(self, **kwargs):
         public = kwargs.pop('public', False)
@@ -98,7 +122,8 @@ class BudgetObjPermission(permissions.OR):
         base_permissions = [
             permissions.AND(
                 permissions.IsFullyAuthenticated(affects_after=True),
-                permissions.IsOwner(
+                IsBudgetOwner(
+                    get_permissioned_obj=get_budget,
                     object_name=object_name,
                     affects_after=True
                 ),
@@ -149,6 +174,6 @@ class BudgetObjPermission(permissions.OR):
         if public:
             base_permissions += [permissions.AND(
                 permissions.IsSafeRequestMethod,
-                permissions.IsPublic(get_permissioned_obj=get_budget)
+                IsBudgetPublic(get_permissioned_obj=get_budget)
             )]
         super().__init__(*base_permissions, **kwargs)
@@ -0,0 +1,155 @@
+import collections
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from happybudget.app import metrics
+from happybudget.app.authentication.exceptions import (
+    InvalidToken, ExpiredToken)
+
+from .models import BaseBudget
+
+
+CachedResponse = collections.namedtuple(
+    'CachedResponse', ['expires_at', 'content', 'headers'])
+
+
+class PublicResponseCache:
+    """
+    A bounded TTL cache for the full, rendered responses to safe requests
+    that are authenticated with a :obj:`PublicToken` and not by a
+    :obj:`User`, shared by all of the requests handled by a process and, when
+    `CACHE_ENABLED` is True, all of the processes using the same Redis cache.
+
+    The responses to these requests are identical for every viewer of the
+    shared :obj:`Budget`, so a cached response can be returned before the
+    view performs its permission checks, builds its queryset or serializes
+    any data.  The cached responses are independent of the per-user
+    :obj:`endpoint_cache`.
+
+    Entries are keyed by the :obj:`PublicToken`, the request path and the
+    version of the :obj:`Budget` the token is for - which is derived from the
+    `updated_at` and `version` of the :obj:`Budget` - such that entries are
+    effectively invalidated whenever the :obj:`Budget` changes.  Changes that
+    do not mark the :obj:`Budget` as updated, like programmatic maintenance
+    writes, are only reflected once the entry expires after
+    `PUBLIC_RESPONSE_CACHE_TTL`.  Setting `PUBLIC_RESPONSE_CACHE_TTL` to 0
+    disables the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    @property
+    def ttl(self):
+        return settings.PUBLIC_RESPONSE_CACHE_TTL.total_seconds()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    @property
+    def shared(self):
+        return settings.CACHE_ENABLED
+
+    def cache_key(self, request):
+        """
+        Returns the key of the cached response to the provided request, or
+        None if the response to the request cannot be cached.
+        """
+        if not self.enabled or request.method != 'GET' \
+                or request.user.is_authenticated:
+            return None
+        try:
+            token = request.public_token
+            if not token.is_authenticated:
+                return None
+        except (InvalidToken, ExpiredToken):
+            # The view will raise the appropriate error when it authenticates
+            # the request.
+            return None
+        budget_version = BaseBudget.non_polymorphic \
+            .filter(pk=token.object_id) \
+            .values_list('updated_at', 'version') \
+            .first()
+        if budget_version is None:
+            return None
+        key = ":".join([
+            str(token.pk),
+            token.updated_at.isoformat(),
+            budget_version[0].isoformat(),
+            str(budget_version[1]),
+            request.get_full_path(),
+            request.META.get('HTTP_ACCEPT', '')
+        ])
+        return "public-response-%s" % hashlib.md5(
+            key.encode('utf-8')).hexdigest()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+        if self.shared:
+            entry = cache.get(key)
+            if entry is not None:
+                self._store(key, entry)
+                return entry
+        return None
+
+    def _store(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.PUBLIC_RESPONSE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Returns a new :obj:`django.http.HttpResponse` with the content and
+        headers of the cached response for the provided key, or None if there
+        is no cached response for the key.
+        """
+        entry = self._get(key)
+        metrics.CACHE_REQUESTS.inc(
+            cache='public-response',
+            result='hit' if entry is not None else 'miss'
+        )
+        if entry is None:
+            return None
+        response = HttpResponse(entry.content)
+        for header, value in entry.headers:
+            response[header] = value
+        return response
+
+    def set(self, key, response):
+        """
+        Stores the content and headers of the provided response, which must
+        already be rendered, for the provided key.
+        """
+        entry = CachedResponse(
+            expires_at=time.time() + self.ttl,
+            content=response.content,
+            headers=[
+                (k, v) for k, v in response.items()
+                if k in ('Content-Type', 'ETag', 'Last-Modified')
+            ]
+        )
+        self._store(key, entry)
+        if self.shared:
+            cache.set(key, entry, self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+public_response_cache = PublicResponseCache()
@@ -1,9 +1,65 @@
+from django.db import models
+
 from happybudget.app.user.query import ModelOwnershipQuerier
 from happybudget.app.query import PolymorphicQuerySet
 
 
 class BudgetQuerier(ModelOwnershipQuerier):
-    pass
+    def collaborating(self, user):
+        """
+        Filters the queryset such that it only includes the :obj:`Budget`(s)
+        that the provided :obj:`User` is a collaborator on.
+
+        The filter is performed with a join against the :obj:`Collaborator`
+        table, as opposed to first fetching the IDs of the collaborated
+        :obj:`Budget`(s) and then filtering by those IDs.  Since a :obj:`User`
+        can only be a collaborator on a given :obj:`Budget` once, the join
+        will never lead to duplicate results.
+        """
+        return self.filter(collaborators__user=user)
+
+    def annotate_access(self, user):
+        """
+        Annotates each :obj:`Budget` in the queryset with the access that the
+        provided :obj:`User` has to the :obj:`Budget`:
+
+        (1) `user_is_owner`: Whether or not the :obj:`User` owns the
+            :obj:`Budget`.
+        (2) `user_access_type`: The access type of the :obj:`Collaborator`
+            associated with the :obj:`User` and the :obj:`Budget`, or None if
+            the :obj:`User` is not a collaborator on the :obj:`Budget`.
+        (3) `access_user_id`: The ID of the :obj:`User` the access was
+            determined for, such that the annotations are not mistakenly used
+            in the context of a different :obj:`User`.
+
+        The access type is determined by a single filtered join against the
+        :obj:`Collaborator` table, such that the access of the :obj:`User` is
+        known for every :obj:`Budget` in the queryset without having to
+        perform a query for each individual :obj:`Budget`.
+        """
+        if user is None or not user.is_authenticated:
+            return self.annotate(
+                access_user_id=models.Value(
+                    None, output_field=models.IntegerField()),
+                user_is_owner=models.Value(
+                    False, output_field=models.BooleanField()),
+                user_access_type=models.Value(
+                    None, output_field=models.IntegerField())
+            )
+        return self.annotate(
+            user_collaboration=models.FilteredRelation(
+                'collaborators',
+                condition=models.Q(collaborators__user=user)
+            )
+        ).annotate(
+            access_user_id=models.Value(
+                user.pk, output_field=models.IntegerField()),
+            user_is_owner=models.ExpressionWrapper(
+                models.Q(created_by=user),
+                output_field=models.BooleanField()
+            ),
+            user_access_type=models.F('user_collaboration__access_type')
+        )
 
 
 class BudgetQuerySet(PolymorphicQuerySet, BudgetQuerier):
@@ -52,6 +52,28 @@ class BudgetPdfSerializer(BaseBudgetSerializer):
         read_only_fields = fields
 
 
+class AccountSummarySerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True, source='pk')
+    identifier = serializers.CharField(read_only=True)
+    description = serializers.CharField(read_only=True)
+    nominal_value = serializers.FloatField(
+        read_only=True, source='accumulated_value')
+    fringe_contribution = serializers.FloatField(
+        read_only=True, source='accumulated_fringe_contribution')
+    markup_contribution = serializers.FloatField(
+        read_only=True, source='total_markup_contribution')
+    estimated = serializers.FloatField(read_only=True)
+    actual = serializers.FloatField(read_only=True)
+    variance = serializers.FloatField(read_only=True)
+
+
+class BudgetSummarySerializer(AccountSummarySerializer):
+    identifier = None
+    description = None
+    name = serializers.CharField(read_only=True)
+    children = AccountSummarySerializer(many=True, read_only=True)
+
+
 class BudgetSimpleSerializer(BaseBudgetSerializer):
     updated_at = serializers.DateTimeField(read_only=True)
     image = Base64ImageField(required=False, allow_null=True)
@@ -87,6 +109,13 @@ class BudgetSimpleSerializer(BaseBudgetSerializer):
                 "User does not have permission to use template.")
         return template
 
+    def is_owner(self, instance):
+        # If the Budget was annotated with the access of the User, the
+        # ownership can be determined without querying for the owner.
+        if getattr(instance, 'access_user_id', None) == self.user.pk:
+            return instance.user_is_owner
+        return instance.user_owner == self.user
+
     def to_representation(self, instance):
         # We allow unauthenticated users to retrieve information about a
         # Budget that is associated with a PublicToken.  In this case, we cannot
@@ -102,7 +131,7 @@ class BudgetSimpleSerializer(BaseBudgetSerializer):
             instance=instance.updated_by,
             include_profile_image=False
         ).data
-        if self.user.is_authenticated and instance.user_owner == self.user:
+        if self.user.is_authenticated and self.is_owner(instance):
             data['is_permissioned'] = False
             if settings.BILLING_ENABLED and not self.user.has_product('__any__'):
                 data['is_permissioned'] = not instance.is_first_created
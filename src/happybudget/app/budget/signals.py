@@ -1,4 +1,5 @@
 from django import dispatch
+from django.db import models
 
 from happybudget.app import signals
 
@@ -11,6 +12,7 @@ from happybudget.app.subaccount.models import (
     BudgetSubAccount, TemplateSubAccount)
 from happybudget.app.template.models import Template
 
+from . import changes
 from .cache import budget_instance_cache
 from .models import Budget
 
@@ -21,28 +23,53 @@ def budget_saved(instance, **kwargs):
     budget_instance_cache.invalidate(instance)
 
 
+# Django's signal is used instead of the application's signal such that the
+# changes are also recorded when the application's signals are disabled.
+@dispatch.receiver(models.signals.post_save, sender=Budget)
+@dispatch.receiver(models.signals.post_save, sender=Template)
+@dispatch.receiver(models.signals.post_save, sender=BudgetAccount)
+@dispatch.receiver(models.signals.post_save, sender=TemplateAccount)
+@dispatch.receiver(models.signals.post_save, sender=BudgetSubAccount)
+@dispatch.receiver(models.signals.post_save, sender=TemplateSubAccount)
+def record_changes(instance, **kwargs):
+    changes.record(instance)
+
+
+@dispatch.receiver(signals.post_create_by_user, sender=BudgetAccount)
 @dispatch.receiver(signals.post_update_by_user, sender=BudgetAccount)
 @dispatch.receiver(signals.pre_delete_by_user, sender=BudgetAccount)
+@dispatch.receiver(signals.post_create_by_user, sender=BudgetSubAccount)
 @dispatch.receiver(signals.post_update_by_user, sender=BudgetSubAccount)
 @dispatch.receiver(signals.pre_delete_by_user, sender=BudgetSubAccount)
+@dispatch.receiver(signals.post_create_by_user, sender=TemplateAccount)
 @dispatch.receiver(signals.post_update_by_user, sender=TemplateAccount)
 @dispatch.receiver(signals.pre_delete_by_user, sender=TemplateAccount)
+@dispatch.receiver(signals.post_create_by_user, sender=TemplateSubAccount)
 @dispatch.receiver(signals.post_update_by_user, sender=TemplateSubAccount)
 @dispatch.receiver(signals.pre_delete_by_user, sender=TemplateSubAccount)
+@dispatch.receiver(signals.post_create_by_user, sender=Fringe)
 @dispatch.receiver(signals.post_update_by_user, sender=Fringe)
 @dispatch.receiver(signals.pre_delete_by_user, sender=Fringe)
+@dispatch.receiver(signals.post_create_by_user, sender=Actual)
 @dispatch.receiver(signals.post_update_by_user, sender=Actual)
 @dispatch.receiver(signals.pre_delete_by_user, sender=Actual)
+@dispatch.receiver(signals.post_create_by_user, sender=Group)
 @dispatch.receiver(signals.post_update_by_user, sender=Group)
 @dispatch.receiver(signals.pre_delete_by_user, sender=Group)
+@dispatch.receiver(signals.post_create_by_user, sender=Markup)
 @dispatch.receiver(signals.post_update_by_user, sender=Markup)
 @dispatch.receiver(signals.pre_delete_by_user, sender=Markup)
 def update_budget_updated_at(instance, **kwargs):
     """
     Marks the :obj:`Budget` or :obj:`Template` as having been updated by a
     :obj:`User` at the current time when a model related to the :obj:`Budget`
-    or :obj:`Template` is updated or deleted inside of the context of an active
-    request.
+    or :obj:`Template` is created, updated or deleted inside of the context of
+    an active request.
+
+    Since the `updated_at` field of the :obj:`Budget` or :obj:`Template` is
+    used to answer conditional requests for the :obj:`Budget` or
+    :obj:`Template` and the models related to it, it must change whenever the
+    models related to it change.
 
     The :obj:`User` will only possibly be None or not authenticated if the
     update or delete is happening outside of the context of an active request -
@@ -0,0 +1,67 @@
+"""
+Summaries of the estimated and actual values of a :obj:`Budget` and each of
+its :obj:`Account`(s).
+
+The figures are computed by the database from the values that are stored on
+the :obj:`Budget` and :obj:`Account`(s) whenever they are recalculated (the
+`ESTIMATED_FIELDS` and `CALCULATED_FIELDS` of each model), such that the
+summary is generated with a fixed number of queries that does not depend on
+the size of the :obj:`Budget` and without instantiating any models.
+"""
+import functools
+import operator
+
+from django.db import models
+
+
+ACCOUNT_SUMMARY_FIELDS = (
+    'pk', 'identifier', 'description', 'accumulated_value',
+    'accumulated_fringe_contribution', 'total_markup_contribution',
+    'estimated', 'actual', 'variance'
+)
+
+BUDGET_SUMMARY_FIELDS = (
+    'pk', 'name', 'accumulated_value', 'accumulated_fringe_contribution',
+    'total_markup_contribution', 'estimated', 'actual', 'variance'
+)
+
+
+def sum_of_fields(*fields):
+    return models.ExpressionWrapper(
+        functools.reduce(operator.add, [models.F(f) for f in fields]),
+        output_field=models.FloatField()
+    )
+
+
+def annotate_summary(qs, markup_fields):
+    """
+    Annotates the queryset with the estimated value, the variance and the
+    total markup contribution of each row, where the estimated value is the
+    sum of the stored `ESTIMATED_FIELDS` of the model.
+    """
+    return qs.annotate(
+        estimated=sum_of_fields(*qs.model.ESTIMATED_FIELDS),
+        total_markup_contribution=sum_of_fields(*markup_fields)
+    ).annotate(variance=models.ExpressionWrapper(
+        models.F('estimated') - models.F('actual'),
+        output_field=models.FloatField()
+    ))
+
+
+def summarize(budget):
+    """
+    Returns the summary of the provided :obj:`Budget` and its
+    :obj:`Account`(s), ordered by the `order` of each :obj:`Account`.
+    """
+    # Since only the fields of the base model are needed, avoid the joins that
+    # the polymorphic manager performs.
+    summary = annotate_summary(
+        type(budget).non_polymorphic.filter(pk=budget.pk),
+        markup_fields=['accumulated_markup_contribution']
+    ).values(*BUDGET_SUMMARY_FIELDS).get()
+    summary['children'] = list(annotate_summary(
+        budget.account_cls.objects.filter(parent_id=budget.pk),
+        markup_fields=[
+            'markup_contribution', 'accumulated_markup_contribution']
+    ).order_by('order').values(*ACCOUNT_SUMMARY_FIELDS))
+    return summary
@@ -0,0 +1,58 @@
+import logging
+from celery import current_app
+
+from .totals import verify_budgets
+
+
+logger = logging.getLogger('greenbudget')
+
+# The number of the largest mismatches that are included in the error that is
+# logged when mismatches are found.
+MISMATCH_LOG_LIMIT = 25
+
+
+@current_app.task
+def verify_stored_totals(repair=False, workers=1):
+    """
+    Recomputes the calculated values of every :obj:`Budget` and
+    :obj:`Template` from the raw lines, :obj:`Fringe`(s), :obj:`Markup`(s) and
+    :obj:`Actual`(s) and compares them against the values that are stored on
+    the :obj:`Budget`, :obj:`Template`, :obj:`Account` and :obj:`SubAccount`
+    rows, optionally repairing the values that do not match.
+
+    Note:
+    ----
+    The workers of the default prefork pool are daemonic processes, which
+    cannot start processes of their own, so the verification is performed in
+    the worker process unless the task is consumed by a worker using a
+    different pool.  The task returns the number of :obj:`Budget`(s), rows and
+    mismatches that were verified and found, along with the throughput of the
+    verification.
+    """
+    report = verify_budgets(repair=repair, workers=workers)
+    stats = report.stats
+    mismatches = report.mismatches
+    if mismatches:
+        largest = mismatches[:MISMATCH_LOG_LIMIT]
+        logger.error(
+            f"Found {stats['mismatches']} mismatch(es) in the stored totals of "
+            f"{stats['mismatched_budgets']} budget(s), the largest of which "
+            "are:\n" + "\n".join([
+                f"The stored {m.field} of {m.type} {m.pk} is {m.stored} but "
+                f"should be {m.expected}." for m in largest
+            ]),
+            extra={**stats, 'largest_mismatches': [{
+                'type': m.type,
+                'pk': m.pk,
+                'field': m.field,
+                'stored': m.stored,
+                'expected': m.expected
+            } for m in largest]}
+        )
+    logger.info(
+        f"Verified the stored totals of {stats['budgets']} budget(s) and "
+        f"{stats['rows']} row(s) in {stats['duration']} seconds, found "
+        f"{stats['mismatches']} mismatch(es) and repaired "
+        f"{stats['repaired']}.", extra=stats
+    )
+    return stats
@@ -0,0 +1,499 @@
+"""
+Verification and repair of the calculated values that are stored on each
+:obj:`Budget`, :obj:`Template`, :obj:`Account` and :obj:`SubAccount` (the
+`CALCULATED_FIELDS` of each model).
+
+The stored values are maintained incrementally by the signals as the tree is
+changed, so they can drift from the values that the raw lines, :obj:`Fringe`(s)
+:obj:`Markup`(s) and :obj:`Actual`(s) dictate - for instance, when the
+signals are disabled, when an error interrupts a recalculation or when a
+maintenance task like `fix_corrupted_fringe_relationships` alters the
+relationships the values depend on.
+
+Each :obj:`Budget` or :obj:`Template` is verified by loading the raw data of
+the entire tree with a fixed number of queries per level of nesting, without
+instantiating any models, and recomputing the values from the leaves upwards
+with the same formulas that the models use.  Since the :obj:`Budget`(s) are
+independent of one another, they can be verified in parallel by a pool of
+processes.
+"""
+import collections
+import functools
+import multiprocessing
+import time
+
+import django
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from happybudget.app.account.models import (
+    Account, BudgetAccount, TemplateAccount)
+from happybudget.app.actual.models import Actual
+from happybudget.app.fringe.models import Fringe
+from happybudget.app.fringe.utils import contribution_from_fringes
+from happybudget.app.markup.models import Markup
+from happybudget.app.markup.utils import contribution_from_markups
+from happybudget.app.subaccount.models import (
+    SubAccount, BudgetSubAccount, TemplateSubAccount)
+from happybudget.app.template.models import Template
+
+from . import changes
+from .models import BaseBudget, Budget
+
+
+# The absolute difference between a stored value and the recomputed value
+# that is attributed to the order that floating point values are summed in.
+TOLERANCE = 1e-6
+
+# The maximum number of rows that are repaired with a single query.
+REPAIR_BATCH_SIZE = 500
+
+
+FringeRow = collections.namedtuple('FringeRow', ['rate', 'unit', 'cutoff'])
+MarkupRow = collections.namedtuple('MarkupRow', ['rate', 'unit'])
+
+
+class Mismatch(collections.namedtuple(
+        'Mismatch', ['type', 'pk', 'field', 'stored', 'expected'])):
+    @property
+    def difference(self):
+        return abs(self.stored - self.expected)
+
+
+BudgetVerification = collections.namedtuple(
+    'BudgetVerification', ['budget', 'rows', 'mismatches', 'repaired'])
+
+
+class VerificationReport:
+    """
+    The outcome of verifying a series of :obj:`Budget`(s) and
+    :obj:`Template`(s), along with the throughput the verification was
+    performed with.
+    """
+
+    def __init__(self, results, duration):
+        self.results = results
+        self.duration = duration
+
+    @property
+    def budgets(self):
+        return len(self.results)
+
+    @property
+    def rows(self):
+        return sum([r.rows for r in self.results])
+
+    @property
+    def mismatches(self):
+        return sorted(
+            [m for r in self.results for m in r.mismatches],
+            key=lambda m: m.difference,
+            reverse=True
+        )
+
+    @property
+    def mismatched_budgets(self):
+        return [r.budget for r in self.results if r.mismatches]
+
+    @property
+    def repaired(self):
+        return sum([len(r.mismatches) for r in self.results if r.repaired])
+
+    def throughput(self, count):
+        if self.duration == 0:
+            return 0.0
+        return count / self.duration
+
+    @property
+    def stats(self):
+        return {
+            'budgets': self.budgets,
+            'rows': self.rows,
+            'mismatches': len(self.mismatches),
+            'mismatched_budgets': len(self.mismatched_budgets),
+            'repaired': self.repaired,
+            'duration': round(self.duration, 3),
+            'budgets_per_second': round(self.throughput(self.budgets), 3),
+            'rows_per_second': round(self.throughput(self.rows), 3),
+        }
+
+
+def content_type_ids(*model_classes):
+    return [ct.pk for ct in ContentType.objects.get_for_models(
+        *model_classes, for_concrete_models=False).values()]
+
+
+def sum_values(values):
+    return sum([v for v in values if v is not None], 0.0)
+
+
+class BudgetTree:
+    """
+    The raw data and stored calculated values of the rows that belong to a
+    single :obj:`Budget` or :obj:`Template`.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.budget_cls = ContentType.objects \
+            .get_for_id(budget['polymorphic_ctype_id']).model_class()
+        # The actual values are not calculated for the rows of a Template.
+        self.fields = {
+            row_type: getattr(model_cls, 'CALCULATED_FIELDS'
+                if self.budget_cls is Budget else 'ESTIMATED_FIELDS')
+            for row_type, model_cls in (
+                ('budget', BaseBudget),
+                ('account', Account),
+                ('subaccount', SubAccount)
+            )
+        }
+
+        self.account_cts = content_type_ids(
+            Account, BudgetAccount, TemplateAccount)
+        self.subaccount_cts = content_type_ids(
+            SubAccount, BudgetSubAccount, TemplateSubAccount)
+        self.budget_cts = content_type_ids(BaseBudget, Budget, Template)
+
+        self.accounts = list(Account.non_polymorphic
+            .filter(parent_id=budget['pk'])
+            .order_by('order')
+            .values('pk', *Account.CALCULATED_FIELDS))
+        self.subaccounts = self.load_subaccounts()
+        self.children = collections.defaultdict(list)
+        for row in self.subaccounts:
+            self.children[self.parent_key(row)].append(row)
+
+        self.fringes = self.load_fringes()
+        self.markups, self.children_markups = self.load_markups()
+        self.actuals = collections.defaultdict(list)
+        if self.budget_cls is Budget:
+            self.actuals = self.load_actuals()
+
+    @property
+    def rows(self):
+        return 1 + len(self.accounts) + len(self.subaccounts)
+
+    def parent_key(self, row):
+        if row['content_type_id'] in self.account_cts:
+            return ('account', row['object_id'])
+        return ('subaccount', row['object_id'])
+
+    def load_subaccounts(self):
+        rows = []
+        filters = models.Q(
+            content_type_id__in=self.account_cts,
+            object_id__in=[a['pk'] for a in self.accounts]
+        )
+        # Each level of nesting is loaded with a single query.
+        while True:
+            level = list(SubAccount.non_polymorphic
+                .filter(filters)
+                .order_by('order')
+                .values(
+                    'pk', 'content_type_id', 'object_id', 'quantity', 'rate',
+                    'multiplier', *SubAccount.CALCULATED_FIELDS
+                ))
+            if not level:
+                return rows
+            rows += level
+            filters = models.Q(
+                content_type_id__in=self.subaccount_cts,
+                object_id__in=[s['pk'] for s in level]
+            )
+
+    def load_fringes(self):
+        through = SubAccount.fringes.through
+        relationships = list(through.objects
+            .filter(subaccount_id__in=[s['pk'] for s in self.subaccounts])
+            .order_by('pk')
+            .values_list('subaccount_id', 'fringe_id'))
+        fringes = {
+            f['pk']: FringeRow(f['rate'], f['unit'], f['cutoff'])
+            for f in Fringe.objects
+            .filter(pk__in=set([r[1] for r in relationships]))
+            .values('pk', 'rate', 'unit', 'cutoff')
+        }
+        subaccount_fringes = collections.defaultdict(list)
+        for subaccount_id, fringe_id in relationships:
+            subaccount_fringes[subaccount_id].append(fringes[fringe_id])
+        return subaccount_fringes
+
+    def load_markups(self):
+        relationships = []
+        for model_cls, rows in ((Account, self.accounts),
+                (SubAccount, self.subaccounts)):
+            model_type = model_cls._meta.model_name
+            column = '%s_id' % model_type
+            relationships += [
+                ((model_type, pk), markup_id)
+                for pk, markup_id in model_cls.markups.through.objects
+                .filter(**{'%s__in' % column: [r['pk'] for r in rows]})
+                .values_list(column, 'markup_id')
+            ]
+        markups = {}
+        children_markups = collections.defaultdict(list)
+        for markup in Markup.objects.filter(
+            models.Q(pk__in=set([r[1] for r in relationships]))
+            | models.Q(
+                content_type_id__in=self.budget_cts,
+                object_id=self.budget['pk']
+            )
+            | models.Q(
+                content_type_id__in=self.account_cts,
+                object_id__in=[a['pk'] for a in self.accounts]
+            )
+            | models.Q(
+                content_type_id__in=self.subaccount_cts,
+                object_id__in=[s['pk'] for s in self.subaccounts]
+            )
+        ).order_by('created_at').values(
+                'pk', 'content_type_id', 'object_id', 'rate', 'unit'):
+            markups[markup['pk']] = MarkupRow(markup['rate'], markup['unit'])
+            if markup['content_type_id'] in self.budget_cts:
+                parent = ('budget', markup['object_id'])
+            elif markup['content_type_id'] in self.account_cts:
+                parent = ('account', markup['object_id'])
+            else:
+                parent = ('subaccount', markup['object_id'])
+            children_markups[parent].append(markup['pk'])
+
+        row_markups = collections.defaultdict(list)
+        for key, markup_id in relationships:
+            row_markups[key].append(markups[markup_id])
+        return row_markups, {
+            k: [(pk, markups[pk]) for pk in v]
+            for k, v in children_markups.items()
+        }
+
+    def load_actuals(self):
+        markup_cts = content_type_ids(Markup)
+        actuals = collections.defaultdict(list)
+        for content_type_id, object_id, value in Actual.objects.filter(
+            models.Q(
+                content_type_id__in=self.subaccount_cts,
+                object_id__in=[s['pk'] for s in self.subaccounts]
+            )
+            | models.Q(
+                content_type_id__in=markup_cts,
+                object_id__in=[
+                    pk for v in self.children_markups.values()
+                    for pk, _ in v
+                ]
+            )
+        ).values_list('content_type_id', 'object_id', 'value'):
+            if content_type_id in markup_cts:
+                actuals[('markup', object_id)].append(value)
+            else:
+                actuals[('subaccount', object_id)].append(value)
+        return actuals
+
+    def accumulate(self, key, children, fringe_attrs):
+        """
+        Returns the values that a row accumulates from its children and the
+        flat :obj:`Markup`(s) that are children of the row.
+        """
+        children_markups = self.children_markups.get(key, [])
+        values = {
+            'accumulated_value': sum_values(
+                [c['nominal_value'] for c in children]),
+            'accumulated_fringe_contribution': sum_values(
+                [c[a] for c in children for a in fringe_attrs]),
+            'accumulated_markup_contribution': sum_values(
+                [c[a] for c in children for a in (
+                    'markup_contribution', 'accumulated_markup_contribution'
+                )] + [
+                    m.rate for _, m in children_markups
+                    if m.unit == Markup.UNITS.flat
+                ]
+            ),
+            'actual': sum_values(
+                [c['actual'] for c in children]
+                + [
+                    v for pk, _ in children_markups
+                    for v in self.actuals[('markup', pk)]
+                ]
+                + self.actuals[key]
+            )
+        }
+        values['realized_value'] = values['accumulated_value'] \
+            + values['accumulated_fringe_contribution'] \
+            + values['accumulated_markup_contribution']
+        return values
+
+    def estimate_subaccount(self, row):
+        key = ('subaccount', row['pk'])
+        children = [self.estimate_subaccount(c) for c in self.children[key]]
+        values = self.accumulate(key, children, fringe_attrs=(
+            'fringe_contribution', 'accumulated_fringe_contribution'))
+        if not children:
+            values['nominal_value'] = SubAccount.calculate_raw_value(
+                row['quantity'], row['rate'], row['multiplier'])
+            values['realized_value'] += values['nominal_value']
+            values['fringe_contribution'] = contribution_from_fringes(
+                value=values['realized_value'],
+                fringes=self.fringes[row['pk']]
+            )
+        else:
+            values['nominal_value'] = values['accumulated_value']
+            values['fringe_contribution'] = 0.0
+        values['markup_contribution'] = contribution_from_markups(
+            value=values['realized_value'] + values['fringe_contribution'],
+            markups=self.markups[key]
+        )
+        self.expected[key] = (row, values)
+        return values
+
+    def estimate_account(self, row):
+        key = ('account', row['pk'])
+        children = [self.estimate_subaccount(c) for c in self.children[key]]
+        values = self.accumulate(key, children, fringe_attrs=(
+            'fringe_contribution', 'accumulated_fringe_contribution'))
+        values['nominal_value'] = values['accumulated_value']
+        values['markup_contribution'] = contribution_from_markups(
+            value=values['realized_value'],
+            markups=self.markups[key]
+        )
+        self.expected[key] = (row, values)
+        return values
+
+    def estimate(self):
+        """
+        Recomputes the calculated values of every row in the tree, returning
+        the stored and recomputed values of each row indexed by the type and
+        primary key of the row.
+        """
+        self.expected = {}
+        key = ('budget', self.budget['pk'])
+        children = [self.estimate_account(a) for a in self.accounts]
+        values = self.accumulate(key, children, fringe_attrs=(
+            'accumulated_fringe_contribution', ))
+        self.expected[key] = (self.budget, values)
+        return self.expected
+
+    def get_mismatches(self, tolerance=TOLERANCE):
+        mismatches = []
+        for (row_type, pk), (row, values) in self.estimate().items():
+            for field in self.fields[row_type]:
+                if abs(row[field] - values[field]) > tolerance:
+                    mismatches.append(Mismatch(
+                        type=row_type,
+                        pk=pk,
+                        field=field,
+                        stored=row[field],
+                        expected=values[field]
+                    ))
+        return mismatches
+
+    def repair(self, mismatches):
+        """
+        Persists the recomputed values of the provided mismatches with a single
+        set based update per type of row, bypassing the signals.  The repaired
+        rows are recorded as changed so that clients following the changes of
+        the :obj:`Budget` or :obj:`Template` are provided with them, and the
+        :obj:`Budget` or :obj:`Template` is marked as updated so that the
+        responses that clients have cached for it are no longer valid.
+
+        The values are read without a lock, so a value is only repaired if it
+        still equals the stored value it was read as - otherwise the row was
+        changed in the meantime and the recomputed value is already stale.
+        """
+        model_classes = {
+            'budget': (BaseBudget, self.budget_cls),
+            'account': (Account, self.budget_cls.account_cls),
+            'subaccount': (SubAccount, self.budget_cls.subaccount_cls),
+        }
+        repairs = collections.defaultdict(
+            lambda: collections.defaultdict(dict))
+        for mismatch in mismatches:
+            repairs[mismatch.type][mismatch.pk][mismatch.field] = \
+                (mismatch.stored, mismatch.expected)
+
+        with transaction.atomic(), changes.recording():
+            for row_type, rows in repairs.items():
+                base_cls, model_cls = model_classes[row_type]
+                pks = sorted(rows)
+                for i in range(0, len(pks), REPAIR_BATCH_SIZE):
+                    batch = pks[i:i + REPAIR_BATCH_SIZE]
+                    fields = set([f for pk in batch for f in rows[pk]])
+                    base_cls.non_polymorphic.filter(pk__in=batch).update(**{
+                        field: models.Case(
+                            *[
+                                models.When(
+                                    pk=pk,
+                                    **{field: rows[pk][field][0]},
+                                    then=models.Value(rows[pk][field][1])
+                                )
+                                for pk in batch if field in rows[pk]
+                            ],
+                            default=models.F(field),
+                            output_field=models.FloatField()
+                        ) for field in fields
+                    })
+                changes.record_rows(self.budget['pk'], model_cls, pks)
+            BaseBudget.non_polymorphic.filter(pk=self.budget['pk']) \
+                .update(updated_at=timezone.now())
+
+
+def verify_budget(pk, repair=False, tolerance=TOLERANCE):
+    """
+    Verifies the stored calculated values of the :obj:`Budget` or
+    :obj:`Template` with the provided primary key and the rows that belong to
+    it, optionally repairing the values that do not match.  Returns None if
+    the :obj:`Budget` or :obj:`Template` no longer exists.
+    """
+    budget = BaseBudget.non_polymorphic.filter(pk=pk) \
+        .values('pk', 'polymorphic_ctype_id', *BaseBudget.CALCULATED_FIELDS) \
+        .first()
+    if budget is None:
+        return None
+    tree = BudgetTree(budget)
+    mismatches = tree.get_mismatches(tolerance=tolerance)
+    if mismatches and repair:
+        tree.repair(mismatches)
+    return BudgetVerification(
+        budget=pk,
+        rows=tree.rows,
+        mismatches=mismatches,
+        repaired=bool(mismatches) and repair
+    )
+
+
+def initialize_worker():
+    # Processes that are spawned, rather than forked, do not inherit the
+    # configured application.
+    django.setup()
+
+
+def verify_budgets(budgets=None, workers=1, **kwargs):
+    """
+    Verifies the stored calculated values of the provided :obj:`Budget`(s)
+    and :obj:`Template`(s), or all of them if not provided, with a pool of
+    processes of the provided size.
+
+    Note that each process opens its own database connection, and that
+    processes cannot be started from a daemonic process - like a Celery
+    worker using the default prefork pool - so the verification is performed
+    in the current process when `workers` is 1.
+    """
+    if budgets is None:
+        budgets = BaseBudget.non_polymorphic.order_by('pk') \
+            .values_list('pk', flat=True)
+    budgets = list(budgets)
+
+    verify = functools.partial(verify_budget, **kwargs)
+    start = time.perf_counter()
+    if workers > 1 and len(budgets) > 1:
+        # The connections of the current process cannot be shared with the
+        # processes of the pool.
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=initialize_worker) \
+                as pool:
+            results = pool.map(
+                verify, budgets, chunksize=max(len(budgets) // workers, 1))
+    else:
+        results = [verify(pk) for pk in budgets]
+    return VerificationReport(
+        results=[r for r in results if r is not None],
+        duration=time.perf_counter() - start
+    )
@@ -5,11 +5,12 @@ from rest_framework import response, status
 
 from happybudget.app import views, permissions, exceptions
 from happybudget.app.account.serializers import (
-    BudgetAccountSerializer, TemplateAccountSerializer)
+    BudgetAccountSerializer, TemplateAccountSerializer,
+    BudgetAccountValuesSerializer, TemplateAccountValuesSerializer)
 from happybudget.app.account.views import GenericAccountViewSet
 from happybudget.app.actual.models import Actual
 from happybudget.app.actual.serializers import (
-    ActualSerializer, ActualOwnerSerializer)
+    ActualSerializer, ActualOwnerSerializer, ActualValuesSerializer)
 from happybudget.app.actual.views import GenericActualViewSet
 from happybudget.app.authentication.models import PublicToken
 from happybudget.app.authentication.serializers import PublicTokenSerializer
@@ -24,12 +25,15 @@ from happybudget.app.fringe.serializers import FringeSerializer
 from happybudget.app.fringe.views import GenericFringeViewSet
 from happybudget.app.group.models import Group
 from happybudget.app.group.serializers import GroupSerializer
+from happybudget.app.io.views import import_response
 from happybudget.app.markup.models import Markup
 from happybudget.app.markup.serializers import MarkupSerializer
 from happybudget.app.subaccount.models import BudgetSubAccount
 from happybudget.app.template.permissions import TemplateObjPermission
 from happybudget.app.template.serializers import TemplateSerializer
 
+from .exports import (
+    BudgetExport, export_response, LINE_COLUMNS, ACTUAL_COLUMNS)
 from .cache import (
     budget_children_cache,
     budget_groups_cache,
@@ -46,8 +50,11 @@ from .serializers import (
     BudgetSerializer,
     BudgetSimpleSerializer,
     BudgetPdfSerializer,
+    BudgetSummarySerializer,
     BulkImportBudgetActualsSerializer
 )
+from .changes import get_changes
+from .summary import summarize
 
 
 @views.filter_by_ids
@@ -128,7 +135,11 @@ class BudgetActualsViewSet(
 
     (1) GET /budgets/<pk>/actuals/
     (2) POST /budgets/<pk>/actuals/
+    (3) GET /budgets/<pk>/actuals/export/
+    (4) POST /budgets/<pk>/actuals/import/
     """
+    values_serializer_classes = [ActualValuesSerializer]
+
     def create_kwargs(self, serializer):
         return {
             **super().create_kwargs(serializer),
@@ -143,6 +154,20 @@ class BudgetActualsViewSet(
     def get_queryset(self):
         return Actual.objects.filter(budget=self.budget)
 
+    @views.action(detail=False, methods=["GET"])
+    def export(self, request, *args, **kwargs):
+        return export_response(
+            request=request,
+            budget=self.budget,
+            name="Actuals",
+            header=ACTUAL_COLUMNS,
+            rows=BudgetExport(self.budget).actuals()
+        )
+
+    @views.action(detail=False, methods=["POST"], url_path='import')
+    def import_csv(self, request, *args, **kwargs):
+        return import_response(request, 'actuals', budget=self.budget)
+
 
 class BudgetCollaboratorsViewSet(
     views.ListModelMixin,
@@ -191,6 +216,7 @@ class BudgetActualsOwnersViewSet(
 ):
     serializer_class = ActualOwnerSerializer
     search_fields = ['identifier', 'description']
+    read_from_replica = True
 
     def get_queryset(self):
         return BudgetSubAccount.objects \
@@ -259,7 +285,16 @@ class BudgetChildrenViewSet(
 
     (1) GET /budgets/<pk>/children/
     (2) POST /budgets/<pk>/children/
+    (3) GET /budgets/<pk>/children/export/
+    (4) POST /budgets/<pk>/children/import/
     """
+    read_from_replica = True
+    conditional = ['list']
+    values_serializer_classes = [
+        BudgetAccountValuesSerializer,
+        TemplateAccountValuesSerializer
+    ]
+
     def create_kwargs(self, serializer):
         return {**super().create_kwargs(serializer), **{'parent': self.budget}}
 
@@ -276,6 +311,20 @@ class BudgetChildrenViewSet(
         return self.child_instance_cls.objects \
             .filter(parent=self.instance).order_with_groups()
 
+    @views.action(detail=False, methods=["GET"])
+    def export(self, request, *args, **kwargs):
+        return export_response(
+            request=request,
+            budget=self.instance,
+            name="Lines",
+            header=LINE_COLUMNS,
+            rows=BudgetExport(self.instance).lines()
+        )
+
+    @views.action(detail=False, methods=["POST"], url_path='import')
+    def import_csv(self, request, *args, **kwargs):
+        return import_response(request, 'subaccounts', budget=self.instance)
+
 
 class BudgetPublicTokenViewSet(
     views.CreateModelMixin,
@@ -327,7 +376,9 @@ class CollaboratingBudgetViewSet(views.ListModelMixin, GenericBudgetViewSet):
     (1) GET /budgets/collaborating/
     """
     def get_queryset(self):
-        return self.request.user.collaborating_budgets
+        return Budget.objects.collaborating(self.request.user) \
+            .annotate_access(self.request.user) \
+            .select_related('updated_by')
 
 
 class AcrhivedBudgetViewSet(views.ListModelMixin, GenericBudgetViewSet):
@@ -337,7 +388,10 @@ class AcrhivedBudgetViewSet(views.ListModelMixin, GenericBudgetViewSet):
     (1) GET /budgets/archived/
     """
     def get_queryset(self):
-        return Budget.objects.filter(archived=True, created_by=self.request.user)
+        return Budget.objects.owned_by(self.request.user) \
+            .filter(archived=True) \
+            .annotate_access(self.request.user) \
+            .select_related('updated_by')
 
 
 @register_bulk_operations(
@@ -438,7 +492,12 @@ class BudgetViewSet(
     (16) GET /budgets/<pk>/pdf/
     (17) POST /budgets/<pk>/duplicate/
     (18) PATCH /budgets/<pk>/bulk-import-actuals/
+    (19) GET /budgets/<pk>/summary/
+    (20) GET /budgets/<pk>/changes/
     """
+    read_from_replica = ['pdf', 'summary']
+    conditional = ['retrieve', 'summary']
+    public_cache = ['retrieve', 'summary']
     permission_classes = [permissions.OR(
         permissions.AND(
             permissions.IsViewAction('list', affects_after=True),
@@ -501,7 +560,7 @@ class BudgetViewSet(
 
     def get_queryset(self):
         base_cls = BaseBudget
-        if self.action in ('pdf', 'list', 'bulk_import_actuals') \
+        if self.action in ('pdf', 'summary', 'list', 'bulk_import_actuals') \
                 or self.in_bulk_entity('actuals'):
             # Actuals and PDF are only relevant for the budget domain.  The
             # template domain for list actions is handled by a separate view.
@@ -511,14 +570,48 @@ class BudgetViewSet(
             qs = qs.owned_by(self.request.user)
             # Archived Budget(s) are handled by a separate view.
             if base_cls is Budget:
-                qs = qs.filter(archived=False)
+                qs = qs.filter(archived=False) \
+                    .annotate_access(self.request.user) \
+                    .select_related('updated_by')
         return qs.all()
 
+    def get_last_modified(self):
+        return self.instance.updated_at
+
+    def get_etag_components(self):
+        # The public token of the budget is included in the detail response,
+        # but creating or removing the public token does not update the budget.
+        token = self.instance.public_token
+        if token is None:
+            return []
+        return [token.pk, token.updated_at.isoformat()]
+
     @views.action(detail=True, methods=["GET"])
     def pdf(self, request, *args, **kwargs):
         serializer = BudgetPdfSerializer(self.instance)
         return response.Response(serializer.data, status=status.HTTP_200_OK)
 
+    @views.action(detail=True, methods=["GET"])
+    def summary(self, request, *args, **kwargs):
+        serializer = BudgetSummarySerializer(summarize(self.instance))
+        return response.Response(serializer.data, status=status.HTTP_200_OK)
+
+    @views.action(detail=True, methods=["GET"])
+    def changes(self, request, *args, **kwargs):
+        # If the version is not provided, only the current version is returned
+        # such that the client can request the changes since that version
+        # later on.
+        since = request.query_params.get('since', self.instance.version)
+        try:
+            since = int(since)
+        except ValueError as e:
+            raise exceptions.BadRequest(
+                "The `since` parameter must be an integer.") from e
+        return response.Response({
+            'version': self.instance.version,
+            'data': get_changes(self.instance, since=since)
+        }, status=status.HTTP_200_OK)
+
     @views.action(detail=True, methods=["POST"])
     def duplicate(self, request, *args, **kwargs):
         # We do not want to allow duplicating archived budgets, but we cannot
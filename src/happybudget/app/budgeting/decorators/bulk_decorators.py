@@ -3,6 +3,7 @@ import functools
 import inspect
 from typing import Any
 
+from django.conf import settings
 from django.db import models
 from rest_framework import decorators, response, status
 
@@ -58,6 +59,13 @@ class bulk_action:
 
         Default: True
 
+        When the request includes the `changes` query parameter, the
+        :obj:`Budget` or :obj:`Template` is not serialized in the response.
+        Instead, the response includes the calculated values of just the rows
+        of the :obj:`Budget` or :obj:`Template` that changed as a result of
+        the operation, along with the version of the :obj:`Budget` or
+        :obj:`Template` that the changes bring it to.
+
     budget_serializer: :obj:`type` or "callback" (optional)
         Either a serializer class or a callback returning the serializer class
         that should be used to serialize the :obj:`Budget` or :obj:`Template`
@@ -208,8 +216,27 @@ class bulk_action:
         data = self.perform_save(serializer)
         return data
 
+    def render_changes(self):
+        # pylint: disable=import-outside-toplevel
+        from happybudget.app.budget import changes
+
+        budget = self._get_budget(self.context.instance)
+        # The changes are flushed such that the changes caused by this
+        # operation are the changes recorded at the new version.
+        version = changes.flush().get(budget.pk)
+        if version is None:
+            budget.refresh_from_db(fields=['version'])
+            return {'version': budget.version, 'data': []}
+        return {
+            'version': version,
+            'data': changes.get_changes(budget, since=version - 1)
+        }
+
     def render_response(self, data, **kwargs):
-        if self._include_budget_in_response is True:
+        if settings.BUDGET_CHANGES_ENABLED \
+                and 'changes' in self.context.request.query_params:
+            data['changes'] = self.render_changes()
+        elif self._include_budget_in_response is True:
             budget = self._get_budget(self.context.instance)
             budget.refresh_from_db()
             data['budget'] = self.render_serializer_data(
@@ -23,7 +23,13 @@ class BudgetingManagerMixin:
             instance.validate_before_save()
 
     def bulk_update(self, instances, fields, **kwargs):
+        # pylint: disable=import-outside-toplevel
+        from happybudget.app.budget import changes
+
         self.validate_before_save(instances)
+        calculated_fields = getattr(self.model, 'CALCULATED_FIELDS', [])
+        if any([f in calculated_fields for f in fields]):
+            changes.record(instances)
         return super().bulk_update(instances, fields, **kwargs)
 
     def bulk_create(self, instances, **kwargs):
@@ -15,6 +15,8 @@ from happybudget.lib.utils import ensure_iterable, concat
 from happybudget.app.user.contrib import AnonymousUser
 from happybudget.app.user.models import User
 
+from . import metrics
+
 
 logger = logging.getLogger('happybudget')
 
@@ -604,9 +606,15 @@ class endpoint_cache:
         data = cache.get(cache_key)
         if data:
             logger.debug("Returning cached value at %s." % cache_key)
+        metrics.CACHE_REQUESTS.inc(
+            cache=self.id, result='hit' if data else 'miss')
         return data
 
     def set(self, request, rsp):
+        # Streaming responses, such as spreadsheet exports, do not have data
+        # that can be cached.
+        if rsp.streaming:
+            return
         try:
             cache_key = self.get_cache_key(request=request)
         except RequestCannotBeCached:
@@ -1,6 +1,5 @@
-from django.contrib.contenttypes.models import ContentType
-
 from happybudget.app import permissions
+from happybudget.app.budget.access import get_budget_access
 
 from .models import Collaborator
 
@@ -36,21 +35,15 @@ class BaseCollaboratorPermission(permissions.BasePermission):
         return access_types
 
     def has_object_permission(self, request, view, obj):
-        try:
-            collaborator = Collaborator.objects.get(
-                content_type=ContentType.objects.get_for_model(type(obj)),
-                object_id=obj.pk,
-                user=request.user
-            )
-        except Collaborator.DoesNotExist:
+        access = get_budget_access(request, obj)
+        if not access.is_collaborator:
             return False
-        else:
-            access_types = self.get_access_types(request)
-            if access_types and collaborator.access_type not in access_types:
-                return (
-                    "The user is a collaborator for this {object_name} but "
-                    "does not have the correct access type."
-                )
+        access_types = self.get_access_types(request)
+        if access_types and access.collaborator_access_type not in access_types:
+            return (
+                "The user is a collaborator for this {object_name} but "
+                "does not have the correct access type."
+            )
         return True
 
 
@@ -72,7 +65,7 @@ class IsOwnerOrCollaborator(IsCollaborator):
     def has_object_permission(self, request, view, obj):
         assert hasattr(obj, 'user_owner'), \
             "The instance that is being collaborated on must dictate ownership."
-        if not obj.is_owned_by(request.user):
+        if not get_budget_access(request, obj).is_owner:
             return super().has_object_permission(request, view, obj)
         return True
 
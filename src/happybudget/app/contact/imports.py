@@ -0,0 +1,56 @@
+"""
+Imports of the :obj:`Contact`(s) of a :obj:`User` from the rows of a CSV
+document, performed by an :obj:`happybudget.app.io.imports.ImportJob`.
+"""
+from rest_framework import serializers
+
+from happybudget.app.io.imports import Importer, LookupField, build_lookup
+
+from .cache import user_contacts_cache
+from .models import Contact
+
+
+class ContactRowSerializer(serializers.Serializer):
+    first_name = serializers.CharField(
+        required=False, allow_null=True, max_length=30)
+    last_name = serializers.CharField(
+        required=False, allow_null=True, max_length=30)
+    contact_type = LookupField(lookup='contact_types', name='contact type')
+    position = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    company = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    city = serializers.CharField(
+        required=False, allow_null=True, max_length=30)
+    phone_number = serializers.CharField(
+        required=False, allow_null=True, max_length=128)
+    email = serializers.EmailField(required=False, allow_null=True)
+    rate = serializers.IntegerField(required=False, allow_null=True)
+    notes = serializers.CharField(
+        required=False, allow_null=True, max_length=256)
+
+
+class ContactImporter(Importer):
+    """
+    Imports the rows of a CSV document as :obj:`Contact`(s) of the
+    :obj:`User` that started the import, where the `contact_type` column of
+    each row is the name of the type of :obj:`Contact`.
+    """
+    serializer_class = ContactRowSerializer
+
+    def get_lookups(self):
+        values = Contact.TYPES.db_values
+        return {'contact_types': build_lookup(
+            [(Contact.TYPES.get_name(v), v) for v in values]
+            + [(Contact.TYPES.get_slug(v), v) for v in values]
+        )}
+
+    def instantiate(self, data):
+        return Contact(**data, **self.user_fields())
+
+    def insert(self, instances):
+        Contact.objects.bulk_create(instances)
+
+    def finalize(self):
+        if self.job.created:
+            user_contacts_cache.invalidate()
@@ -1,12 +1,14 @@
 from rest_framework import serializers
 
 from happybudget.lib.drf.fields import ModelChoiceField
+from happybudget.lib.utils import conditionally_separate_strings
 
 from happybudget.app.io.fields import Base64ImageField
 from happybudget.app.io.serializers import SimpleAttachmentSerializer
 from happybudget.app.io.models import Attachment
 from happybudget.app.serializers import ModelSerializer
-from happybudget.app.tabling.serializers import row_order_serializer
+from happybudget.app.tabling.serializers import (
+    row_order_serializer, ValuesSerializer)
 
 from .models import Contact
 
@@ -62,3 +64,16 @@ class ContactSerializer(ModelSerializer):
 @row_order_serializer(table_filter=lambda d: {'created_by_id': d.user.id})
 class ContactDetailSerializer(ContactSerializer):
     pass
+
+
+class ContactValuesSerializer(ValuesSerializer):
+    serializer_class = ContactSerializer
+    columns = ('first_name', 'last_name')
+
+    def get_full_name_attribute(self, row):
+        return conditionally_separate_strings(
+            [row['first_name'], row['last_name']])
+
+    def represent_attachments(self, row):
+        return self.serialize_related(
+            row, 'attachments', SimpleAttachmentSerializer)
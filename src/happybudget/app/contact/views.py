@@ -3,13 +3,14 @@ from rest_framework import decorators, response, status, filters
 
 from happybudget.app import views, serializers
 from happybudget.app.actual.serializers import TaggedActualSerializer
-from happybudget.app.io.views import GenericAttachmentViewSet
+from happybudget.app.io.views import GenericAttachmentViewSet, import_response
 
 from .cache import user_contacts_cache
 from .filters import ContactSearchFilterBackend
 from .mixins import ContactNestedMixin
 from .models import Contact
-from .serializers import ContactSerializer, ContactDetailSerializer
+from .serializers import (
+    ContactSerializer, ContactDetailSerializer, ContactValuesSerializer)
 
 
 class ContactAttachmentViewSet(
@@ -61,6 +62,7 @@ class ContactViewSet(
     (6) PATCH /contacts/bulk-delete/
     (7) PATCH /contacts/bulk-update/
     (8) PATCH /contacts/bulk-create/
+    (9) POST /contacts/import/
     """
     ordering_fields = []
     search_fields = ['label', 'name']
@@ -73,6 +75,7 @@ class ContactViewSet(
         ContactSearchFilterBackend,
         filters.OrderingFilter
     ]
+    values_serializer_classes = [ContactValuesSerializer]
 
     def get_queryset(self):
         return self.request.user.created_contacts.all()
@@ -130,3 +133,7 @@ class ContactViewSet(
         return response.Response({
             'children': self.serializer_class(children, many=True).data
         }, status=status.HTTP_200_OK)
+
+    @decorators.action(detail=False, url_path="import", methods=["POST"])
+    def import_csv(self, request, *args, **kwargs):
+        return import_response(request, 'contacts')
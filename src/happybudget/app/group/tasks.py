@@ -39,16 +39,23 @@ def find_and_delete_empty_groups():
     :obj:`Group` will not have any children, but should not be deleted by this
     task.  For this reason, we only remove empty :obj:`Group`(s) that were
     created some time ago (5 minutes).
+
+    Note:
+    ----
+    This task runs periodically against the entire database, so the empty
+    :obj:`Group`(s) are deleted in batches and the only full table scan is the
+    single COUNT used to report the number of scanned rows.  The task returns
+    the number of :obj:`Group`(s) that were scanned and deleted.
     """
     logger.info("Searching for empty groups that were not previously deleted.")
 
     cutoff_time = datetime.datetime.now() - datetime.timedelta(minutes=5)
-    group_qs = Group.objects.empty().filter(created_at__lt=cutoff_time)
-    if group_qs.count() != 0:
+    group_qs = Group.objects.filter(created_at__lt=cutoff_time)
+    scanned = group_qs.count()
+    deleted = group_qs.empty().delete_in_batches(force_ignore_signal_user=True)
+    if deleted != 0:
         logger.warning(
-            f"Found {group_qs.count()} empty Group(s) in DB, "
-            "they will be deleted."
-        )
-        group_qs.delete(force_ignore_signal_user=True)
+            f"Deleted {deleted} empty Group(s) of {scanned} scanned Group(s).")
     else:
-        logger.info("No empty groups to delete.")
+        logger.info(f"No empty groups to delete, scanned {scanned} Group(s).")
+    return {'scanned': scanned, 'fixed': deleted}
@@ -18,6 +18,8 @@ from plaid.model import (
 
 from happybudget.conf import suppress_with_setting
 
+from happybudget.app import metrics
+
 from .models import PlaidTransaction, PlaidAccount
 from .exceptions import PlaidRequestError
 
@@ -73,6 +75,17 @@ def raise_in_api_context(error_message):
     return decorator
 
 
+class ApiClient(plaid.ApiClient):
+    """
+    An extension of :obj:`plaid.ApiClient` that tracks the requests made to
+    Plaid's API in the application metrics.
+    """
+
+    def request(self, *args, **kwargs):
+        with metrics.track_outbound('plaid'):
+            return super().request(*args, **kwargs)
+
+
 GetTransactionsOptions = transactions_get_request_options\
     .TransactionsGetRequestOptions
 
@@ -111,7 +124,7 @@ class PlaidClient(plaid_api.PlaidApi):
             attr='PLAID_ENABLED',
             func='api_client'
         )
-        return plaid.ApiClient(plaid.Configuration(
+        return ApiClient(plaid.Configuration(
             host=settings.PLAID_ENVIRONMENT,
             api_key={
                 'clientId': settings.PLAID_CLIENT_ID,
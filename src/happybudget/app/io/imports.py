@@ -0,0 +1,286 @@
+"""
+Streaming imports of the rows of a CSV document as instances of a model.
+
+An import is performed by an :obj:`ImportJob`, whose state is stored in the
+database such that the progress of the import and the errors of the individual
+rows can be retrieved while the import is being performed - which, when
+`IMPORT_ASYNC` is enabled, happens in a Celery task outside of the
+request-response cycle.
+
+The document is parsed incrementally, in batches of `IMPORT_BATCH_SIZE` rows,
+such that the memory used to perform the import does not grow with the size of
+the document.  The related instances that the values of a row refer to, such
+as a :obj:`Fringe` or :obj:`Contact`, are resolved once for the entire import
+by the :obj:`Importer`, such that validating a row does not require querying
+the database.  The valid rows of each batch are then inserted with a single
+bulk create, and any derived values are recalculated after all of the batches
+were inserted - again one batch at a time, such that only the primary keys of
+the inserted rows are retained for the duration of the import.
+"""
+import csv
+import io
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from rest_framework import serializers
+
+from .models import ImportJob
+
+
+logger = logging.getLogger('greenbudget')
+
+
+# The :obj:`Importer` classes for each entity that can be imported.  They are
+# referenced by their import path because they depend on the models of the
+# applications that the :obj:`Importer` imports into.
+IMPORTERS = {
+    'subaccounts': 'happybudget.app.budget.imports.SubAccountImporter',
+    'actuals': 'happybudget.app.budget.imports.ActualImporter',
+    'contacts': 'happybudget.app.contact.imports.ContactImporter',
+}
+
+# Placeholder for the label of a related instance that refers to more than one
+# instance, in which case the instance that the label refers to cannot be
+# determined.
+AMBIGUOUS = object()
+
+
+class ImportFileError(Exception):
+    """
+    Raised when the document being imported cannot be imported at all, as
+    opposed to when an individual row of the document is invalid.
+    """
+
+
+def normalize_column(column):
+    return "_".join((column or "").strip().lower().split())
+
+
+def normalize_label(value):
+    return " ".join(str(value).strip().lower().split())
+
+
+def read_rows(f, batch_size, required_columns=()):
+    """
+    Parses the provided CSV document incrementally, yielding the rows in
+    batches of the provided size.  Each row is yielded as a tuple of the line
+    number of the row and the values of the row, keyed by the normalized
+    column name - where empty values are treated as null values.
+    """
+    reader = csv.DictReader(f)
+    if not reader.fieldnames:
+        raise ImportFileError("The document does not contain a header.")
+    reader.fieldnames = [normalize_column(c) for c in reader.fieldnames]
+    missing = [c for c in required_columns if c not in reader.fieldnames]
+    if missing:
+        raise ImportFileError(
+            "The document is missing the required column(s) "
+            f"{', '.join(missing)}."
+        )
+
+    batch = []
+    for row in reader:
+        values = dict([
+            (k, (v.strip() or None) if isinstance(v, str) else v)
+            for k, v in row.items() if k
+        ])
+        # Rows that do not contain any values are skipped, since spreadsheet
+        # applications often append empty rows to exported documents.
+        if not any(values.values()):
+            continue
+        batch.append((reader.line_num, values))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class LookupField(serializers.Field):
+    """
+    A serializer field that resolves the instance that the label of a row
+    refers to from the lookups that the :obj:`Importer` resolved before the
+    import started, which are provided in the serializer context.  When a
+    `separator` is provided, the field resolves a list of instances from
+    the separated labels.
+    """
+    default_error_messages = {
+        'does_not_exist': 'No {name} exists with the label "{value}".',
+        'ambiguous': 'More than one {name} exists with the label "{value}".'
+    }
+
+    def __init__(self, lookup, name, separator=None, **kwargs):
+        self.lookup = lookup
+        self.name = name
+        self.separator = separator
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_null', True)
+        super().__init__(**kwargs)
+
+    def resolve(self, value):
+        instance = self.context[self.lookup].get(normalize_label(value))
+        if instance is None:
+            self.fail('does_not_exist', name=self.name, value=value)
+        elif instance is AMBIGUOUS:
+            self.fail('ambiguous', name=self.name, value=value)
+        return instance
+
+    def to_internal_value(self, data):
+        if self.separator is not None:
+            return [
+                self.resolve(v) for v in str(data).split(self.separator)
+                if v.strip()
+            ]
+        return self.resolve(data)
+
+    def to_representation(self, value):
+        return str(value)
+
+
+def build_lookup(pairs):
+    """
+    Indexes the provided pairs of label and instance by the normalized label,
+    marking labels that refer to more than one instance as ambiguous.
+    """
+    lookup = {}
+    for value, instance in pairs:
+        if value is None or str(value).strip() == "":
+            continue
+        key = normalize_label(value)
+        if key in lookup and lookup[key] != instance:
+            lookup[key] = AMBIGUOUS
+        else:
+            lookup[key] = instance
+    return lookup
+
+
+class Importer:
+    """
+    Abstract class that imports the rows of a CSV document as instances of a
+    model for an :obj:`ImportJob`.
+
+    Implementations define the `serializer_class` that the rows are validated
+    with, resolve the related instances the rows refer to once in
+    `get_lookups`, convert the validated data of each row to an unsaved
+    instance in `instantiate` and insert the instances of each batch in
+    `insert`.  Any work that only needs to be performed once, after all of
+    the rows were inserted, is performed in `finalize`.
+    """
+    serializer_class = None
+    required_columns = ()
+
+    def __init__(self, job, user, budget=None, batch_size=None):
+        self.job = job
+        self.user = user
+        self.budget = budget
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.lookups = {}
+
+    def get_lookups(self):
+        return {}
+
+    def instantiate(self, data):
+        raise NotImplementedError()
+
+    def insert(self, instances):
+        raise NotImplementedError()
+
+    def finalize(self):
+        pass
+
+    def user_fields(self):
+        return {'created_by': self.user, 'updated_by': self.user}
+
+    def run(self, f):
+        # pylint: disable=not-callable
+        self.lookups = self.get_lookups()
+        serializer = self.serializer_class(context=self.lookups)
+        batches = read_rows(f, self.batch_size, self.required_columns)
+        for batch in batches:
+            instances = []
+            for line, row in batch:
+                try:
+                    data = serializer.run_validation(row)
+                except serializers.ValidationError as e:
+                    self.job.add_error(line, e.detail)
+                else:
+                    instances.append(self.instantiate(data))
+            if instances:
+                with transaction.atomic():
+                    self.insert(instances)
+            self.job.processed += len(batch)
+            self.job.created += len(instances)
+            self.job.save()
+        self.finalize()
+
+
+def run_import(job_id):
+    """
+    Performs the import for the :obj:`ImportJob` associated with the provided
+    ID, removing the uploaded document when the import finishes.
+    """
+    # pylint: disable=import-outside-toplevel
+    from happybudget.app.budget.models import BaseBudget
+    from happybudget.app.user.models import User
+
+    job = ImportJob.objects.filter(pk=job_id).first()
+    if job is None:
+        logger.error(f"Could not find import job {job_id}.")
+        return None
+
+    job.status = ImportJob.RUNNING
+    job.save()
+    try:
+        user = User.objects.get(pk=job.user_id)
+        budget = None
+        if job.budget_id is not None:
+            budget = BaseBudget.objects.get(pk=job.budget_id)
+        importer = import_string(IMPORTERS[job.entity])(
+            job=job, user=user, budget=budget)
+        with default_storage.open(job.filename, 'rb') as f:
+            importer.run(io.TextIOWrapper(f, encoding='utf-8-sig', newline=''))
+    except (ImportFileError, UnicodeDecodeError, csv.Error) as e:
+        job.status = ImportJob.FAILED
+        job.detail = str(e) if isinstance(e, ImportFileError) \
+            else "The document is not a valid CSV document."
+    except Exception:  # pylint: disable=broad-except
+        logger.exception(f"Import job {job_id} failed.")
+        job.status = ImportJob.FAILED
+        job.detail = "The import could not be completed."
+    else:
+        job.status = ImportJob.COMPLETED
+    finally:
+        default_storage.delete(job.filename)
+    job.save()
+    return job
+
+
+def start_import(entity, user, file, budget=None):
+    """
+    Stores the uploaded CSV document and starts an :obj:`ImportJob` for it.
+    If `IMPORT_ASYNC` is enabled, the import is performed by a Celery task
+    after the current transaction commits, otherwise it is performed
+    immediately.
+    """
+    filename = default_storage.save(
+        user.upload_file_to(
+            filename=f"{uuid.uuid4().hex}.csv", directory="imports"),
+        file
+    )
+    job = ImportJob.objects.create(
+        entity=entity,
+        user_id=user.pk,
+        filename=filename,
+        budget_id=getattr(budget, 'pk', None)
+    )
+    if settings.IMPORT_ASYNC:
+        # pylint: disable=import-outside-toplevel
+        from .tasks import perform_import
+        transaction.on_commit(lambda: perform_import.delay(job.id))
+        return job
+    return run_import(job.id)
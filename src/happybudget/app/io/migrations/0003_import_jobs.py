@@ -0,0 +1,57 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import happybudget.app.io.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_has_password'),
+        ('io', '0002_use_base_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.CharField(
+                    default=happybudget.app.io.models.generate_import_job_id,
+                    editable=False,
+                    max_length=32,
+                    primary_key=True,
+                    serialize=False
+                )),
+                ('entity', models.CharField(max_length=32)),
+                ('filename', models.CharField(max_length=256)),
+                ('budget_id', models.PositiveIntegerField(null=True)),
+                ('status', models.CharField(
+                    choices=[
+                        ('pending', 'Pending'),
+                        ('running', 'Running'),
+                        ('completed', 'Completed'),
+                        ('failed', 'Failed')
+                    ],
+                    default='pending',
+                    max_length=16
+                )),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('num_errors', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(default=list)),
+                ('detail', models.TextField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='import_jobs',
+                    to='user.user'
+                )),
+            ],
+            options={
+                'verbose_name': 'Import Job',
+                'verbose_name_plural': 'Import Jobs',
+                'ordering': ('-created_at',),
+                'get_latest_by': 'created_at',
+            },
+        ),
+    ]
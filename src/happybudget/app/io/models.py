@@ -1,3 +1,7 @@
+import json
+import uuid
+
+from django.conf import settings
 from django.db import models
 
 from happybudget.app import model
@@ -42,3 +46,82 @@ class Attachment(
 
     def get_extension(self, **kwargs):
         return get_extension(self.file, **kwargs)
+
+
+def generate_import_job_id():
+    return uuid.uuid4().hex
+
+
+class ImportJob(models.Model):
+    """
+    The state of an import of a CSV document, which is stored in the database
+    such that it can be shared between the process that handles the request to
+    start the import and the process that performs the import - and such that
+    the progress of the import can be retrieved by any process while the
+    import is being performed.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    ]
+
+    id = models.CharField(
+        primary_key=True,
+        max_length=32,
+        default=generate_import_job_id,
+        editable=False
+    )
+    entity = models.CharField(max_length=32)
+    user = models.ForeignKey(
+        to='user.User',
+        on_delete=models.CASCADE,
+        related_name='import_jobs'
+    )
+    filename = models.CharField(max_length=256)
+    # The budget is referenced by its ID, rather than a foreign key, since the
+    # budget application depends on this application.
+    budget_id = models.PositiveIntegerField(null=True)
+    status = models.CharField(max_length=16, choices=STATUSES, default=PENDING)
+    processed = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    num_errors = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list)
+    detail = models.TextField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        get_latest_by = "created_at"
+        ordering = ('-created_at', )
+        verbose_name = "Import Job"
+        verbose_name_plural = "Import Jobs"
+
+    def add_error(self, row, errors):
+        # Only a limited number of errors are stored, such that importing a
+        # document where every row is invalid does not store an arbitrarily
+        # large amount of data.
+        self.num_errors += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            # The errors are converted to primitive types, as opposed to the
+            # :obj:`ErrorDetail` instances DRF uses, before they are stored.
+            self.errors.append({'row': row, 'errors': json.loads(
+                json.dumps(errors))})
+
+    def to_representation(self):
+        return {
+            'id': self.id,
+            'entity': self.entity,
+            'budget_id': self.budget_id,
+            'status': self.status,
+            'processed': self.processed,
+            'created': self.created,
+            'num_errors': self.num_errors,
+            'errors': self.errors,
+            'detail': self.detail,
+        }
@@ -155,3 +155,11 @@ class TempImageSerializer(AbstractTempSerializer):
             error_field='image'
         )
         return {'file': attrs['image'], "filename": image_name}
+
+
+class UploadImportSerializer(Serializer):
+    file = serializers.FileField()
+
+    def validate_file(self, value):
+        parse_filename(value.name, supported=['csv'], error_field='file')
+        return value
@@ -2,7 +2,12 @@ import datetime
 import logging
 from celery import current_app
 
-from .models import Attachment
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .imports import run_import
+from .models import Attachment, ImportJob
 
 
 logger = logging.getLogger('greenbudget')
@@ -35,17 +40,70 @@ def find_and_delete_empty_attachments():
     is not related to another model, but should not be deleted by this task.
     For this reason, we only remove lingering :obj:`Attachment`(s) that were
     created some time ago (5 minutes).
+
+    Note:
+    ----
+    Like :obj:`find_and_delete_empty_groups`, the empty :obj:`Attachment`(s)
+    are deleted in batches and the task returns the number of
+    :obj:`Attachment`(s) that were scanned and deleted.
     """
     logger.info(
         "Searching for empty attachments that were not previously deleted.")
 
-    attachment_qs = Attachment.objects.empty().filter(
-        created_at__gt=datetime.datetime.now() - datetime.timedelta(minutes=5))
-    if attachment_qs.count() != 0:
+    cutoff_time = datetime.datetime.now() - datetime.timedelta(minutes=5)
+    attachment_qs = Attachment.objects.filter(created_at__lt=cutoff_time)
+    scanned = attachment_qs.count()
+    deleted = attachment_qs.empty().delete_in_batches(
+        force_ignore_signal_user=True)
+    if deleted != 0:
         logger.warning(
-            f"Found {attachment_qs.count()} empty Attachment(s) in DB, "
-            "they will be deleted."
+            f"Deleted {deleted} empty Attachment(s) of {scanned} scanned "
+            "Attachment(s)."
         )
-        attachment_qs.delete(force_ignore_signal_user=True)
     else:
-        logger.info("No empty attachments to delete.")
+        logger.info(
+            f"No empty attachments to delete, scanned {scanned} "
+            "Attachment(s)."
+        )
+    return {'scanned': scanned, 'fixed': deleted}
+
+
+@current_app.task
+def perform_import(job_id):
+    """
+    Performs the import of the CSV document associated with the
+    :obj:`ImportJob` with the provided ID, returning the number of rows that
+    were processed, imported and invalid.
+    """
+    job = run_import(job_id)
+    if job is None:
+        return None
+    logger.info(
+        f"Import job {job_id} finished with status {job.status}, importing "
+        f"{job.created} of {job.processed} row(s)."
+    )
+    return {
+        'processed': job.processed,
+        'created': job.created,
+        'errors': job.num_errors
+    }
+
+
+@current_app.task
+def delete_expired_import_jobs():
+    """
+    Removes the :obj:`ImportJob`(s) that were created more than
+    `IMPORT_JOB_TIMEOUT` ago, along with the uploaded documents of the
+    :obj:`ImportJob`(s) that never finished - which happens when the task
+    performing the import is lost.
+    """
+    cutoff_time = timezone.now() - settings.IMPORT_JOB_TIMEOUT
+    jobs = ImportJob.objects.filter(created_at__lt=cutoff_time)
+    for filename in jobs \
+            .filter(status__in=[ImportJob.PENDING, ImportJob.RUNNING]) \
+            .values_list('filename', flat=True):
+        default_storage.delete(filename)
+    deleted, _ = jobs.delete()
+    if deleted != 0:
+        logger.info(f"Deleted {deleted} expired import job(s).")
+    return {'deleted': deleted}
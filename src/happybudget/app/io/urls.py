@@ -1,10 +1,11 @@
 from django.urls import path
 
-from .views import TempUploadImageView, TempUploadFileView
+from .views import TempUploadImageView, TempUploadFileView, ImportJobView
 
 app_name = "io"
 
 urlpatterns = [
     path('temp-upload-image/', TempUploadImageView.as_view()),
     path('temp-upload-file/', TempUploadFileView.as_view()),
+    path('imports/<str:job_id>/', ImportJobView.as_view()),
 ]
@@ -1,11 +1,33 @@
+from django.http import Http404
+
 from rest_framework import response, generics, status
 
 from happybudget.app import views
 
-from .models import Attachment
+from .imports import start_import
+from .models import Attachment, ImportJob
 from .serializers import (
     TempImageSerializer, TempFileSerializer, AttachmentSerializer,
-    UploadAttachmentsSerializer)
+    UploadAttachmentsSerializer, UploadImportSerializer)
+
+
+def import_response(request, entity, budget=None):
+    """
+    Starts an :obj:`ImportJob` for the CSV document uploaded with the provided
+    request, returning the state of the :obj:`ImportJob` in the response.
+    """
+    serializer = UploadImportSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    job = start_import(
+        entity=entity,
+        user=request.user,
+        file=serializer.validated_data['file'],
+        budget=budget
+    )
+    return response.Response(
+        job.to_representation(),
+        status=status.HTTP_202_ACCEPTED
+    )
 
 
 class TempUploadView(generics.GenericAPIView):
@@ -28,6 +50,22 @@ class TempUploadFileView(TempUploadView):
     serializer_class = TempFileSerializer
 
 
+class ImportJobView(views.GenericView):
+    """
+    View to handle requests to the following endpoints:
+
+    (1) GET /io/imports/<job_id>/
+    """
+
+    def get(self, request, *args, **kwargs):
+        job = ImportJob.objects.filter(pk=kwargs['job_id']).first()
+        # An ImportJob that was started by another user is treated as if it
+        # does not exist.
+        if job is None or job.user_id != request.user.pk:
+            raise Http404()
+        return response.Response(job.to_representation())
+
+
 class GenericAttachmentViewSet(
     views.ListModelMixin,
     views.DestroyModelMixin,
@@ -87,11 +125,28 @@ class GenericAttachmentViewSet(
         """
         return self.instance.attachments.all()
 
+    def mark_budget_updated(self):
+        """
+        Marks the :obj:`Budget` that the instance the :obj:`Attachment`(s)
+        belong to is associated with, if any, as having been updated.  The
+        :obj:`Attachment`(s) are included in the responses of the instance,
+        so the responses that are validated against the last time the
+        :obj:`Budget` was updated would otherwise remain valid.
+        """
+        budget = getattr(self.instance, 'budget', None)
+        if budget is not None:
+            budget.mark_updated(self.request.user)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self.mark_budget_updated()
+
     def create(self, request, *args, **kwargs):
         serializer = UploadAttachmentsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         attachments = serializer.save(created_by=request.user)
         self.instance.attachments.add(*attachments)
+        self.mark_budget_updated()
         root_serializer_class = self.get_serializer_class()
         return response.Response(
             {'data': [root_serializer_class(a).data for a in attachments]},
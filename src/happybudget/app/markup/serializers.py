@@ -8,6 +8,7 @@ from happybudget.app.budget.models import BaseBudget
 from happybudget.app.budgeting.serializers import AncestrySerializer
 from happybudget.app.serializers import ModelSerializer
 from happybudget.app.tabling.fields import TablePrimaryKeyRelatedField
+from happybudget.app.tabling.serializers import ValuesSerializer
 
 from .models import Markup
 
@@ -47,6 +48,10 @@ class MarkupSimpleSerializer(ModelSerializer):
         fields = ('id', 'identifier', 'description', 'type')
 
 
+class MarkupSimpleValuesSerializer(ValuesSerializer):
+    serializer_class = MarkupSimpleSerializer
+
+
 class MarkupSerializer(AncestrySerializer):
     id = serializers.IntegerField(read_only=True)
     type = serializers.CharField(read_only=True)
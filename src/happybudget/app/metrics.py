@@ -0,0 +1,502 @@
+"""
+Collection of request, cache, outbound request and Celery task metrics that
+are exposed in the Prometheus text format.
+
+Metrics are collected in the memory of each process.  Since the application is
+served by several Gunicorn workers and Celery workers, each process can also
+periodically write a snapshot of its metrics to a shared directory, configured
+via `METRICS_DIRECTORY`, such that the metrics endpoint can aggregate the
+metrics of all of the processes - regardless of which worker handles the
+request for the metrics.  The snapshots of processes that exit are merged into
+an archive in the same directory, such that the aggregated counters never
+decrease.
+"""
+import atexit
+import bisect
+import contextlib
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('happybudget')
+
+
+# The buckets of histograms that measure durations, in seconds.
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# The buckets of histograms that measure the number of queries performed.
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# The minimum amount of time, in seconds, between snapshots of the metrics of
+# a process being written to the shared directory.
+FLUSH_INTERVAL = 1.0
+
+# The file in the shared directory that the snapshots of processes that exited
+# are merged into, and the file that is locked while merging them.
+ARCHIVE_FILENAME = 'archive.json'
+ARCHIVE_LOCK_FILENAME = 'archive.lock'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = [
+        (k, str(v).replace('\\', r'\\').replace('\n', r'\n').replace(
+            '"', r'\"'))
+        for k, v in labels
+    ]
+    return '{' + ','.join([f'{k}="{v}"' for k, v in escaped]) + '}'
+
+
+class Metric:
+    """
+    Abstract base class for a metric with a fixed set of label names, whose
+    values are tracked for each distinct combination of label values.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def get_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} requires the labels "
+                f"{', '.join(self.labelnames)}."
+            )
+        return tuple([str(labels[name]) for name in self.labelnames])
+
+    def initial_value(self):
+        raise NotImplementedError()
+
+    def merge_values(self, a, b):
+        raise NotImplementedError()
+
+    def samples(self, key, value):
+        raise NotImplementedError()
+
+    def clear(self):
+        with self._lock:
+            self._values = {}
+
+    def snapshot(self):
+        with self._lock:
+            return [[list(k), v] for k, v in self._values.items()]
+
+    def render(self, values):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for key in sorted(values):
+            for suffix, labels, v in self.samples(key, values[key]):
+                lines.append(
+                    f"{self.name}{suffix}{format_labels(labels)} "
+                    f"{format_value(v)}"
+                )
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def initial_value(self):
+        return 0.0
+
+    def merge_values(self, a, b):
+        return a + b
+
+    def samples(self, key, value):
+        yield '', list(zip(self.labelnames, key)), value
+
+    def inc(self, amount=1.0, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        key = self.get_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self.get_key(labels), 0.0)
+
+
+class Histogram(Metric):
+    """
+    A metric that tracks the distribution of observed values in buckets.  The
+    value tracked for each combination of labels is a list of the
+    non-cumulative counts of each bucket, followed by the sum and the count of
+    the observed values.
+    """
+    type = 'histogram'
+
+    def __init__(self, *args, buckets=DURATION_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def initial_value(self):
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def merge_values(self, a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def samples(self, key, value):
+        labels = list(zip(self.labelnames, key))
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'), ), value):
+            cumulative += count
+            yield '_bucket', labels + [('le', format_value(bound))], cumulative
+        yield '_sum', labels, value[-2]
+        yield '_count', labels, value[-1]
+
+    def observe(self, amount, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        key = self.get_key(labels)
+        with self._lock:
+            value = self._values.setdefault(key, self.initial_value())
+            value[bisect.bisect_left(self.buckets, amount)] += 1
+            value[-2] += amount
+            value[-1] += 1
+
+    def count(self, **labels):
+        value = self._values.get(self.get_key(labels))
+        return value[-1] if value is not None else 0
+
+
+class Registry:
+    """
+    The registry of all of the :obj:`Metric`(s) collected by the application,
+    which is responsible for writing snapshots of the metrics of the process
+    to the shared directory and rendering the metrics in the Prometheus text
+    format.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._last_flush = None
+        self._process = None
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def register(self, metric):
+        if metric.name in [m.name for m in self._metrics]:
+            raise Exception(f"Metric {metric.name} is already registered.")
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.register(Counter(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.register(Histogram(*args, **kwargs))
+
+    def clear(self):
+        for metric in self._metrics:
+            metric.clear()
+
+    def snapshot(self):
+        return dict([(m.name, m.snapshot()) for m in self._metrics])
+
+    @property
+    def snapshot_path(self):
+        """
+        The path of the snapshot of the current process, which is keyed by
+        the PID of the process and the time the process first wrote a
+        snapshot, such that a process that is assigned the PID of a process
+        that exited does not adopt its snapshot.
+
+        The snapshot is archived when the process exits, and the Gunicorn
+        master archives the snapshots of workers that exit without doing so.
+        """
+        pid = os.getpid()
+        if self._process is None or self._process[0] != pid:
+            self._process = (pid, f"{pid}-{int(time.time() * 1000)}.json")
+            atexit.register(archive_process_snapshot, pid, os.path.join(
+                settings.METRICS_DIRECTORY, self._process[1]))
+        return os.path.join(settings.METRICS_DIRECTORY, self._process[1])
+
+    def flush(self, force=False):
+        """
+        Writes the snapshot of the metrics of the current process to the shared
+        directory, if the directory is configured and a snapshot was not
+        written within the last `FLUSH_INTERVAL` seconds.
+        """
+        if not settings.METRICS_DIRECTORY:
+            return
+        now = time.monotonic()
+        if not force and self._last_flush is not None \
+                and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        path = self.snapshot_path
+        try:
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
+
+    def snapshots(self):
+        if not settings.METRICS_DIRECTORY:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = {}
+        pattern = os.path.join(settings.METRICS_DIRECTORY, '*.json')
+        for path in sorted(glob.glob(pattern)):
+            if os.path.basename(path) == ARCHIVE_FILENAME:
+                continue
+            try:
+                with open(path) as f:
+                    snapshots[os.path.basename(path)] = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read metrics from {path}: {e}")
+        # The archive is read after the snapshots, such that a snapshot that
+        # is archived while the snapshots are read is either read from its
+        # own file and skipped in the archive or only read from the archive.
+        archive = read_archive(settings.METRICS_DIRECTORY)
+        return [
+            snapshot for name, snapshot in snapshots.items()
+            if name not in archive['archived']
+        ] + [archive['metrics']]
+
+    def render(self):
+        """
+        Renders the metrics of all processes in the Prometheus text format,
+        summing the values of the same metric and labels across processes.
+        """
+        lines = []
+        snapshots = self.snapshots()
+        for metric in self._metrics:
+            values = {}
+            for snapshot in snapshots:
+                for key, value in snapshot.get(metric.name, []):
+                    key = tuple(key)
+                    values[key] = metric.merge_values(
+                        values.get(key, metric.initial_value()), value)
+            lines += metric.render(values)
+        return "\n".join(lines) + "\n"
+
+
+def read_archive(directory):
+    try:
+        with open(os.path.join(directory, ARCHIVE_FILENAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'archived': [], 'metrics': {}}
+
+
+def merge_snapshot_values(a, b):
+    # The values of histograms are lists of counts and the values of counters
+    # are counts.
+    if isinstance(a, list):
+        return [x + y for x, y in zip(a, b)]
+    return a + b
+
+
+def archive_snapshots(directory, paths):
+    """
+    Merges the snapshots at the provided paths, which belong to processes
+    that exited, into the archive of the shared directory and removes them.
+
+    Since every metric is a counter or a histogram, removing the snapshot of
+    a process that exited would decrease the aggregated values - which
+    Prometheus interprets as a reset of the counter.  Instead, the values of
+    the exited processes are retained in the archive, like the multiprocess
+    mode of the Prometheus client retains the values of dead processes.
+    """
+    lock_path = os.path.join(directory, ARCHIVE_LOCK_FILENAME)
+    with open(lock_path, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = read_archive(directory)
+        archived = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                # The snapshot was already archived, or never written.
+                continue
+            for name, entries in snapshot.items():
+                values = dict([
+                    (tuple(k), v) for k, v in archive['metrics'].get(name, [])
+                ])
+                for key, value in entries:
+                    key = tuple(key)
+                    values[key] = merge_snapshot_values(values[key], value) \
+                        if key in values else value
+                archive['metrics'][name] = [
+                    [list(k), v] for k, v in values.items()]
+            archived.append(path)
+        if not archived:
+            return
+        # The names of the archived snapshots are recorded until their files
+        # are removed, such that readers do not count them twice.
+        archive['archived'] = [
+            n for n in archive['archived']
+            if os.path.exists(os.path.join(directory, n))
+        ] + [os.path.basename(p) for p in archived]
+        archive_path = os.path.join(directory, ARCHIVE_FILENAME)
+        with open(f"{archive_path}.tmp", 'w') as f:
+            json.dump(archive, f)
+        os.replace(f"{archive_path}.tmp", archive_path)
+        for path in archived:
+            for filename in (path, f"{path}.tmp"):
+                with contextlib.suppress(OSError):
+                    os.remove(filename)
+
+
+def archive_process_snapshot(pid, path):
+    # Forked processes inherit the exit handlers of their parent, so the
+    # snapshot is only archived by the process that wrote it.
+    if os.getpid() != pid:
+        return
+    registry.flush(force=True)
+    try:
+        archive_snapshots(os.path.dirname(path), [path])
+    except OSError as e:
+        logger.warning(f"Could not archive metrics from {path}: {e}")
+
+
+registry = Registry()
+
+
+HTTP_REQUESTS = registry.counter(
+    'happybudget_http_requests_total',
+    'The number of HTTP requests handled.',
+    ['view', 'method', 'status']
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    'happybudget_http_request_duration_seconds',
+    'The time it takes to respond to HTTP requests.',
+    ['view', 'method']
+)
+HTTP_REQUEST_QUERIES = registry.histogram(
+    'happybudget_http_request_db_queries',
+    'The number of database queries performed to respond to HTTP requests.',
+    ['view', 'method'],
+    buckets=QUERY_BUCKETS
+)
+CACHE_REQUESTS = registry.counter(
+    'happybudget_cache_requests_total',
+    'The number of lookups in the application caches.',
+    ['cache', 'result']
+)
+OUTBOUND_REQUESTS = registry.counter(
+    'happybudget_outbound_requests_total',
+    'The number of HTTP requests made to third party services.',
+    ['service', 'outcome']
+)
+OUTBOUND_REQUEST_DURATION = registry.histogram(
+    'happybudget_outbound_request_duration_seconds',
+    'The time it takes for third party services to respond to HTTP requests.',
+    ['service']
+)
+TASKS = registry.counter(
+    'happybudget_celery_tasks_total',
+    'The number of Celery tasks performed.',
+    ['task', 'state']
+)
+TASK_DURATION = registry.histogram(
+    'happybudget_celery_task_duration_seconds',
+    'The time it takes to perform Celery tasks.',
+    ['task']
+)
+TASK_QUERIES = registry.histogram(
+    'happybudget_celery_task_db_queries',
+    'The number of database queries performed by Celery tasks.',
+    ['task'],
+    buckets=QUERY_BUCKETS
+)
+
+
+class QueryCounter:
+    """
+    Counts the queries executed on a database connection.  This is used in
+    favor of :obj:`django.test.utils.CaptureQueriesContext`, which relies on
+    the bounded query log of the connection and will stop counting once the
+    log is full - which quickly happens when generating large budgets.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def count_queries():
+    """
+    Returns a :obj:`contextlib.ExitStack` that counts the queries performed on
+    all of the configured database connections while it is open, along with
+    the :obj:`QueryCounter` that counts them.
+    """
+    counter = QueryCounter()
+    stack = contextlib.ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(counter))
+    return stack, counter
+
+
+@contextlib.contextmanager
+def track_outbound(service):
+    """
+    Context manager that tracks the number of HTTP requests made to the
+    provided third party service inside of the context, whether or not they
+    succeeded, and the time it took for the service to respond.
+    """
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'success'
+    finally:
+        OUTBOUND_REQUEST_DURATION.observe(
+            time.perf_counter() - start, service=service)
+        OUTBOUND_REQUESTS.inc(service=service, outcome=outcome)
+
+
+# The start time and the query counters of the Celery tasks that are currently
+# being performed by the process, indexed by the task ID.
+_active_tasks = {}
+
+
+def track_task_prerun(task_id=None, **kwargs):
+    if not settings.METRICS_ENABLED:
+        return
+    stack, counter = count_queries()
+    stack.__enter__()
+    _active_tasks[task_id] = (time.perf_counter(), stack, counter)
+
+
+def track_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    tracked = _active_tasks.pop(task_id, None)
+    if tracked is None:
+        return
+    start, stack, counter = tracked
+    stack.__exit__(None, None, None)
+    TASK_DURATION.observe(time.perf_counter() - start, task=task.name)
+    TASK_QUERIES.observe(counter.count, task=task.name)
+    TASKS.inc(task=task.name, state=state or 'UNKNOWN')
+    registry.flush(force=True)
@@ -1,8 +1,19 @@
+import hmac
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from rest_framework.permissions import SAFE_METHODS
+
+from happybudget.app.budget import changes
+
+from . import metrics, replicas
 from .cache import endpoint_cache
 from .model import model
+from .querylog import log_slow_queries
 
 
 class ModelRequestMiddleware(MiddlewareMixin):
@@ -28,6 +39,119 @@ class HealthCheckMiddleware(MiddlewareMixin):
         return None
 
 
+class MetricsMiddleware:
+    """
+    Middleware that collects the latency and the number of database queries
+    of each request, keyed by the name of the resolved URL and the request
+    method, and exposes the collected metrics in the Prometheus text format
+    at `METRICS_PATH`.
+
+    Like the :obj:`HealthCheckMiddleware`, the metrics are returned before
+    Django's ALLOWED_HOSTS setting is enforced, such that the metrics can be
+    scraped from a dynamic IP address.  Access to the metrics is instead
+    restricted by the bearer token configured as `METRICS_TOKEN`.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def metrics_response(self, request):
+        if settings.METRICS_TOKEN:
+            authorization = request.META.get('HTTP_AUTHORIZATION', '')
+            if not hmac.compare_digest(
+                    authorization, f"Bearer {settings.METRICS_TOKEN}"):
+                return HttpResponse("Unauthorized", status=401)
+        return HttpResponse(
+            metrics.registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    def __call__(self, request):
+        if request.META["PATH_INFO"] == settings.METRICS_PATH:
+            return self.metrics_response(request)
+
+        stack, counter = metrics.count_queries()
+        start = time.perf_counter()
+        with stack:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        # Requests that do not resolve to a view are grouped together, such
+        # that arbitrary paths do not create an unbounded number of labels.
+        view = getattr(request.resolver_match, 'view_name', None) \
+            or 'unresolved'
+        metrics.HTTP_REQUESTS.inc(
+            view=view, method=request.method, status=response.status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(
+            elapsed, view=view, method=request.method)
+        metrics.HTTP_REQUEST_QUERIES.observe(
+            counter.count, view=view, method=request.method)
+        metrics.registry.flush()
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """
+    Middleware that logs the queries of requests that perform a slow query or
+    an excessive number of queries, attributed to the application code that
+    issued them, when `SLOW_QUERY_LOG_ENABLED` is set.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with log_slow_queries(f"{request.method} {request.path}"):
+            return self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """
+    Middleware that pins the client to the primary database for
+    `REPLICA_PIN_DURATION` after it successfully performs a write, such that
+    its subsequent reads are not routed to a replica that may not have
+    replicated the write yet.
+    """
+
+    def __init__(self, get_response):
+        if not replicas.replica_enabled():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            replicas.pin(response)
+        return response
+
+
+class BudgetChangesMiddleware:
+    """
+    Middleware that records the rows of budgets whose calculated values change
+    while responding to requests that may write, when `BUDGET_CHANGES_ENABLED`
+    is set.  Changes recorded while responding to a request that fails are
+    discarded, since the writes that caused them are rolled back.
+    """
+
+    def __init__(self, get_response):
+        if not settings.BUDGET_CHANGES_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+        with changes.recording() as recording:
+            response = self.get_response(request)
+            if response.status_code >= 400:
+                recording.discard()
+        return response
+
+
 class CacheUserMiddleware(MiddlewareMixin):
     """
     Middleware that associates the user associated with the incoming HTTP
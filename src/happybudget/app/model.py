@@ -99,6 +99,7 @@ class model_is_deleting(signals.disable):
             assert isinstance(disable_signals, bool), \
                 "The `disable_signals` parameter must either be an iterable " \
                 "of signals or a boolean."
+            super().__init__()
             self._disable_signals = disable_signals
 
         # If the model does not have the field that is used to indicate deleting
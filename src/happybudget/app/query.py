@@ -10,7 +10,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, connections, transaction
 from django.db.models.deletion import Collector as DjangoCollector
-from django.utils.functional import partition
+from django.utils.functional import cached_property, partition
 
 
 class Collector(DjangoCollector):
@@ -139,6 +139,22 @@ class QuerySetMixin:
             return True
         return False
 
+    def get_bulk_create_batch_size(self, batch_size=None):
+        """
+        Returns the batch size that should be used when bulk creating instances
+        with the current :obj:`QuerySet` (self).
+
+        If the batch size is not explicitly provided, the default batch size
+        for the vendor of the database backend the :obj:`QuerySet` writes to is
+        used.  Django will still reduce the batch size if the number of query
+        parameters in each batch would exceed the limits of the backend.
+        """
+        if batch_size is not None:
+            return batch_size
+        vendor = connections[self.db].vendor
+        return settings.BULK_CREATE_BATCH_SIZES.get(
+            vendor, settings.DEFAULT_BULK_BATCH_SIZE)
+
     def delete(self, **kwargs):
         """
         Overrides the traditional `.delete()` method of
@@ -178,6 +194,33 @@ class QuerySetMixin:
         self._result_cache = None
         return deleted, _rows_count
 
+    def delete_in_batches(self, batch_size=None, **kwargs):
+        """
+        Deletes the instances of the current :obj:`QuerySet` (self) in batches
+        of size `batch_size`, as opposed to collecting every instance that
+        should be deleted in memory at once.
+
+        The primary keys are evaluated in a single query up front, and each
+        batch is then deleted via the filters of the current :obj:`QuerySet`
+        (self) restricted to the primary keys in that batch.  This means that
+        if an instance no longer satisfies the filters of the :obj:`QuerySet`
+        by the time its batch is deleted, it will not be deleted.
+
+        Keyword arguments are passed through to the `.delete()` method, and
+        subsequently to the signals that are fired.
+
+        Returns the total number of instances of the :obj:`QuerySet`'s model
+        that were deleted.
+        """
+        batch_size = batch_size or settings.DEFAULT_BULK_DELETE_BATCH_SIZE
+        pks = list(self.order_by('pk').values_list('pk', flat=True))
+        deleted = 0
+        for i in range(0, len(pks), batch_size):
+            _, rows_count = self.filter(pk__in=pks[i:i + batch_size]) \
+                .delete(**kwargs)
+            deleted += rows_count.get(self.model._meta.label, 0)
+        return deleted
+
 
 class QuerySet(QuerySetMixin, models.QuerySet):
     def bulk_update(self, *args, **kwargs):
@@ -185,7 +228,8 @@ class QuerySet(QuerySetMixin, models.QuerySet):
         return super().bulk_update(*args, **kwargs)
 
     def bulk_create(self, instances, **kwargs):
-        kwargs.setdefault('batch_size', settings.DEFAULT_BULK_BATCH_SIZE)
+        kwargs['batch_size'] = self.get_bulk_create_batch_size(
+            kwargs.get('batch_size'))
         predetermine_pks = kwargs.pop('predetermine_pks', False)
         if predetermine_pks is False or not self.is_sqlite():
             return super().bulk_create(instances, **kwargs)
@@ -219,14 +263,18 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
         kwargs.setdefault('batch_size', settings.DEFAULT_BULK_BATCH_SIZE)
         return super().bulk_update(*args, **kwargs)
 
-    @property
+    @cached_property
     def polymorphic_base(self):
         assert len(self.model.__bases__) == 1, \
             "Models that inherit from multiple tables at the same time are " \
             "not supported."
         return self.model.__bases__[0]
 
-    @property
+    @cached_property
+    def polymorphic_ctype(self):
+        return ContentType.objects.get_for_model(self.model)
+
+    @cached_property
     def polymorphic_base_model_fields(self):
         fields = []
         # Note the use of `local_fields` - this deviates very much from the
@@ -238,7 +286,7 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
                 fields.append(field)
         return fields
 
-    @property
+    @cached_property
     def polymorphic_child_model_fields(self):
         fields = []
         # Note the use of `local_fields` - this deviates very much from the
@@ -256,7 +304,7 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
                 fields.append(field)
         return fields
 
-    @property
+    @cached_property
     def polymorphic_child_pointer_field(self):
         """
         Every Polymorphic child model has an auto field that is suffixed with
@@ -272,7 +320,7 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
             % self.model.__name__
         )
 
-    @property
+    @cached_property
     def auto_pk_field(self):
         for field in self.polymorphic_base._meta.local_fields:
             if isinstance(field, models.fields.AutoField) \
@@ -305,9 +353,7 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
                 # not specifying a `created_by` user for any given Budget.
                 pass
 
-        kwargs.update(
-            polymorphic_ctype=ContentType.objects.get_for_model(self.model),
-        )
+        kwargs.update(polymorphic_ctype=self.polymorphic_ctype)
         if pk is not None:
             kwargs.update(pk=pk)
         return self.polymorphic_base(**kwargs)
@@ -332,7 +378,8 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
     def bulk_create(self, instances, **kwargs):
         refresh_from_db = kwargs.pop('refresh_from_db', False)
         return_created_objects = kwargs.pop('return_created_objects', False)
-        kwargs.setdefault('batch_size', settings.DEFAULT_BULK_BATCH_SIZE)
+        kwargs['batch_size'] = self.get_bulk_create_batch_size(
+            kwargs.get('batch_size'))
 
         if not instances:
             return instances
@@ -352,8 +399,7 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
 
         # Make sure that the instances that we are bulk creating are all of
         # the same model type pertaining to this queryset.
-        assert len(set([type(inst) for inst in instances])) == 1 \
-            and all([type(a) is self.model for a in instances]), \
+        assert all([type(a) is self.model for a in instances]), \
             "All instances being bulk created must be of type %s." \
             % type(self.model)
 
@@ -365,8 +411,6 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
             "PK values specified already."
 
         with transaction.atomic(using=self.db, savepoint=False):
-            base_instances = []
-
             max_id = None
             if self.is_sqlite():
                 try:
@@ -377,23 +421,25 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
             # Reinstantiate the polymorphic base models with only the fields
             # local to the base model, keeping track of the primary keys that are
             # used for each polymorphic base model.
-            for i, instance in enumerate(instances):
-                kwargs = {'instance': instance}
-                if max_id is not None:
-                    kwargs['pk'] = max_id + i + 1
-                base_instances.append(self.recreate_polymorphic_base(**kwargs))
+            base_instances = [
+                self.recreate_polymorphic_base(
+                    instance=instance,
+                    pk=max_id + i + 1 if max_id is not None else None
+                )
+                for i, instance in enumerate(instances)
+            ]
 
             # The created polymorphic base models that are not associated with
-            # their children yet.
+            # their children yet.  Note that Django's bulk create returns the
+            # created instances in the same order that they were provided in.
             created_polymorphic_bases = self.polymorphic_base \
-                .non_polymorphic.bulk_create(base_instances)
+                .non_polymorphic.bulk_create(
+                    base_instances, batch_size=kwargs['batch_size'])
 
-            child_instances = []
-            for i, instance in enumerate(instances):
-                child_instances.append(self.recreate_polymorphic_child(
-                    instance=instance,
-                    base=created_polymorphic_bases[i]
-                ))
+            child_instances = [
+                self.recreate_polymorphic_child(instance=instance, base=base)
+                for instance, base in zip(instances, created_polymorphic_bases)
+            ]
             # Since the child model is not a base model, Django's non-polymorphic
             # bulk-create will not work.  We have to use our tweaked form of
             # it for the children.
@@ -411,17 +457,17 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
                     # pylint: disable=expression-not-assigned
                     [obj.refresh_from_db() for obj in created_children]
                     return created_children
-                for child in created_children:
-                    parent = [
-                        p for p in created_polymorphic_bases
-                        # if p.pk == getattr(child,
-                        # self.polymorphic_child_pointer_field.name)
-                        if p.pk == child.pk  # I think this is safe.
-                    ][0]
-                    for field in self.polymorphic_base._meta.local_fields:
-                        if not isinstance(field, models.fields.AutoField):
-                            setattr(child, field.name,
-                                    getattr(parent, field.name))
+                # The children are created in the same order as the bases they
+                # point to, so they can be paired in a single pass as opposed
+                # to looking up the base for each child by its primary key.
+                base_fields = [
+                    f for f in self.polymorphic_base._meta.local_fields
+                    if not isinstance(f, models.fields.AutoField)
+                ]
+                for child, parent in zip(
+                        created_children, created_polymorphic_bases):
+                    for field in base_fields:
+                        setattr(child, field.name, getattr(parent, field.name))
                 return created_children
             return None
 
@@ -442,7 +488,8 @@ class PolymorphicQuerySet(QuerySetMixin, RootPolymorphicQuerySet):
         Polymorphic children models.
         """
         ignore_conflicts = kwargs.pop('ignore_conflicts', False)
-        kwargs.setdefault('batch_size', settings.DEFAULT_BULK_BATCH_SIZE)
+        kwargs['batch_size'] = self.get_bulk_create_batch_size(
+            kwargs.get('batch_size'))
 
         if not instances:
             return instances
@@ -0,0 +1,176 @@
+import contextlib
+import logging
+import os
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger('happybudget')
+
+
+SOURCE_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APPLICATION_ROOT = os.path.join(SOURCE_ROOT, 'happybudget')
+
+# Modules that wrap the execution of queries or requests, and should therefore
+# never be attributed as the source of a query.
+IGNORED_MODULES = [
+    os.path.abspath(__file__),
+    os.path.join(APPLICATION_ROOT, 'app', 'metrics.py'),
+    os.path.join(APPLICATION_ROOT, 'app', 'middleware.py'),
+]
+
+
+def normalize_sql(sql):
+    """
+    Normalizes the provided SQL such that the same query performed with
+    different parameters, or with a different number of parameters in an IN
+    clause, is aggregated as the same query.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r'SAVEPOINT "[^"]*"', "SAVEPOINT ?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = sql.replace("%s", "?")
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def find_source():
+    """
+    Returns the file, line number and function of the innermost frame in the
+    application code that led to the execution of the current query.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPLICATION_ROOT) \
+                and filename not in IGNORED_MODULES:
+            return (
+                f"{os.path.relpath(filename, SOURCE_ROOT)}:{frame.f_lineno} "
+                f"in {frame.f_code.co_name}"
+            )
+        frame = frame.f_back
+    return "unknown"
+
+
+class QueryLogEntry:
+    def __init__(self, sql, source):
+        self.sql = sql
+        self.source = source
+        self.count = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+
+    def __str__(self):
+        return (
+            f"{self.count}x {self.duration * 1000:.1f}ms "
+            f"(max {self.max_duration * 1000:.1f}ms) {self.source}: "
+            f"{self.sql}"
+        )
+
+
+class QueryLog:
+    """
+    A database execute wrapper that aggregates the queries it executes by
+    their normalized SQL and the innermost frame of application code that
+    issued them.
+
+    The aggregated queries are logged when any one query takes longer than
+    `SLOW_QUERY_THRESHOLD` or when more than `SLOW_QUERY_COUNT_THRESHOLD`
+    queries are performed, such that the sources of slow and repeated queries
+    - whether they are manager methods, signal receivers or serializers - are
+    visible.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.entries = {}
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - start)
+
+    def record(self, sql, duration):
+        normalized = normalize_sql(sql)
+        source = find_source()
+        entry = self.entries.setdefault(
+            (normalized, source), QueryLogEntry(normalized, source))
+        entry.count += 1
+        entry.duration += duration
+        entry.max_duration = max(entry.max_duration, duration)
+        self.count += 1
+        self.duration += duration
+
+    @property
+    def slow_entries(self):
+        threshold = settings.SLOW_QUERY_THRESHOLD.total_seconds()
+        return [e for e in self.entries.values() if e.max_duration > threshold]
+
+    @property
+    def should_log(self):
+        return len(self.slow_entries) != 0 \
+            or self.count > settings.SLOW_QUERY_COUNT_THRESHOLD
+
+    def report(self):
+        entries = sorted(
+            self.entries.values(), key=lambda e: e.duration, reverse=True)
+        lines = [
+            f"{self.label} performed {self.count} queries in "
+            f"{self.duration * 1000:.1f}ms, {len(self.slow_entries)} of which "
+            "were slow."
+        ]
+        lines += [str(e) for e in entries[:settings.SLOW_QUERY_LOG_LIMIT]]
+        return "\n".join(lines)
+
+    def log(self):
+        if self.should_log:
+            logger.warning(self.report(), extra={
+                'label': self.label,
+                'num_queries': self.count,
+                'num_slow_queries': len(self.slow_entries),
+            })
+
+
+@contextlib.contextmanager
+def log_slow_queries(label):
+    """
+    Context manager that logs the slow queries, or the excessive number of
+    queries, performed on any of the database connections inside of the
+    context.
+    """
+    query_log = QueryLog(label)
+    try:
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_log))
+            yield query_log
+    finally:
+        query_log.log()
+
+
+# The contexts of the slow query logs of the Celery tasks that are currently
+# being performed by the process, indexed by the task ID.
+_active_tasks = {}
+
+
+def track_task_prerun(task_id=None, task=None, **kwargs):
+    if not settings.SLOW_QUERY_LOG_ENABLED:
+        return
+    stack = contextlib.ExitStack()
+    stack.enter_context(log_slow_queries(f"Task {task.name}"))
+    _active_tasks[task_id] = stack
+
+
+def track_task_postrun(task_id=None, **kwargs):
+    stack = _active_tasks.pop(task_id, None)
+    if stack is not None:
+        stack.close()
@@ -0,0 +1,113 @@
+"""
+Routing of the reads performed by designated read-only endpoints to a read
+replica of the primary database.
+
+Reads are only ever routed to the replica inside of the
+:obj:`read_from_replica` context, which the :obj:`GenericView` enters when
+handling a safe request to a view that designates the request as eligible
+for the replica.  Outside of that context, all reads and writes are performed
+against the primary database, such that endpoints have to explicitly opt in
+to potentially stale reads.
+
+Since the replica lags behind the primary, a user that just performed a write
+would not necessarily see the result of their write on the next read.  To
+provide read-your-writes consistency, the :obj:`ReplicaPinMiddleware` pins the
+client to the primary database for `REPLICA_PIN_DURATION` after each
+successful write, via a short lived cookie.
+"""
+import contextlib
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_local = threading.local()
+
+# Models that should never be read from the replica, regardless of the
+# context.  The entries of the DatabaseCache are written and invalidated on
+# the primary database, so reading them from a lagging replica could serve a
+# response that was already invalidated.
+PRIMARY_ONLY_APPS = ['django_cache']
+
+
+def replica_enabled():
+    return settings.REPLICA_DATABASE is not None
+
+
+def in_replica_context():
+    return getattr(_local, 'depth', 0) > 0
+
+
+@contextlib.contextmanager
+def read_from_replica():
+    """
+    Context manager that routes the reads performed inside of the context to
+    the replica database, if a replica is configured.  Writes performed inside
+    of the context are still performed against the primary database.
+    """
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+
+
+def is_pinned(request):
+    """
+    Returns whether or not the client that submitted the provided request
+    performed a write recently enough that its reads should be performed
+    against the primary database.
+    """
+    return settings.REPLICA_PIN_COOKIE_NAME in request.COOKIES
+
+
+def pin(response):
+    """
+    Pins the client that receives the provided response to the primary
+    database for `REPLICA_PIN_DURATION`.
+    """
+    response.set_cookie(
+        settings.REPLICA_PIN_COOKIE_NAME,
+        '1',
+        max_age=int(settings.REPLICA_PIN_DURATION.total_seconds()),
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite=settings.SESSION_COOKIE_SAMESITE
+    )
+
+
+class ReplicaRouter:
+    """
+    Database router that routes reads performed inside of the
+    :obj:`read_from_replica` context to the `REPLICA_DATABASE` and ensures
+    that all writes are performed against the primary database - including
+    writes to instances that were read from the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_enabled() and in_replica_context() \
+                and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        if replica_enabled() and instance is not None \
+                and instance._state.db == settings.REPLICA_DATABASE:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica contains the same data as the primary database, so
+        # instances read from either can be related to one another.
+        aliases = (DEFAULT_DB_ALIAS, settings.REPLICA_DATABASE)
+        if replica_enabled() and obj1._state.db in aliases \
+                and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if replica_enabled() and db == settings.REPLICA_DATABASE:
+            return False
+        return None
@@ -1,10 +1,10 @@
 import contextlib
 import functools
+import threading
 import weakref
 
 from django import dispatch
-from django.dispatch.dispatcher import _make_id
-from django.utils.inspect import func_accepts_kwargs
+from django.dispatch.dispatcher import NONE_ID
 
 from happybudget.lib.utils import ensure_iterable
 
@@ -12,8 +12,8 @@ from happybudget.lib.utils import ensure_iterable
 class Registry:
     """
     A maintained registry of the registered instances of :obj:`Signal` in the
-    application.  The :obj:`Registry` is used for connecting and/or reconnecting
-    all of the registered :obj:`Signal` in the application.
+    application.  The :obj:`Registry` is used for disabling all of the
+    registered :obj:`Signal` in the application.
     """
 
     def __init__(self, signals=None):
@@ -46,40 +46,32 @@ class Signal(dispatch.Signal):
     functionality that this application requires.  This additional functionality
     and behavior includes the following:
 
-    Sender Based Disconnect
-    -----------------------
+    Sender Based Disabling
+    ----------------------
     With traditional Django signals, it is not possible to disconnect a signal
-    from it's receivers for only a specific sender.  This extension makes this
-    possible, such that we can temporarily disable a signal that is connected
-    to all receivers registered for a specific sender type.
-
-    Reconnection
-    ------------
-    With traditional Django signals, you can disconnect a signal from it's
-    receiver.  However, doing so only temporarily on a systematic level is
-    problematic, because in order to reconnect the receiver and have things
-    behave as they previously did you need to reconnect the receiver with the
-    exact same configuration that it was initially connected with (i.e. with
-    the same sender, dispatch_uid and weak parameters).
-
-    Here, this extension maintains a record of the connection parameters that
-    were used to connect the :obj:`Signal` to each receiver, which allows us
-    to disconnect a :obj:`Signal` instance from a given receiver (or all
-    receivers) and then reconnect them in the exact same way they were
-    originally connected in.
-
-    This allows us to temporarily disable a signal while performing an action:
+    from it's receivers for only a specific sender.  This extension makes it
+    possible to temporarily disable a signal for only the receivers that were
+    registered for a specific sender type.
+
+    Disabling
+    ---------
+    This extension also allows us to temporarily disable a signal while
+    performing an action:
 
     >>> with signals.post_delete.disable():
     >>>     ...
 
     Furthermore, this, in conjunction with the :obj:`Registry`, allows us to
-    temporarily disconnect all signals while performing an action, and then
-    reconnect them afterwards:
+    temporarily disable all signals while performing an action:
 
     >>> with signals.disable():
     >>>     ...
 
+    Disabling a signal does not disconnect its receivers, but only prevents
+    the receivers from being called in the current thread - such that
+    disabling a signal while handling one request does not affect the requests
+    that are concurrently handled by other threads of the same process.
+
     Parameters:
     ----------
     name: :obj:`str` (optional)
@@ -103,75 +95,60 @@ class Signal(dispatch.Signal):
         if self._add_to_registry:
             registry.add(self)
 
-        self._disabled = False
-        self._connected_receiver_kwargs = {}
+        self._local = threading.local()
 
         super().__init__(*args, **kwargs)
 
-    def connect(self, receiver, **kwargs):
+    @property
+    def disabled_senders(self):
         """
-        Connects a given receiver to the signal.
-
-        This method has to be entirely overridden from Django's default
-        :obj:`dispatch.Signal.connect` method, because in order to temporarily
-        disconnect all a signal from all of it's receivers, only to reconnect
-        them afterwards, we need to maintain a mapping of how a receiver was
-        connected to the signal to begin with (via the sender, weak and
-        dispatch_uid arguments).
-
-        Unfortunately, there is no way to implement this behavior without
-        overriding the entire method.
+        The senders that the :obj:`Signal` is disabled for in the current
+        thread, where a sender of None indicates that the :obj:`Signal` is
+        disabled for all senders.
         """
-        # pylint: disable=import-outside-toplevel
-        from django.conf import settings
-
-        if settings.configured and settings.DEBUG \
-                and (not callable(receiver)
-                or not func_accepts_kwargs(receiver)):
-            # Let Django raise the error.
-            super().connect(receiver, **kwargs)
-            return
-
-        dispatch_uid = kwargs.get('dispatch_uid')
-        if dispatch_uid:
-            lookup_key = (dispatch_uid, _make_id(kwargs.get('sender')))
-        else:
-            lookup_key = (_make_id(receiver), _make_id(kwargs.get('sender')))
-
-        if kwargs.get('weak', True):
-            ref = weakref.ref
-            receiver_object = receiver
-            if hasattr(receiver, '__self__') and hasattr(receiver, '__func__'):
-                ref = weakref.WeakMethod
-                receiver_object = receiver.__self__
-            receiver = ref(receiver)
-            weakref.finalize(receiver_object, self._remove_receiver)
-
+        if not hasattr(self._local, 'disabled_senders'):
+            self._local.disabled_senders = []
+        return self._local.disabled_senders
+
+    def _live_receivers(self, sender):
+        receivers = super()._live_receivers(sender)
+        disabled = self.disabled_senders
+        if not disabled:
+            return receivers
+        elif None in disabled:
+            return []
+        elif not any([s is sender for s in disabled]):
+            return receivers
+        # The signal is disabled for the provided sender, which only applies to
+        # the receivers that were connected with the provided sender.
         with self.lock:
-            self._clear_dead_receivers()
-            if not any(r_key == lookup_key for r_key, _ in self.receivers):
-                self.receivers.append((lookup_key, receiver))
-                # This is the only block that does not exist in Django's
-                # original connect method.
-                self._connected_receiver_kwargs[lookup_key] = kwargs
-            self.sender_receivers_cache.clear()
+            connected_without_sender = [
+                r for (_, r_senderkey), r in self.receivers
+                if r_senderkey == NONE_ID
+            ]
+        enabled = []
+        for receiver in connected_without_sender:
+            if isinstance(receiver, weakref.ReferenceType):
+                receiver = receiver()
+            if receiver is not None and receiver in receivers:
+                enabled.append(receiver)
+        return enabled
 
     @contextlib.contextmanager
     def with_disable(self, sender=None):
-        disconnected = self.disconnect_all_receivers(sender=sender)
+        self.disabled_senders.append(sender)
         try:
             yield self
         finally:
-            self.reconnect_all_receivers(disconnected)
+            self.disabled_senders.pop()
 
     def disable(self, *args, **kwargs):
         """
-        A decorator or context manager that will disconnect this signal inside
-        the decorated function or inside of the context, and then reconnect it
-        after the context exits or the function completes.
+        A decorator or context manager that will disable this signal in the
+        current thread inside the decorated function or inside of the context.
 
         If the sender is provided, the signal will only be disabled for the
-        provided sender.
+        receivers that were connected with the provided sender.
         """
         sender = kwargs.pop('sender', None)
         if len(args) == 1 and hasattr(args[0], '__call__'):
@@ -184,52 +161,6 @@ class Signal(dispatch.Signal):
             return decorated
         return self.with_disable(sender=sender)
 
-    def disconnect_all_receivers(self, sender=None):
-        """
-        Disconnects all receivers from the :obj:`Signal` instance and returns
-        the disconnected receivers.  If the `sender` is provided, only the
-        receivers that were connected with the provided `sender` are
-        disconnected.
-        """
-        disconnected_receivers = []
-        # The list of receivers `self.receivers` is mutated inside of the
-        # disconnect method, so we must operate on a copied version otherwise
-        # the indicies in the disconnect method will not align with the
-        # appropriate signal to disconnect.
-        receivers = self.receivers[:]
-        for lookup_key, receiver in receivers:
-            kwargs = self._connected_receiver_kwargs[lookup_key]
-
-            if isinstance(receiver, weakref.ref):
-                receiver = receiver()
-
-            # If the receiver was not connected with the provided sender, do
-            # not disconnect it.
-            if sender is not None and kwargs['sender'] is not sender:
-                continue
-
-            disconnected = self.disconnect(
-                receiver=receiver,
-                sender=kwargs.get('sender'),
-                dispatch_uid=kwargs.get('dispatch_uid')
-            )
-            if disconnected:
-                del self._connected_receiver_kwargs[lookup_key]
-                # We need to not only keep track of the receiver function itself
-                # that was disconnected, but also the configuration arguments
-                # that the receiver was originally connected with.
-                disconnected_receivers.append((lookup_key, receiver, kwargs))
-        return disconnected_receivers
-
-    def reconnect_all_receivers(self, receivers):
-        """
-        Reconnects the previously disconnected receivers to the :obj:`Signal`
-        instance, using the same configuration parameters that the receiver
-        was originally connected with.
-        """
-        for _, receiver, kwargs in receivers:
-            self.connect(receiver=receiver, **kwargs)
-
 
 class disable(contextlib.ContextDecorator):
     """
@@ -250,14 +181,10 @@ class disable(contextlib.ContextDecorator):
     """
 
     def __init__(self, **kwargs):
-        # Signals that should be disconnected in context, either identified by
+        # Signals that should be disabled in context, either identified by
         # their name in the registry or the :obj:`Signal` instance.  If not
-        # provided, all signals in the registry will be disconnected in
-        # context.
+        # provided, all signals in the registry will be disabled in context.
         self._signals = kwargs.pop('signals', None)
-        # An array of (signal, [receivers]) for the receivers that are currently
-        # disconnected for each signal.
-        self._disconnected_receivers = []
         super().__init__()
 
     @property
@@ -272,15 +199,15 @@ class disable(contextlib.ContextDecorator):
                 signal_instances.append(sig)
         return signal_instances
 
+    # The state of the disabled signals is stored on each thread, not on the
+    # instance, since the same instance is used for every call of a function
+    # that is decorated with it.
     def __enter__(self):
         for signal in self.signals:
-            disconnected = signal.disconnect_all_receivers()
-            if disconnected:
-                self._disconnected_receivers.append((signal, disconnected))
+            signal.disabled_senders.append(None)
         return self
 
     def __exit__(self, *exc):
-        for signal, receivers in self._disconnected_receivers:
-            signal.reconnect_all_receivers(receivers)
-        self._disconnected_receivers = []
+        for signal in self.signals:
+            signal.disabled_senders.pop()
         return False
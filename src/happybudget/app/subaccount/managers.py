@@ -54,13 +54,16 @@ class SubAccountManager(
         grouped = collections.defaultdict(list)
         # We cannot cast the iterable as a set because the models may or may
         # not have been saved yet, and if they haven't been saved they do not
-        # have a PK - which means they are not hashable, so we have to assume
-        # the instances provided to this method are unique in that case.
+        # have a PK - which means they are not hashable.  Instead, we keep track
+        # of the PKs of the saved instances that were already grouped, and
+        # assume that the unsaved instances provided to this method are unique.
+        grouped_pks = set()
         for instance in ensure_iterable(instances, cast=list):
-            if (hasattr(instance, 'pk')
-                    and instance not in grouped[instance.nested_level]) \
-                    or not hasattr(instance, 'pk'):
-                grouped[instance.nested_level].append(instance)
+            if instance.pk is not None:
+                if instance.pk in grouped_pks:
+                    continue
+                grouped_pks.add(instance.pk)
+            grouped[instance.nested_level].append(instance)
         return sorted(
             list(grouped.items()), key=lambda tup: tup[0], reverse=reverse)
 
@@ -64,6 +64,7 @@ class SubAccountNestedMixin(views.NestedObjectViewMixin):
 
 
 class SubAccountPublicNestedMixin(SubAccountNestedMixin):
+    public_cache = ['list']
     subaccount_permission_classes = [
         BudgetObjPermission(
             get_budget=lambda obj: obj.budget,
@@ -135,12 +135,17 @@ class SubAccount(BudgetingTreePolymorphicOrderedRowModel):
             level = level + 1
         return level - 1
 
+    @staticmethod
+    def calculate_raw_value(quantity, rate, multiplier):
+        multiplier = multiplier or 1.0
+        if rate is not None and quantity is not None:
+            return float(quantity) * float(rate) * float(multiplier)
+        return 0.0
+
     @property
     def raw_value(self):
-        multiplier = self.multiplier or 1.0
-        if self.rate is not None and self.quantity is not None:
-            return float(self.quantity) * float(self.rate) * float(multiplier)
-        return 0.0
+        return self.calculate_raw_value(
+            self.quantity, self.rate, self.multiplier)
 
     @property
     def nominal_value(self):
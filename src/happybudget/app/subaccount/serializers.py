@@ -10,7 +10,8 @@ from happybudget.app.io.models import Attachment
 from happybudget.app.io.serializers import SimpleAttachmentSerializer
 from happybudget.app.markup.serializers import MarkupSerializer
 from happybudget.app.serializers import ModelSerializer
-from happybudget.app.tabling.serializers import row_order_serializer
+from happybudget.app.tabling.serializers import (
+    row_order_serializer, ValuesSerializer)
 from happybudget.app.tagging.fields import TagField
 from happybudget.app.tagging.serializers import TagSerializer, ColorSerializer
 from happybudget.app.user.fields import OwnershipPrimaryKeyRelatedField
@@ -178,6 +179,41 @@ class TemplateSubAccountDetailSerializer(TemplateSubAccountSerializer):
             'ancestors', 'table')
 
 
+class SubAccountAsOwnerValuesSerializer(ValuesSerializer):
+    serializer_class = SubAccountAsOwnerSerializer
+
+
+class SubAccountValuesSerializer(ValuesSerializer):
+    columns = (
+        'quantity', 'rate', 'multiplier', 'accumulated_value',
+        'content_type_id'
+    )
+
+    def get_nominal_value_attribute(self, row):
+        # Consistent with `SubAccount.nominal_value`, the nominal value of a
+        # SubAccount without children is its raw value.
+        if self.get_related_ids('children')[row['pk']]:
+            return row['accumulated_value']
+        return self.model.calculate_raw_value(
+            row['quantity'], row['rate'], row['multiplier'])
+
+    def get_parent_type_attribute(self, row):
+        return ContentType.objects.get_for_id(row['content_type_id']) \
+            .model_class().type
+
+
+class BudgetSubAccountValuesSerializer(SubAccountValuesSerializer):
+    serializer_class = BudgetSubAccountSerializer
+
+    def represent_attachments(self, row):
+        return self.serialize_related(
+            row, 'attachments', SimpleAttachmentSerializer)
+
+
+class TemplateSubAccountValuesSerializer(SubAccountValuesSerializer):
+    serializer_class = TemplateSubAccountSerializer
+
+
 class SubAccountPdfSerializer(SubAccountSimpleSerializer):
     type = serializers.CharField(read_only=True, source='pdf_type')
     quantity = serializers.FloatField(read_only=True)
@@ -1,13 +1,89 @@
+import collections
 import logging
 from celery import current_app
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+
 from happybudget.lib.utils import humanize_list
-from .models import SubAccount
+from happybudget.app.account.models import (
+    Account, BudgetAccount, TemplateAccount)
+from happybudget.app.fringe.models import Fringe
+
+from .models import SubAccount, BudgetSubAccount, TemplateSubAccount
 
 
 logger = logging.getLogger('greenbudget')
 
 
+CorruptedFringeRelationship = collections.namedtuple(
+    'CorruptedFringeRelationship',
+    ['subaccount', 'budget', 'fringe', 'fringe_budget']
+)
+
+
+def get_corrupted_fringe_relationships():
+    """
+    Returns the relationships between a :obj:`Fringe` and a :obj:`SubAccount`
+    where the :obj:`Budget` that the :obj:`Fringe` belongs to is not the
+    :obj:`Budget` that the :obj:`SubAccount` belongs to.
+
+    Since a :obj:`SubAccount` is only tied to its :obj:`Budget` through a chain
+    of generic parents, the :obj:`Budget` of every :obj:`SubAccount` is
+    resolved with a recursive common table expression, starting with the
+    :obj:`SubAccount`(s) whose parent is an :obj:`Account` and descending
+    through the nested :obj:`SubAccount`(s).  The through table of the M2M
+    relationship is then joined against both the resolved :obj:`Budget` of the
+    :obj:`SubAccount` and the :obj:`Budget` of the :obj:`Fringe`, such that the
+    entire check is performed in a single query regardless of the number of
+    :obj:`SubAccount`(s) or :obj:`Fringe`(s) in the database.
+    """
+    qn = connection.ops.quote_name
+    through = SubAccount.fringes.through
+
+    account_ct_ids = [ct.pk for ct in ContentType.objects.get_for_models(
+        Account, BudgetAccount, TemplateAccount).values()]
+    subaccount_ct_ids = [ct.pk for ct in ContentType.objects.get_for_models(
+        SubAccount, BudgetSubAccount, TemplateSubAccount).values()]
+
+    sql = (
+        "WITH RECURSIVE subaccount_budget (subaccount_id, budget_id) AS ("
+        "SELECT s.{s_pk}, a.{a_parent} FROM {s_table} s "
+        "INNER JOIN {a_table} a ON a.{a_pk} = s.{s_object_id} "
+        "WHERE s.{s_ct} IN ({account_cts}) "
+        "UNION ALL "
+        "SELECT s.{s_pk}, sb.budget_id FROM {s_table} s "
+        "INNER JOIN subaccount_budget sb ON sb.subaccount_id = s.{s_object_id} "
+        "WHERE s.{s_ct} IN ({subaccount_cts})"
+        ") "
+        "SELECT t.{t_subaccount}, sb.budget_id, t.{t_fringe}, f.{f_budget} "
+        "FROM {t_table} t "
+        "INNER JOIN {f_table} f ON f.{f_pk} = t.{t_fringe} "
+        "INNER JOIN subaccount_budget sb ON sb.subaccount_id = t.{t_subaccount} "
+        "WHERE f.{f_budget} <> sb.budget_id "
+        "ORDER BY t.{t_subaccount}, t.{t_fringe}"
+    ).format(
+        s_table=qn(SubAccount._meta.db_table),
+        s_pk=qn(SubAccount._meta.pk.column),
+        s_object_id=qn(SubAccount._meta.get_field('object_id').column),
+        s_ct=qn(SubAccount._meta.get_field('content_type').column),
+        a_table=qn(Account._meta.db_table),
+        a_pk=qn(Account._meta.pk.column),
+        a_parent=qn(Account._meta.get_field('parent').column),
+        f_table=qn(Fringe._meta.db_table),
+        f_pk=qn(Fringe._meta.pk.column),
+        f_budget=qn(Fringe._meta.get_field('budget').column),
+        t_table=qn(through._meta.db_table),
+        t_subaccount=qn(through._meta.get_field('subaccount').column),
+        t_fringe=qn(through._meta.get_field('fringe').column),
+        account_cts=", ".join(["%s"] * len(account_ct_ids)),
+        subaccount_cts=", ".join(["%s"] * len(subaccount_ct_ids)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, account_ct_ids + subaccount_ct_ids)
+        return [CorruptedFringeRelationship(*row) for row in cursor.fetchall()]
+
+
 @current_app.task
 def fix_corrupted_fringe_relationships():
     """
@@ -20,35 +96,47 @@ def fix_corrupted_fringe_relationships():
     :obj:`Budget` that the :obj:`Fringe` belongs to and the :obj:`Budget`
     that the :obj:`SubAccount` belongs to must be consistent.  If they are
     not, this task will remove the association.
+
+    Note:
+    ----
+    The corrupted relationships are found with a single set-based query (see
+    :obj:`get_corrupted_fringe_relationships`), and only the
+    :obj:`SubAccount`(s) with corrupted relationships are loaded into memory
+    such that the removal of the :obj:`Fringe`(s) still triggers the relevant
+    signals.  The task returns the number of relationships that were scanned
+    and the number of relationships that were fixed.
     """
-    subaccounts = SubAccount.objects.exclude(fringes=None)
-    disassociation_occurred = False
+    scanned = SubAccount.fringes.through.objects.count()
+    corrupted = get_corrupted_fringe_relationships()
+    if not corrupted:
+        logger.info(
+            "Found no corrupted Fringe - SubAccount relationships, scanned "
+            f"{scanned} relationship(s)."
+        )
+        return {'scanned': scanned, 'fixed': 0}
+
+    fringes_to_remove = collections.defaultdict(list)
+    for relationship in corrupted:
+        logger.error(
+            f"Found Fringe {relationship.fringe} that belongs to Budget "
+            f"{relationship.fringe_budget} but also belongs to SubAccount "
+            f"{relationship.subaccount} that belongs to Budget "
+            f"{relationship.budget}. This relationship is corrupted, and the "
+            "Fringe must be disassociated from the SubAccount.", extra={
+                'subaccount': relationship.subaccount,
+                'budget': relationship.budget,
+                'fringe': relationship.fringe,
+                'fringe_budget': relationship.fringe_budget
+            }
+        )
+        fringes_to_remove[relationship.subaccount].append(relationship.fringe)
+
+    subaccounts = SubAccount.objects.filter(pk__in=fringes_to_remove.keys())
     for subaccount in subaccounts:
-        fringes_to_remove = ()
-        for fringe in subaccount.fringes.all():
-            if subaccount.budget != fringe.budget:
-                logger.error(
-                    f"Found Fringe {fringe.pk} that belongs to Budget "
-                    f"{fringe.budget.pk} - {fringe.budget.name} but also "
-                    f"belongs to SubAccount {subaccount.pk} that belongs to "
-                    f"Budget {fringe.budget.pk} - {fringe.budget.name}. This "
-                    "relationship is corrupted, and the Fringe must be "
-                    "disassociated from the SubAccount.", extra={
-                        'subaccount': subaccount.pk,
-                        'budget': subaccount.budget.pk,
-                        'fringe': fringe.pk,
-                        'fringe_budget': fringe.budget.pk
-                    }
-                )
-                fringes_to_remove = fringes_to_remove + (fringe, )
-        if fringes_to_remove:
-            humanized = humanize_list(
-                [fringe.pk for fringe in fringes_to_remove])
-            logger.warning(
-                f"Disassociating Fringes {humanized} from SubAccount "
-                f"{subaccount.pk}."
-            )
-            disassociation_occurred = True
-            subaccount.fringes.remove(*fringes_to_remove)
-    if not disassociation_occurred:
-        logger.info("Found no corrupted Fringe - SubAccount relationships.")
+        humanized = humanize_list(fringes_to_remove[subaccount.pk])
+        logger.warning(
+            f"Disassociating Fringes {humanized} from SubAccount "
+            f"{subaccount.pk}."
+        )
+        subaccount.fringes.remove(*fringes_to_remove[subaccount.pk])
+    return {'scanned': scanned, 'fixed': len(corrupted)}
@@ -29,7 +29,9 @@ from .serializers import (
     BudgetSubAccountDetailSerializer,
     TemplateSubAccountDetailSerializer,
     SubAccountUnitSerializer,
-    SubAccountSimpleSerializer
+    SubAccountSimpleSerializer,
+    BudgetSubAccountValuesSerializer,
+    TemplateSubAccountValuesSerializer
 )
 
 
@@ -163,6 +165,9 @@ class GenericSubAccountViewSet(views.GenericViewSet):
         ]),
     )
 
+    def get_last_modified(self):
+        return self.instance.budget.updated_at
+
 
 @register_bulk_operations(
     base_cls=lambda context: context.view.instance_cls,
@@ -216,6 +221,8 @@ class SubAccountViewSet(
     (5) PATCH /subaccounts/<pk>/bulk-create-children/
     """
     queryset_cls = SubAccount
+    conditional = ['retrieve']
+    public_cache = ['retrieve']
     permission_classes = [
         BudgetObjPermission(
             get_budget=lambda obj: obj.budget,
@@ -269,6 +276,12 @@ class SubAccountRecursiveViewSet(
     (1) GET /subaccounts/<pk>/children
     (2) POST /subaccounts/<pk>/children
     """
+    read_from_replica = True
+    conditional = ['list']
+    values_serializer_classes = [
+        BudgetSubAccountValuesSerializer,
+        TemplateSubAccountValuesSerializer
+    ]
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
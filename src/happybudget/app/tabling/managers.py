@@ -194,60 +194,53 @@ class OrderedRowManagerMixin(OrderedRowQuerier, RowQuerier):
         """
         return_created_objects = kwargs.get('return_created_objects', True)
 
-        # The unique set of table keys that identify which table subset each
-        # instance being created belongs to.
-        tks = set([obj.table_key for obj in instances])
-
-        # Since we are going to create the instances for each table subset in
-        # batches, we need to add an attirbute to denote the original order the
-        # instances were provided in, such that they can be returned in the
-        # same order.
+        # Group the instances by the table subset they belong to, which is
+        # identified by the table key of each instance.  Since we are going to
+        # create the instances for each table subset in batches, we need to add
+        # an attribute to denote the original order the instances were provided
+        # in, such that they can be returned in the same order.
+        #
+        # The table key is determined once per instance, as determining the
+        # table key of an instance is not trivial and the number of instances
+        # being created can be very large.
+        #
+        # The table subsets are created in the order of the earliest provided
+        # instance in each subset.  This helps keep the order of creation, and
+        # thus PKs, of the created objects relatively consistent in some cases:
+        #
+        # >>> instances = [
+        # >>>     Object (Table = A),
+        # >>>     Object (Table = B),
+        # >>>     Object (Table = B)
+        # >>> ]
+        # >>> created = bulk_create(instances)
+        # >>> [obj.pk for obj in created]
+        # >>> [1, 2, 3]
+        #
+        # However, it begins to fall apart if the order of the table subsets
+        # for each instance in the provided instances begins to fall out of
+        # order:
+        #
+        # >>> instances = [
+        # >>>     Object (Table = A),
+        # >>>     Object (Table = B),
+        # >>>     Object (Table = A),
+        # >>>     Object (Table = B)
+        # >>> ]
+        # >>> created = bulk_create(instances)
+        # >>> [obj.pk for obj in created]
+        # >>> [1, 3, 2, 4]
+        tables = {}
         for i, obj in enumerate(instances):
             setattr(obj, '__provided_order__', i)
-
-        def table_key_sorter(tk):
-            """
-            Sort the table keys by the earliest provided instance in the
-            table subset identified by that key.  This helps keep the order
-            of creation, and thus PKs, of the created objects relatively
-            consistent in some cases:
-
-            >>> instances = [
-            >>>     Object (Table = A),
-            >>>     Object (Table = B),
-            >>>     Object (Table = B)
-            >>> ]
-            >>> created = bulk_create(instances)
-            >>> [obj.pk for obj in created]
-            >>> [1, 2, 3]
-
-            However, it begins to fall apart if the order of the table subsets
-            for each instance in the provided instances begins to fall out of
-            order:
-
-            >>> instances = [
-            >>>     Object (Table = A),
-            >>>     Object (Table = B),
-            >>>     Object (Table = A),
-            >>>     Object (Table = B)
-            >>> ]
-            >>> created = bulk_create(instances)
-            >>> [obj.pk for obj in created]
-            >>> [1, 3, 2, 4]
-            """
-            objs = [obj for obj in instances if obj.table_key == tk]
-            assert len(objs) != 0, \
-                "Unexpectedly encountered table-key outside the scope of the " \
-                "provided instances."
-            return min([getattr(obj, '__provided_order__') for obj in objs])
+            tables.setdefault(obj.table_key, []).append(obj)
 
         # Wrap in an atomic transaction block because if adding rows to any of
         # the individual tables fails, we don't want to add rows to any of the
         # tables.
         created = []
         with transaction.atomic():
-            for tk in sorted(tks, key=table_key_sorter):
-                new_rows = [i for i in instances if i.table_key == tk]
+            for new_rows in tables.values():
                 table_created = self._bulk_create_table_key(new_rows, **kwargs)
                 if return_created_objects:
                     # Associated the new created instances with the order the
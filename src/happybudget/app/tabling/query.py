@@ -1,4 +1,3 @@
-import collections
 from django.db import models, transaction
 
 from happybudget.lib.utils import ensure_iterable, concat
@@ -7,9 +6,6 @@ from happybudget.app import query
 from .utils import order_after
 
 
-ModelsAndGroup = collections.namedtuple("ModelsAndGroup", ["models", "group"])
-
-
 class RowQuerier:
     def get_all_in_tables(self, table_keys):
         """
@@ -180,60 +176,51 @@ class OrderedRowQuerier(RowQuerier):
         - Account (order = 6)
         - Account (order = 8)
         """
+        # Only the columns that are required to determine the ordering are
+        # selected, since instantiating the models of a large table (which are
+        # often polymorphic) is expensive.
+        table_pivot = ensure_iterable(self.model.table_pivot)
+        # While the FE considers every row object to be groupable, every row
+        # object in the backend isn't necessarily groupable.
+        groupable = 'group_id' in [
+            f.attname for f in self.model._meta.concrete_fields]
+        rows = list(self.prefetch_related(None).values(
+            'pk', 'order', *table_pivot, *(['group_id'] if groupable else [])))
+
         # We cannot perform the order_by if there are no results in the current
         # queryset because the models.Case() will try to order the queryset by
         # a NULL value, which will hit an SQL error even though there are no
         # results to order.
-        if self.count() == 0:
+        if len(rows) == 0:
             return self
 
-        # Make sure that all instances belong to the same table.  Unfortunately,
-        # a dict is not hashable, so we cannot just check the size of a set.
-        table_filter = None
-
-        # pylint: disable=not-an-iterable
-        for obj in self:
-            if table_filter is not None and obj.table_filter != table_filter:
-                raise Exception(
-                    "Ordering a queryset with groups accounted for requires "
-                    "that all instances belong to the same table."
-                )
-            else:
-                table_filter = obj.table_filter
-
-        models_without_groups = []
-        models_with_group = {}
-
-        # pylint: disable=not-an-iterable
-        for obj in self:
-            # While the FE considers every row object to be groupable, every
-            # row object in the backend isn't necessarily groupable.
-            if hasattr(obj, 'group_id') and obj.group_id is not None:
-                models_with_group.setdefault(obj.group_id, ModelsAndGroup(
-                    models=[],
-                    group=obj.group
-                ))
-                models_with_group[obj.group_id].models.append(obj)
+        # Make sure that all instances belong to the same table.
+        if len(set([tuple([row[k] for k in table_pivot]) for row in rows])) > 1:
+            raise Exception(
+                "Ordering a queryset with groups accounted for requires "
+                "that all instances belong to the same table."
+            )
+
+        rows_without_groups = []
+        rows_with_group = {}
+        for row in rows:
+            if groupable and row['group_id'] is not None:
+                rows_with_group.setdefault(row['group_id'], []).append(row)
             else:
-                models_without_groups.append(obj)
+                rows_without_groups.append(row)
 
-        # Sort the ModelsAndGroup instances by the lowest order of it's
-        # children rows, and sort the models within each ModelsAndGroup instance
-        # by it's order.
+        # Sort the rows of each group by their order, and sort the groups by
+        # the lowest order of the rows that they contain.
         flattened = sorted([
-            ModelsAndGroup(
-                models=sorted(mg.models, key=lambda obj: obj.order),
-                group=mg.group
-            )
-            for mg in list(models_with_group.values())
-        ], key=lambda mg: min([m.order for m in mg.models]))
+            sorted(group_rows, key=lambda row: row['order'])
+            for group_rows in rows_with_group.values()
+        ], key=lambda group_rows: group_rows[0]['order'])
 
-        ordered = concat([mg.models for mg in flattened]) \
-            + models_without_groups
+        ordered = concat(flattened) + rows_without_groups
 
         # We need to return a QuerySet instance, not a list.
         preserved = models.Case(*[models.When(
-            pk=obj.pk, then=pos) for pos, obj in enumerate(ordered)])
+            pk=row['pk'], then=pos) for pos, row in enumerate(ordered)])
         return self.order_by(preserved)
 
 
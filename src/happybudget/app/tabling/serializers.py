@@ -1,6 +1,14 @@
+import collections
 from copy import deepcopy
 
-from django.db import transaction
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models, transaction
+from django.utils.functional import cached_property
+
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject
 
 from happybudget.lib.drf.serializers import LazyContext
 from happybudget.app import exceptions
@@ -160,3 +168,184 @@ class row_order_serializer:
         # This is because there is some meta programming around DRF's serializer.
         klass._declared_fields['previous'] = previous_field
         return klass
+
+
+class ValuesSerializer:
+    """
+    Serializes the rows of a table from the values of a queryset, selected
+    with `QuerySet.values()`, rather than from the model instances of the
+    queryset - while producing the same representation as the serializer
+    defined as the `serializer_class`.
+
+    Instantiating the model instances of a large table (particularly when the
+    model is polymorphic) and the queries that the fields of the serializer
+    perform for each instance dominate the time it takes to serialize the
+    table.  Here, only the columns that the serializer requires are selected,
+    the primary keys of related models are selected with a single query per
+    field for all of the rows and related tags are serialized once per
+    distinct tag.
+
+    Each readable field of the `serializer_class` is represented from the
+    values of the row by:
+
+    (1) The `represent_<field_name>` method, if defined, which returns the
+        representation of the field.
+    (2) The `get_<field_name>_attribute` method, if defined, which returns the
+        attribute the field is represented from.
+    (3) The value of the column, when the field is sourced from a concrete
+        field of the model.
+    (4) The primary keys of the related models, when the field is sourced from
+        a many to many field or a generic relation of the model.
+    (5) The attribute of the model class, when the field is sourced from an
+        attribute that is static for the model class (e.g. `type`).
+
+    If a field of the `serializer_class` cannot be represented in any of these
+    ways, an :obj:`ImproperlyConfigured` exception is raised - such that
+    fields added to the serializer are never silently omitted.
+    """
+    serializer_class = None
+    # Additional columns required by the `get_<field_name>_attribute` and
+    # `represent_<field_name>` methods.
+    columns = ()
+
+    def __init__(self, queryset, context=None):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.serializer = self.serializer_class(context=context or {})
+        self._columns = set(['pk'] + list(self.columns))
+        self._related_ids = {}
+        self._related_instances = {}
+        self._related_representations = {}
+
+    @cached_property
+    def data(self):
+        representations = [
+            (field.field_name, self.get_representation_method(field))
+            # pylint: disable=protected-access
+            for field in self.serializer._readable_fields
+        ]
+        return [
+            {name: represent(row) for name, represent in representations}
+            for row in self.queryset.prefetch_related(None)
+            .values(*self._columns)
+        ]
+
+    def get_model_field(self, field):
+        try:
+            return self.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+    def get_representation_method(self, field):
+        if hasattr(self, f'represent_{field.field_name}'):
+            return getattr(self, f'represent_{field.field_name}')
+        elif hasattr(self, f'get_{field.field_name}_attribute'):
+            get_attribute = getattr(self, f'get_{field.field_name}_attribute')
+            return lambda row: self.to_representation(field, get_attribute(row))
+
+        model_field = self.get_model_field(field)
+        if model_field is None:
+            attribute = getattr(self.model, field.source, None)
+            if isinstance(attribute, str):
+                representation = field.to_representation(attribute)
+                return lambda row: representation
+        elif (model_field.many_to_many
+                or isinstance(model_field, GenericRelation)) \
+                and isinstance(field, serializers.ManyRelatedField):
+            return lambda row: [
+                field.child_relation.to_representation(PKOnlyObject(pk=pk))
+                for pk in self.get_related_ids(field.source)[row['pk']]
+            ]
+        elif model_field.concrete and model_field.is_relation \
+                and isinstance(field, serializers.RelatedField):
+            self._columns.add(model_field.attname)
+            return lambda row: self.to_related_representation(
+                field, row[model_field.attname])
+        elif model_field.concrete and not model_field.is_relation:
+            self._columns.add(model_field.attname)
+            # The value of a file field is never None, but a file object that
+            # is empty when there is no file.
+            if isinstance(model_field, models.FileField):
+                return lambda row: field.to_representation(
+                    model_field.attr_class(
+                        None, model_field, row[model_field.attname]))
+            return lambda row: self.to_representation(
+                field, row[model_field.attname])
+        raise ImproperlyConfigured(
+            f"The field {field.field_name} of {self.serializer_class} cannot "
+            f"be represented by {self.__class__}."
+        )
+
+    def to_representation(self, field, attribute):
+        # Consistent with `rest_framework.serializers.Serializer`, None values
+        # are not represented by the field.
+        if attribute is None:
+            return None
+        return field.to_representation(attribute)
+
+    def to_related_representation(self, field, pk):
+        """
+        Returns the representation of the related model with the provided
+        primary key, which is only determined once per distinct related model
+        because related fields (such as tag fields) may query for the related
+        model in order to represent it.
+        """
+        if pk is None:
+            return None
+        key = (field.field_name, pk)
+        if key not in self._related_representations:
+            self._related_representations[key] = field.to_representation(
+                PKOnlyObject(pk=pk))
+        return self._related_representations[key]
+
+    def get_related_ids(self, source):
+        """
+        Returns the primary keys of the models related to each row via the
+        many to many field or generic relation of the model, indexed by the
+        primary key of the row.  The related models are selected with the
+        default manager and ordering of the related model, consistently with
+        `getattr(instance, source).all()`.
+        """
+        if source not in self._related_ids:
+            model_field = self.model._meta.get_field(source)
+            related_model = model_field.related_model
+            qs = related_model._default_manager.all()
+            if isinstance(model_field, GenericRelation):
+                lookup = model_field.object_id_field_name
+                qs = qs.filter(**{
+                    model_field.content_type_field_name:
+                        ContentType.objects.get_for_model(
+                            self.model,
+                            for_concrete_model=model_field.for_concrete_model
+                        )
+                })
+            else:
+                lookup = model_field.related_query_name()
+            related_ids = collections.defaultdict(list)
+            for pk, related_pk in qs.filter(**{
+                f'{lookup}__in': self.queryset.values('pk')
+            }).values_list(lookup, 'pk'):
+                related_ids[pk].append(related_pk)
+            self._related_ids[source] = related_ids
+        return self._related_ids[source]
+
+    def serialize_related(self, row, source, serializer_class):
+        """
+        Serializes the models related to the row via the many to many field
+        or generic relation of the model with the provided serializer class,
+        where the related models of all rows are selected with a single query.
+        """
+        if source not in self._related_instances:
+            model_field = self.model._meta.get_field(source)
+            self._related_instances[source] = model_field.related_model \
+                ._default_manager.in_bulk(set([
+                    pk for pks in self.get_related_ids(source).values()
+                    for pk in pks
+                ]))
+        instances = self._related_instances[source]
+        return serializer_class(
+            instance=[
+                instances[pk] for pk in self.get_related_ids(source)[row['pk']]
+            ],
+            many=True
+        ).data
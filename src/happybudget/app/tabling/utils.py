@@ -214,7 +214,10 @@ def validate_order(value):
     if not isinstance(value, str):
         raise Exception("Order must be a string, not %s." % type(value))
     value = value.lower()
-    if not all([x in string.ascii_lowercase for x in value]):
+    # Stripping the alphabet characters from the value is performed in C, and
+    # is considerably faster than iterating over the characters in Python for
+    # the long order values that large tables will have.
+    if value.strip(string.ascii_lowercase):
         raise Exception("String must only contain alphabet characters!")
     return value
 
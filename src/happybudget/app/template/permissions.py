@@ -1,4 +1,5 @@
 from happybudget.app import permissions
+from happybudget.app.budget.permissions import IsBudgetOwner
 from happybudget.app.budgeting.permissions import IsDomain
 
 
@@ -29,7 +30,7 @@ class TemplateObjPermission(permissions.AND):
         super().__init__(
             permissions.IsFullyAuthenticated(affects_after=True),
             permissions.OR(
-                permissions.IsOwner(
+                IsBudgetOwner(
                     get_permissioned_obj=get_budget,
                     object_name=object_name,
                 ),
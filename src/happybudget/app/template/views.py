@@ -20,6 +20,7 @@ class TemplateCommunityViewSet(
     serializer_class = TemplateSerializer
     ordering_fields = ['updated_at', 'name', 'created_at']
     search_fields = ['name']
+    read_from_replica = True
 
     def get_serializer_class(self):
         if self.action == 'list':
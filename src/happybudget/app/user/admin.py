@@ -53,8 +53,10 @@ class UserAdmin(harry.HarryModelAdmin):
 
     def send_email_verification(self, request, instance_id):
         user = User.objects.get(pk=instance_id)
+        # The email is delivered immediately, rather than by a Celery task, such
+        # that failures can be reported to the admin user.
         try:
-            user.send_email_verification_email()
+            user.send_email_verification_email(asynchronous=False)
         except EmailError:
             self.message_user(
                 request=request,
@@ -70,8 +72,10 @@ class UserAdmin(harry.HarryModelAdmin):
 
     def send_forgot_password(self, request, instance_id):
         user = User.objects.get(pk=instance_id)
+        # The email is delivered immediately, rather than by a Celery task, such
+        # that failures can be reported to the admin user.
         try:
-            user.send_password_recovery_email()
+            user.send_password_recovery_email(asynchronous=False)
         except EmailError:
             self.message_user(
                 request=request,
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def user_metrics_cache_enabled():
+    return settings.CACHE_ENABLED and bool(settings.USER_METRICS_CACHE_EXPIRY)
+
+
+def user_metrics_cache_key(user):
+    return f"user-metrics-{getattr(user, 'pk', user)}"
+
+
+def get_user_metrics(user, calculate):
+    """
+    Returns the metrics of the provided :obj:`User` from the cache, calculating
+    them with the provided callable and storing them in the cache if they are
+    not already cached.
+
+    The metrics are included in the response of every request that
+    authenticates or validates the :obj:`User`, so caching them for a short
+    period of time prevents the same counts from being recalculated on every
+    one of those requests.  The cache is invalidated by the signals in
+    :obj:`happybudget.app.user.signals` whenever a :obj:`Budget`,
+    :obj:`Template` or :obj:`Collaborator` is saved or deleted.
+    """
+    if not user_metrics_cache_enabled():
+        return calculate()
+    key = user_metrics_cache_key(user)
+    metrics = cache.get(key)
+    if metrics is None:
+        metrics = calculate()
+        cache.set(key, metrics, settings.USER_METRICS_CACHE_EXPIRY)
+    return metrics
+
+
+def invalidate_user_metrics(*users):
+    if user_metrics_cache_enabled():
+        cache.delete_many([
+            user_metrics_cache_key(user) for user in users
+            if user is not None
+        ])
@@ -1,6 +1,10 @@
+import hashlib
+import json
 import logging
 
 from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
 
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
@@ -56,6 +60,34 @@ def user_is_on_waitlist(email):
         return email.lower() in contacts
 
 
+class SendInBlueBackend:
+    """
+    Delivers transactional email through SendInBlue's API.
+    """
+
+    def send(self, message):
+        try:
+            email_api.send_transac_email(message)
+        except ApiException as e:
+            logger.error("There was an error sending email: \n%s" % str(e))
+            raise EmailError() from e
+
+
+class LocMemBackend:
+    """
+    Stores transactional email in memory instead of delivering it, such that
+    the email that would have been sent can be inspected in tests.
+    """
+    outbox = []
+
+    def send(self, message):
+        self.outbox.append(message)
+
+
+def get_mail_backend():
+    return import_string(settings.EMAIL_TRANSPORT_BACKEND)()
+
+
 def get_template(slug):
     try:
         return [
@@ -88,12 +120,56 @@ class Mail(sib_api_v3_sdk.SendSmtpEmail):
     def template_slug(self):
         raise NotImplementedError()
 
-    def send(self):
-        try:
-            email_api.send_transac_email(self)
-        except ApiException as e:
-            logger.error("There was an error sending email: \n%s" % str(e))
-            raise EmailError() from e
+    @property
+    def idempotency_key(self):
+        """
+        A key that uniquely identifies the content and recipients of the
+        :obj:`Mail`, such that the same :obj:`Mail` is not delivered more than
+        once if the task that delivers it is retried or redelivered by the
+        broker.
+        """
+        content = json.dumps(self.to_message_data(), sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def to_message_data(self):
+        return {
+            'to': self.to,
+            'template_id': self.template_id,
+            'params': self.params
+        }
+
+    def send(self, asynchronous=None):
+        """
+        Sends the :obj:`Mail`.  If `EMAIL_ASYNC` is enabled, the :obj:`Mail`
+        is delivered by a Celery task outside of the request-response cycle
+        once the current transaction is committed, otherwise it is delivered
+        immediately.
+
+        Parameters:
+        ----------
+        asynchronous: :obj:`bool` (optional)
+            Whether or not the :obj:`Mail` should be delivered by a Celery
+            task.  Callers that need to know whether or not the delivery
+            succeeded can provide `False` to deliver the :obj:`Mail`
+            immediately, in which case an :obj:`EmailError` is raised if the
+            delivery fails.
+
+            Default: settings.EMAIL_ASYNC
+        """
+        if asynchronous is None:
+            asynchronous = settings.EMAIL_ASYNC
+        if asynchronous:
+            # pylint: disable=import-outside-toplevel
+            from .tasks import send_mail
+            message_data = self.to_message_data()
+            idempotency_key = self.idempotency_key
+            # The task must not be delivered before the changes it relies on,
+            # like a newly created user, are committed - nor at all if they
+            # are rolled back.
+            transaction.on_commit(lambda: send_mail.delay(
+                message_data, idempotency_key=idempotency_key))
+        else:
+            get_mail_backend().send(self)
 
 
 class EmailVerificationMail(Mail):
@@ -7,8 +7,8 @@ from timezone_field import TimeZoneField
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from happybudget.conf import suppress_with_setting
@@ -25,6 +25,7 @@ from happybudget.app.billing import StripeCustomer
 from happybudget.app.billing.constants import BillingStatus
 from happybudget.app.io.utils import parse_image_filename, parse_filename
 
+from .cache import get_user_metrics
 from .mail import EmailVerificationMail, PasswordRecoveryMail
 from .mixins import UserAuthenticationMixin
 from .managers import UserManager
@@ -149,35 +150,59 @@ class User(UserAuthenticationMixin, AbstractUser):
         return self.is_verified
 
     @property
-    def num_budgets(self):
+    def metrics(self):
+        """
+        Returns the counts of the :obj:`Budget`(s) and :obj:`Template`(s) the
+        :obj:`User` owns or collaborates on, cached for a short period of time
+        if the cache is enabled.
+        """
+        return get_user_metrics(self, self.calculate_metrics)
+
+    def calculate_metrics(self):
+        """
+        Calculates the counts of the :obj:`Budget`(s) and :obj:`Template`(s)
+        the :obj:`User` owns or collaborates on in a single aggregate query.
+
+        Since the :obj:`Budget`(s) the :obj:`User` owns are joined against all
+        of their :obj:`Collaborator`(s), each count must be distinct.
+        """
         # pylint: disable=import-outside-toplevel
-        from happybudget.app.budget.models import Budget
-        return Budget.objects.filter(created_by=self).count()
+        from happybudget.app.budget.models import BaseBudget
+        owned = models.Q(created_by=self)
+        return BaseBudget.objects.filter(
+            owned | models.Q(budget__collaborators__user=self)
+        ).aggregate(
+            num_budgets=models.Count('pk', distinct=True,
+                filter=owned & models.Q(budget__isnull=False)),
+            num_archived_budgets=models.Count('pk', distinct=True,
+                filter=owned & models.Q(budget__archived=True)),
+            num_templates=models.Count('pk', distinct=True,
+                filter=owned & models.Q(template__community=False)),
+            num_collaborating_budgets=models.Count('pk', distinct=True,
+                filter=models.Q(budget__collaborators__user=self))
+        )
+
+    @property
+    def num_budgets(self):
+        return self.metrics['num_budgets']
 
     @property
     def num_templates(self):
-        # pylint: disable=import-outside-toplevel
-        from happybudget.app.template.models import Template
-        return Template.objects.filter(community=False, created_by=self).count()
+        return self.metrics['num_templates']
 
     @property
     def num_collaborating_budgets(self):
-        return self.collaborating_budgets.count()
+        return self.metrics['num_collaborating_budgets']
 
     @property
     def collaborating_budgets(self):
         # pylint: disable=import-outside-toplevel
         from happybudget.app.budget.models import Budget
-        return Budget.objects.filter(pk__in=[
-            collaboration.object_id
-            for collaboration in self.collaborations.filter(
-                content_type=ContentType.objects.get_for_model(Budget)
-            ).only('object_id')
-        ])
+        return Budget.objects.collaborating(self)
 
     @property
     def num_archived_budgets(self):
-        return self.archived_budgets.count()
+        return self.metrics['num_archived_budgets']
 
     @property
     def archived_budgets(self):
@@ -406,9 +431,45 @@ class User(UserAuthenticationMixin, AbstractUser):
 
     @suppress_with_setting("EMAIL_VERIFICATION_ENABLED")
     @suppress_with_setting("EMAIL_ENABLED")
-    def send_email_verification_email(self, token=None):
-        return EmailVerificationMail(self, token=token).send()
+    def send_email_verification_email(self, token=None, asynchronous=None):
+        return EmailVerificationMail(self, token=token).send(
+            asynchronous=asynchronous)
 
     @suppress_with_setting("EMAIL_ENABLED")
-    def send_password_recovery_email(self, token=None):
-        return PasswordRecoveryMail(self, token=token).send()
+    def send_password_recovery_email(self, token=None, asynchronous=None):
+        return PasswordRecoveryMail(self, token=token).send(
+            asynchronous=asynchronous)
+
+
+class EmailDelivery(models.Model):
+    """
+    Records the delivery of a transactional email by its idempotency key.  The
+    uniqueness of the key is enforced by the database, such that only one of
+    the processes that attempt to deliver the same email can claim the
+    delivery, regardless of which worker the processes run in.
+    """
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        verbose_name = "Email Delivery"
+        verbose_name_plural = "Email Deliveries"
+
+    @classmethod
+    def claim(cls, idempotency_key):
+        """
+        Claims the delivery of the email identified by the provided
+        idempotency key, returning the :obj:`EmailDelivery` if the email was
+        not delivered (or is not being delivered) within the last
+        `EMAIL_IDEMPOTENCY_TIMEOUT` seconds and `None` otherwise.
+        """
+        cls.objects.filter(
+            idempotency_key=idempotency_key,
+            created_at__lt=timezone.now() - datetime.timedelta(
+                seconds=settings.EMAIL_IDEMPOTENCY_TIMEOUT)
+        ).delete()
+        try:
+            with transaction.atomic():
+                return cls.objects.create(idempotency_key=idempotency_key)
+        except IntegrityError:
+            return None
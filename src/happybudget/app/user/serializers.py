@@ -100,6 +100,11 @@ class UserMetricsSerializer(ModelSerializer):
             'num_budgets', 'num_collaborating_budgets', 'num_archived_budgets',
             'num_templates')
 
+    def to_representation(self, instance):
+        # All of the metrics are calculated together, so we only want to access
+        # them once instead of once for each individual field.
+        return super().to_representation(instance.metrics)
+
 
 class UserSerializer(ModelSerializer):
     first_name = serializers.CharField(
@@ -1,7 +1,11 @@
 from django import dispatch
 
 from happybudget.app import signals
+from happybudget.app.budget.models import Budget
+from happybudget.app.collaborator.models import Collaborator
+from happybudget.app.template.models import Template
 
+from .cache import invalidate_user_metrics
 from .models import User
 
 
@@ -9,3 +13,17 @@ from .models import User
 def user_deleted(instance, **kwargs):
     # TODO: We also need to remove Stripe related data when the User is deleted.
     instance.profile_image.delete(False)
+
+
+@dispatch.receiver(signals.post_save, sender=Budget)
+@dispatch.receiver(signals.post_delete, sender=Budget)
+@dispatch.receiver(signals.post_save, sender=Template)
+@dispatch.receiver(signals.post_delete, sender=Template)
+def budget_changed(instance, **kwargs):
+    invalidate_user_metrics(instance.created_by_id)
+
+
+@dispatch.receiver(signals.post_save, sender=Collaborator)
+@dispatch.receiver(signals.post_delete, sender=Collaborator)
+def collaborator_changed(instance, **kwargs):
+    invalidate_user_metrics(instance.user_id)
@@ -0,0 +1,70 @@
+import datetime
+import logging
+from celery import current_app
+import sib_api_v3_sdk
+
+from django.conf import settings
+from django.utils import timezone
+
+from .exceptions import EmailError
+from .mail import get_mail_backend
+from .models import EmailDelivery
+
+
+logger = logging.getLogger('greenbudget')
+
+
+@current_app.task(
+    autoretry_for=(EmailError, ),
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    retry_backoff=True,
+    retry_jitter=True
+)
+def send_mail(message_data, idempotency_key=None):
+    """
+    Delivers the transactional email described by the provided message data
+    through the configured email backend.
+
+    If the delivery fails, the task is retried with an exponential backoff.
+    If an idempotency key is provided, the email will not be delivered if an
+    email with the same idempotency key was already delivered (or is being
+    delivered) within the last `EMAIL_IDEMPOTENCY_TIMEOUT` seconds - which
+    prevents duplicate email when the broker redelivers the task.  The claim
+    on the delivery is stored in the database, such that it is shared between
+    all of the Celery workers.
+    """
+    delivery = None
+    if idempotency_key is not None:
+        delivery = EmailDelivery.claim(idempotency_key)
+        if delivery is None:
+            logger.info(
+                f"Not sending email {idempotency_key} because it was already "
+                "sent."
+            )
+            return False
+    message = sib_api_v3_sdk.SendSmtpEmail(**message_data)
+    try:
+        get_mail_backend().send(message)
+    except EmailError:
+        # The email was not delivered, so the retry must not be treated as a
+        # duplicate.
+        if delivery is not None:
+            delivery.delete()
+        raise
+    return True
+
+
+@current_app.task
+def delete_expired_email_deliveries():
+    """
+    Removes the :obj:`EmailDelivery`(s) that were created more than
+    `EMAIL_IDEMPOTENCY_TIMEOUT` seconds ago, since they no longer prevent the
+    delivery of duplicate email and would otherwise accumulate indefinitely.
+    """
+    cutoff_time = timezone.now() - datetime.timedelta(
+        seconds=settings.EMAIL_IDEMPOTENCY_TIMEOUT)
+    deleted, _ = EmailDelivery.objects \
+        .filter(created_at__lt=cutoff_time).delete()
+    if deleted != 0:
+        logger.info(f"Deleted {deleted} expired email delivery record(s).")
+    return {'deleted': deleted}
@@ -1,11 +1,16 @@
+import hashlib
+
 from django.http import Http404
+from django.utils.cache import get_conditional_response
 from django.utils.functional import cached_property
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.shortcuts import get_object_or_404
 
 from rest_framework import viewsets, serializers, generics
+from rest_framework.permissions import SAFE_METHODS
 
 from happybudget.lib.utils import ensure_iterable, get_attribute
-from happybudget.app import permissions
+from happybudget.app import permissions, replicas
 
 from .permissions import to_view_permission
 
@@ -45,6 +50,9 @@ class GenericView(generics.GenericAPIView):
     used in this application.
     """
     hidden = None
+    read_from_replica = False
+    conditional = False
+    public_cache = False
 
     def check_permissions(self, request):
         permission = to_view_permission(self.get_permissions())
@@ -87,7 +95,36 @@ class GenericView(generics.GenericAPIView):
         Determines how the view should respond to a given request method and
         calls the appropriate logic based on the request.
         """
+        # pylint: disable=import-outside-toplevel
+        from happybudget.app.budget.public_cache import public_response_cache
+
+        public_cache_key = None
+        if self.is_publicly_cached(request):
+            public_cache_key = public_response_cache.cache_key(request)
+            if public_cache_key is not None:
+                cached = public_response_cache.get(public_cache_key)
+                if cached is not None:
+                    return get_conditional_response(
+                        request,
+                        etag=cached.get('ETag'),
+                        last_modified=parse_http_date_safe(
+                            cached.get('Last-Modified')),
+                        response=cached
+                    )
+
         self.initial(request, *args, **kwargs)
+
+        validators = None
+        if self.is_conditional(request):
+            validators = self.get_conditional_validators(request)
+            not_modified = get_conditional_response(
+                request,
+                etag=validators['ETag'],
+                last_modified=validators['last_modified']
+            )
+            if not_modified is not None:
+                return self.add_conditional_headers(not_modified, validators)
+
         handler = self.http_method_not_allowed
         if request.method.lower() in self.http_method_names:
             handler = getattr(
@@ -95,7 +132,15 @@ class GenericView(generics.GenericAPIView):
                 request.method.lower(),
                 self.http_method_not_allowed
             )
-        return handler(request, *args, **kwargs)
+        response = handler(request, *args, **kwargs)
+        if validators is not None and response.status_code == 200:
+            self.add_conditional_headers(response, validators)
+        if public_cache_key is not None and response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: public_response_cache.set(
+                    public_cache_key, rendered)
+            )
+        return response
 
     def prepare_request(self, request, *args, **kwargs):
         """
@@ -110,6 +155,110 @@ class GenericView(generics.GenericAPIView):
         self.headers = self.default_response_headers
         return request
 
+    def should_read_from_replica(self, request):
+        """
+        Returns whether or not the reads performed to respond to the request
+        should be routed to the read replica, which is only the case for safe
+        requests to views (or actions of views) that designate themselves as
+        read only via the `read_from_replica` attribute, when the client has
+        not recently performed a write.
+
+        The `read_from_replica` attribute can be a boolean or an iterable of
+        the actions of the view that should read from the replica.
+        """
+        if not replicas.replica_enabled() \
+                or request.method not in SAFE_METHODS \
+                or replicas.is_pinned(request):
+            return False
+        if isinstance(self.read_from_replica, bool):
+            return self.read_from_replica
+        return getattr(self, 'action', None) \
+            in ensure_iterable(self.read_from_replica)
+
+    def is_conditional(self, request):
+        """
+        Returns whether or not the request should be answered with a
+        `304 Not Modified` response when the representation the client already
+        has is still current, which is only the case for safe requests to
+        views (or actions of views) that designate themselves as conditional
+        via the `conditional` attribute.
+
+        Like the `read_from_replica` attribute, the `conditional` attribute
+        can be a boolean or an iterable of the actions of the view.
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if isinstance(self.conditional, bool):
+            return self.conditional
+        return getattr(self, 'action', None) \
+            in ensure_iterable(self.conditional)
+
+    def is_publicly_cached(self, request):
+        """
+        Returns whether or not the response to the request should be served
+        from, and stored in, the
+        :obj:`happybudget.app.budget.public_cache.PublicResponseCache` - which
+        is only the case for views (or actions of views) that designate
+        themselves as publicly cached via the `public_cache` attribute.  The
+        cache itself determines whether or not the request is authenticated
+        with a :obj:`PublicToken` such that the response can be cached.
+
+        Like the `read_from_replica` attribute, the `public_cache` attribute
+        can be a boolean or an iterable of the actions of the view.
+        """
+        if isinstance(self.public_cache, bool):
+            return self.public_cache
+        return getattr(self, 'action', None) \
+            in ensure_iterable(self.public_cache)
+
+    def get_last_modified(self):
+        """
+        Returns the time that the data the view responds with was last
+        modified at, which must be implemented by conditional views.  The
+        returned time should be cheap to determine, such that it can be
+        determined without building the response.
+        """
+        raise NotImplementedError(
+            f"The view {self.__class__.__name__} must implement the "
+            "`get_last_modified` method to be conditional."
+        )
+
+    def get_etag_components(self):
+        """
+        Returns any additional values that the response depends on, which are
+        not reflected by the last modified time, such that a change to any of
+        the values changes the `ETag` of the response.
+        """
+        return []
+
+    def add_conditional_headers(self, response, validators):
+        response['ETag'] = validators['ETag']
+        response['Last-Modified'] = http_date(validators['last_modified'])
+        return response
+
+    def get_conditional_validators(self, request):
+        """
+        Returns the `ETag` and last modified time of the response to the
+        request, which are used to determine whether or not the client already
+        has the current representation of the response.
+
+        Since the same endpoint responds differently to different users, the
+        `ETag` is derived from the user, or public token, that the request is
+        authenticated with in addition to the last modified time of the data.
+        """
+        last_modified = self.get_last_modified()
+        public_token = getattr(request, 'public_token', None)
+        version = ":".join([
+            request.get_full_path(),
+            str(request.user.pk if request.user.is_authenticated
+                else getattr(public_token, 'pk', None)),
+            last_modified.isoformat()
+        ] + [str(c) for c in self.get_etag_components()])
+        return {
+            'ETag': quote_etag(hashlib.md5(version.encode('utf-8')).hexdigest()),
+            'last_modified': int(last_modified.timestamp())
+        }
+
     def dispatch(self, request, *args, **kwargs):
         """
         Overrides the default `dispatch` method of
@@ -130,6 +279,17 @@ class GenericView(generics.GenericAPIView):
             Whether or not the view is "hidden" is dictated by the `hidden`
             attribute on the view, which can be a boolean or a callable taking
             the Django settings object as its first and only argument.
+
+        (3) Read Replica Routing
+            The overridden method routes the reads performed to respond to
+            the request to the read replica when the request is eligible for
+            the replica, as dictated by `should_read_from_replica`.
+
+        (4) Conditional Requests
+            The overridden method answers safe requests to conditional views
+            with a `304 Not Modified` response, before the view builds its
+            response, when the `ETag` or last modified time provided by the
+            client is still current, as dictated by `is_conditional`.
         """
         # pylint: disable=import-outside-toplevel
         from django.conf import settings
@@ -143,6 +303,9 @@ class GenericView(generics.GenericAPIView):
             if hidden is True:
                 self.initial(request, *args, **kwargs)
                 raise Http404()
+            elif self.should_read_from_replica(request):
+                with replicas.read_from_replica():
+                    response = self.handle_request(request, *args, **kwargs)
             else:
                 response = self.handle_request(request, *args, **kwargs)
 
@@ -1,14 +1,57 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.utils.functional import cached_property
 
-from rest_framework import mixins
+from rest_framework import mixins, response
 # pylint: disable=unused-import
 from rest_framework.mixins import (  # noqa
-    ListModelMixin, DestroyModelMixin, RetrieveModelMixin)
+    DestroyModelMixin, RetrieveModelMixin)
 
 from happybudget.app import views
 
 
+class ListModelMixin(mixins.ListModelMixin):
+    """
+    Extension of `rest_framework.mixins.ListModelMixin` that serializes the
+    listed instances from the values of the queryset rather than from model
+    instances, when the view defines a :obj:`ValuesSerializer` in
+    `values_serializer_classes` for the serializer class that the view would
+    otherwise respond with.
+
+    Since the :obj:`ValuesSerializer` produces the same representation as the
+    serializer class it is defined for, the response is the same - it is just
+    built significantly faster for large tables.
+    """
+    values_serializer_classes = []
+
+    def get_values_serializer_class(self):
+        if not settings.VALUES_SERIALIZATION_ENABLED:
+            return None
+        serializer_cls = self.get_serializer_class()
+        for values_serializer_cls in self.values_serializer_classes:
+            if values_serializer_cls.serializer_class is serializer_cls:
+                return values_serializer_cls
+        return None
+
+    def list(self, request, *args, **kwargs):
+        values_serializer_cls = self.get_values_serializer_class()
+        if values_serializer_cls is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        # When the results are paginated, the page consists of model instances
+        # that are already loaded - so there is nothing to gain.
+        if page is not None and page is not queryset:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = values_serializer_cls(
+            queryset, context=self.get_serializer_context())
+        if page is None:
+            return response.Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+
+
 class UpdateModelMixin(mixins.UpdateModelMixin):
     def perform_update(self, serializer, **kwargs):
         return serializer.save(**self.update_kwargs(serializer), **kwargs)
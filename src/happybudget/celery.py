@@ -1,8 +1,7 @@
 import os
-from logging.config import dictConfig
 
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import setup_logging, task_prerun, task_postrun
 
 import django
 
@@ -28,16 +27,48 @@ def debug_task(self):
 def config_loggers(*args, **kwargs):
     # pylint: disable=import-outside-toplevel
     from django.conf import settings
-    dictConfig(settings.LOGGING)
+    from happybudget.lib.logging.handlers import configure
+    configure(settings.LOGGING)
+
+
+@task_prerun.connect
+def track_task_prerun(*args, **kwargs):
+    # pylint: disable=import-outside-toplevel
+    from happybudget.app import metrics
+    metrics.track_task_prerun(*args, **kwargs)
+
+
+@task_postrun.connect
+def track_task_postrun(*args, **kwargs):
+    # pylint: disable=import-outside-toplevel
+    from happybudget.app import metrics
+    metrics.track_task_postrun(*args, **kwargs)
+
+
+@task_prerun.connect
+def log_task_queries_prerun(*args, **kwargs):
+    # pylint: disable=import-outside-toplevel
+    from happybudget.app import querylog
+    querylog.track_task_prerun(*args, **kwargs)
+
+
+@task_postrun.connect
+def log_task_queries_postrun(*args, **kwargs):
+    # pylint: disable=import-outside-toplevel
+    from happybudget.app import querylog
+    querylog.track_task_postrun(*args, **kwargs)
 
 
 @app.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
     # pylint: disable=import-outside-toplevel
+    from happybudget.app.budget.tasks import verify_stored_totals
     from happybudget.app.group.tasks import find_and_delete_empty_groups
-    from happybudget.app.io.tasks import find_and_delete_empty_attachments
+    from happybudget.app.io.tasks import (
+        find_and_delete_empty_attachments, delete_expired_import_jobs)
     from happybudget.app.subaccount.tasks import (
         fix_corrupted_fringe_relationships)
+    from happybudget.app.user.tasks import delete_expired_email_deliveries
 
     sender.add_periodic_task(
         60.0 * 5.0,  # Every 5 minutes
@@ -49,8 +80,23 @@ def setup_periodic_tasks(sender, **kwargs):
         find_and_delete_empty_attachments.s(),
         name='Find and delete empty Attachment(s).'
     )
+    sender.add_periodic_task(
+        60.0 * 60.0,  # Every Hour
+        delete_expired_import_jobs.s(),
+        name='Delete expired Import Job(s).'
+    )
+    sender.add_periodic_task(
+        60.0 * 60.0,  # Every Hour
+        delete_expired_email_deliveries.s(),
+        name='Delete expired Email Delivery record(s).'
+    )
     sender.add_periodic_task(
         60.0 * 60.0,  # Every Hour
         fix_corrupted_fringe_relationships.s(),
         name='Find and fix corrupted Fringe - SubAccount relationship(s).'
     )
+    sender.add_periodic_task(
+        60.0 * 60.0 * 24.0,  # Every Day
+        verify_stored_totals.s(),
+        name='Verify the stored totals of Budget(s) and Template(s).'
+    )
@@ -1,4 +1,7 @@
+import gc
+import glob
 import multiprocessing
+import os
 import sys
 import threading
 import traceback
@@ -13,10 +16,31 @@ backlog = 2048
 access_log_format = (
     '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"')
 errorlog = '-'
-loglevel = 'debug'
+loglevel = 'info'
 accesslog = '-'
 
-workers = multiprocessing.cpu_count() * 2 + 1
+# The worker profile, configured via the `GUNICORN_WORKER_PROFILE` environment
+# variable:
+#
+# (1) sync: Each worker process handles one request at a time, and imports the
+#     application separately.
+# (2) gthread: Each worker process handles `GUNICORN_THREADS` requests at a time
+#     in separate threads, such that a request that is waiting on Stripe or
+#     Plaid does not block the entire process.  The application is imported
+#     once, before the workers are forked, such that the workers share the
+#     memory of the imported modules and start faster.
+worker_profile = os.environ.get('GUNICORN_WORKER_PROFILE', 'sync')
+if worker_profile == 'gthread':
+    worker_class = 'gthread'
+    workers = multiprocessing.cpu_count() + 1
+    threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+    preload_app = True
+elif worker_profile == 'sync':
+    worker_class = 'sync'
+    workers = multiprocessing.cpu_count() * 2 + 1
+    preload_app = False
+else:
+    raise ValueError(f"Unsupported worker profile {worker_profile}.")
 
 # Installs a trace function that spews every line of Python that is executed
 # when running the server.  This is the nuclear option.
@@ -50,7 +74,28 @@ def post_fork(server, worker):
 
 def pre_fork(server, worker):
     # Called just prior to forking the worker subprocess.
-    pass
+    if preload_app:
+        # pylint: disable=import-outside-toplevel
+        from django.db import connections
+
+        # Database connections cannot be shared between processes.
+        connections.close_all()
+        # Move the objects that were created when preloading the application
+        # out of the reach of the garbage collector, such that collections in
+        # the workers do not write to (and thus copy) the shared memory pages.
+        gc.freeze()
+
+
+def child_exit(server, worker):
+    # Called in the master process just after a worker has exited.  Workers
+    # archive their own metrics snapshots when they exit, but not when they are
+    # killed - so the snapshots of the worker are archived here as well.
+    directory = os.environ.get('METRICS_DIRECTORY')
+    if directory:
+        # pylint: disable=import-outside-toplevel
+        from happybudget.app.metrics import archive_snapshots
+        pattern = os.path.join(directory, f"{worker.pid}-*.json")
+        archive_snapshots(directory, glob.glob(pattern))
 
 
 def pre_exec(server):
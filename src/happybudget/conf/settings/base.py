@@ -64,8 +64,66 @@ PWD_RESET_LINK_EXPIRY_TIME_IN_HRS = 24
 SOCIAL_AUTHENTICATION_ENABLED = False
 GOOGLE_OAUTH_API_URL = None  # Post Copyright Infringement
 
+# Metrics Configuration
+# When enabled, request, cache, outbound request and Celery task metrics are
+# collected and exposed in the Prometheus text format at `METRICS_PATH`.  When
+# a `METRICS_DIRECTORY` is configured, each process writes its metrics to the
+# directory such that the metrics of all Gunicorn and Celery workers sharing
+# the directory are aggregated.
+METRICS_ENABLED = config(
+    name='METRICS_ENABLED',
+    default='false',
+    cast=config.bool
+)
+METRICS_PATH = "/metrics"
+METRICS_TOKEN = config(
+    name='METRICS_TOKEN',
+    required=[Environments.PROD, Environments.DEV],
+    enabled=METRICS_ENABLED
+)
+METRICS_DIRECTORY = config(name='METRICS_DIRECTORY', default=None)
+
+# Slow Query Log Configuration
+# When enabled, the queries of requests that perform any query slower than
+# `SLOW_QUERY_THRESHOLD`, or more queries than `SLOW_QUERY_COUNT_THRESHOLD`,
+# are logged along with the application code that issued them.
+SLOW_QUERY_LOG_ENABLED = config(
+    name='SLOW_QUERY_LOG_ENABLED',
+    default='false',
+    cast=config.bool
+)
+SLOW_QUERY_THRESHOLD = datetime.timedelta(milliseconds=100)
+SLOW_QUERY_COUNT_THRESHOLD = 100
+# The maximum number of aggregated queries included in each log.
+SLOW_QUERY_LOG_LIMIT = 10
+
+# Values Serialization Configuration
+# When enabled, list endpoints of tables that define a values serializer for
+# the serializer they respond with serialize the rows from the values of the
+# queryset instead of from model instances.
+VALUES_SERIALIZATION_ENABLED = config(
+    name='VALUES_SERIALIZATION_ENABLED',
+    default='true',
+    cast=config.bool
+)
+
+# When enabled, the rows of budgets whose calculated values change while
+# responding to requests that may write are recorded, such that clients can
+# request just the rows that changed since a given version of the budget.
+BUDGET_CHANGES_ENABLED = config(
+    name='BUDGET_CHANGES_ENABLED',
+    default='true',
+    cast=config.bool
+)
+
 # Public Configuration
 PUBLIC_TOKEN_HEADER = "HTTP_X_PUBLICTOKEN"
+# The full responses to requests authenticated with a public token are cached
+# for this amount of time, unless the budget changes earlier.  Setting the value
+# to 0 disables the cache.
+PUBLIC_RESPONSE_CACHE_TTL = datetime.timedelta(minutes=10)
+# The maximum number of responses cached in the memory of each process.
+PUBLIC_RESPONSE_CACHE_SIZE = 1024
 
 # Session Configuration
 SESSION_COOKIE_NAME = 'happybudgetsessionid'
@@ -112,6 +170,12 @@ JWT_COOKIE_SECURE = True
 JWT_TOKEN_COOKIE_NAME = 'happybudgetjwt'
 JWT_COOKIE_DOMAIN = ".happybudget.io"
 
+# The maximum number of verified JWT tokens that are cached per process, and
+# the maximum amount of time a verified JWT token will be cached for.  Setting
+# the size to 0 disables the cache.
+JWT_TOKEN_CACHE_SIZE = 1024
+JWT_TOKEN_CACHE_TTL = datetime.timedelta(seconds=60)
+
 SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('happybudget.app.authentication.tokens.AuthToken',),
     'SLIDING_TOKEN_LIFETIME': SLIDING_TOKEN_LIFETIME,
@@ -189,6 +253,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'happybudget.app.middleware.HealthCheckMiddleware',
+    'happybudget.app.middleware.MetricsMiddleware',
+    'happybudget.app.middleware.SlowQueryLogMiddleware',
+    'happybudget.app.middleware.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # This middleware must come before authentication middleware classes.
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -197,6 +264,7 @@ MIDDLEWARE = [
     'happybudget.app.authentication.middleware.BillingTokenCookieMiddleware',
     'happybudget.app.authentication.middleware.AuthTokenCookieMiddleware',
     'happybudget.app.middleware.ModelRequestMiddleware',
+    'happybudget.app.middleware.BudgetChangesMiddleware',
     'happybudget.app.middleware.CacheUserMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -261,6 +329,15 @@ REST_FRAMEWORK = {
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'NON_FIELD_ERRORS_KEY': '__all__',
     'EXCEPTION_HANDLER': 'happybudget.app.views.exception_handler',
+    'DEFAULT_RENDERER_CLASSES': [
+        'happybudget.lib.drf.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'happybudget.lib.drf.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser'
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
@@ -3,6 +3,9 @@ from happybudget.conf import config, Environments
 # Temporarily disabling due to cost of operation.
 CACHE_ENABLED = False
 CACHE_EXPIRY = 5 * 60 * 60
+# The metrics of a User are only cached for a short period of time, because the
+# cache is not invalidated when Budget(s) are updated in bulk.
+USER_METRICS_CACHE_EXPIRY = 60
 
 ELASTICACHE_ENDPOINT = config(
     name='ELASTICACHE_ENDPOINT',
@@ -1,4 +1,5 @@
 import collections
+import datetime
 import dj_database_url
 
 from happybudget.conf import config, Environments
@@ -48,6 +49,33 @@ def sqlite_db(filename):
 
 
 DEFAULT_BULK_BATCH_SIZE = 20
+# The default batch sizes used for bulk create operations, keyed by the vendor
+# of the database backend.  These can be overridden on a per-call basis with
+# the `batch_size` argument.  Note that Django will still reduce the batch size
+# if it would exceed the query parameter limits of the backend (which is
+# particularly restrictive for sqlite3).
+BULK_CREATE_BATCH_SIZES = {
+    'postgresql': 1000,
+    'sqlite': 500,
+}
+DEFAULT_BULK_DELETE_BATCH_SIZE = 500
+# The number of rows that are fetched from the database at a time when
+# streaming spreadsheet exports.
+EXPORT_CHUNK_SIZE = 2000
+# The number of accounts whose nested subaccounts are loaded at a time when
+# streaming spreadsheet exports of line items, since the subaccounts have to be
+# held in memory to be exported depth first.
+EXPORT_ACCOUNT_CHUNK_SIZE = 50
+# Whether or not imports of CSV documents are performed by a Celery task
+# instead of inside of the request-response cycle.
+IMPORT_ASYNC = True
+# The number of rows of an imported CSV document that are validated and
+# inserted at a time.
+IMPORT_BATCH_SIZE = 500
+# The maximum number of invalid rows of an import that are reported.
+IMPORT_MAX_ERRORS = 100
+# The amount of time that an import job, and its progress, is retained for.
+IMPORT_JOB_TIMEOUT = datetime.timedelta(days=1)
 ATOMIC_REQUESTS = True
 CONN_MAX_AGE = 500
 
@@ -157,3 +185,28 @@ LIVE_POSTGRES_DB = postgres_db(
 DATABASES = {
     'default': LIVE_POSTGRES_DB
 }
+
+# Read Replica Configuration
+# When a replica host is configured, the reads performed by the safe requests
+# to views that designate themselves as read only (via `read_from_replica`) are
+# routed to the replica.  Clients are pinned to the primary database for
+# `REPLICA_PIN_DURATION` after each successful write they perform, such that
+# the replication lag does not hide their own writes.
+DATABASE_ROUTERS = ['happybudget.app.replicas.ReplicaRouter']
+DATABASE_REPLICA_HOST = config(name='DATABASE_REPLICA_HOST', default=None)
+REPLICA_DATABASE = None
+REPLICA_PIN_DURATION = datetime.timedelta(seconds=5)
+REPLICA_PIN_COOKIE_NAME = 'happybudgetpinned'
+
+if DATABASE_REPLICA_HOST is not None:
+    REPLICA_DATABASE = 'replica'
+    DATABASES[REPLICA_DATABASE] = postgres_db(
+        NAME=DATABASE_NAME,
+        USER=DATABASE_USER,
+        HOST=DATABASE_REPLICA_HOST,
+        PASSWORD=DATABASE_PASSWORD,
+        PORT=DATABASE_PORT,
+        # Requests that read from the replica do not write to it, so there is
+        # no reason to wrap them in a transaction on the replica.
+        ATOMIC_REQUESTS=False
+    )
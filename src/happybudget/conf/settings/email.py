@@ -13,6 +13,18 @@ EMAIL_ENABLED = False  # Post Copyright Infringement
 FROM_EMAIL = "noreply@happybudget.io"  # Post Copyright Infringement
 EMAIL_HOST = 'smtp.sendgrid.net'  # Post Copyright Infringement
 
+# Whether or not transactional email is delivered by a Celery task instead of
+# inside of the request-response cycle.
+EMAIL_ASYNC = True
+# The backend that transactional email is delivered through.
+EMAIL_TRANSPORT_BACKEND = 'happybudget.app.user.mail.SendInBlueBackend'
+# Failed deliveries are retried with an exponential backoff, up to this number
+# of times.
+EMAIL_MAX_RETRIES = 5
+# The amount of time, in seconds, that the same email will not be delivered
+# more than once.
+EMAIL_IDEMPOTENCY_TIMEOUT = 60 * 60
+
 # Post Copyright Infringement - All Configurations
 SEND_IN_BLUE_WHITELIST_ID = 11
 
@@ -3,6 +3,16 @@ import logging
 import sys
 
 
+# Logging is configured such that the handlers of each logger are performed by a
+# separate thread in each process, consuming records from a bounded queue, such
+# that the latency of a request does not depend on the latency or the volume
+# of the log sinks.  Records are dropped when the queue is full, and debug
+# records are only enqueued at the provided sample rate.
+LOGGING_CONFIG = 'happybudget.lib.logging.handlers.configure'
+LOGGING_QUEUE_ENABLED = True
+LOGGING_QUEUE_SIZE = 10000
+LOGGING_DEBUG_SAMPLE_RATE = 1.0
+
 AWS_HANDLER = {
     "level": logging.INFO,
     "class": "watchtower.CloudWatchLogHandler",
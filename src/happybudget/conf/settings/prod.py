@@ -14,6 +14,10 @@ from .logging import attach_aws_logger, attach_sentry_logger
 ENVIRONMENT = Environments.PROD
 STAFF_USER_GLOBAL_PERMISSIONS = True
 
+# Only a sample of debug records are logged in production, such that lowering
+# the level of a logger does not flood the logging queue.
+LOGGING_DEBUG_SAMPLE_RATE = 0.1
+
 STATICFILES_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 STATIC_URL = AWS_STORAGE_BUCKET_URL
 
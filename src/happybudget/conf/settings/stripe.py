@@ -1,3 +1,5 @@
+import datetime
+
 from happybudget.conf import Environments, config
 
 
@@ -21,3 +23,23 @@ STRIPE_API_SECRET = config(
     },
     enabled=BILLING_ENABLED
 )
+
+# The signing secret of the webhook endpoint that Stripe notifies of changes to
+# the cached Stripe objects.  The endpoint has to be registered with Stripe
+# before the secret exists, so the secret is optional - when it is not set, the
+# webhook endpoint is disabled and cached objects only expire after
+# `STRIPE_CACHE_TTL`.
+STRIPE_WEBHOOK_SECRET = config(
+    name='STRIPE_WEBHOOK_SECRET',
+    default={
+        Environments.TEST: 'test_stripe_webhook_secret',
+    },
+    enabled=BILLING_ENABLED
+)
+
+# Objects retrieved from Stripe's API are cached for this amount of time, unless
+# they are invalidated earlier by a webhook event.  Setting the value to 0
+# disables the cache.  When `CACHE_ENABLED` is False, objects are cached in the
+# memory of each process and invalidations only reach the process that performs
+# them, so this is also the upper bound on how stale a cached object can be.
+STRIPE_CACHE_TTL = datetime.timedelta(minutes=5)
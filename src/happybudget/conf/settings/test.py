@@ -1,6 +1,7 @@
 """
 Settings configuration file for test environment.
 """
+import datetime
 import logging
 
 from happybudget.conf import config, Environments
@@ -16,6 +17,10 @@ ALLOWED_HOSTS = ['testserver']
 TIME_ZONE = 'UTC'
 
 EMAIL_ENABLED = False
+EMAIL_ASYNC = False
+EMAIL_TRANSPORT_BACKEND = 'happybudget.app.user.mail.LocMemBackend'
+
+IMPORT_ASYNC = False
 
 APP_DOMAIN = 'testserver/'
 APP_URL = 'http://%s' % APP_DOMAIN
@@ -27,6 +32,7 @@ STATICFILES_STORAGE = None
 DEFAULT_FILE_STORAGE = 'happybudget.app.io.storages.LocalStorage'
 
 # Disable logging in tests
+LOGGING_QUEUE_ENABLED = False
 LOGGING['loggers'] = {  # noqa
     '': {
         'handlers': ['null'],
@@ -71,12 +77,34 @@ TEST_POSTGRES_DB = postgres_db(
     PORT=TEST_DATABASE_PORT
 )
 
-DATABASES = {'default': sqlite_db("test.sqlite3")}
+DATABASES = {
+    'default': sqlite_db("test.sqlite3"),
+    # The replica is a mirror of the default database in tests, such that the
+    # routing to the replica can be tested without replication.  Reads are
+    # only routed to the replica in tests that set `REPLICA_DATABASE`.
+    'replica': dict(
+        sqlite_db("test.sqlite3"),
+        ATOMIC_REQUESTS=False,
+        TEST={'MIRROR': 'default'}
+    )
+}
 
 # The cache should always be disabled by default, but overridden on a test by
 # test basis.
 CACHE_ENABLED = False
 
+# The Stripe object cache is disabled by default, but overridden on a test by
+# test basis.
+STRIPE_CACHE_TTL = datetime.timedelta(seconds=0)
+
+# The public response cache is disabled by default, but overridden on a test by
+# test basis.
+PUBLIC_RESPONSE_CACHE_TTL = datetime.timedelta(seconds=0)
+
+# The verified JWT token cache is disabled by default, but overridden on a test
+# by test basis.
+JWT_TOKEN_CACHE_SIZE = 0
+
 # Even though the cache is disabled by default, there are tests that test the
 # cacheing behavior.  In these tests, we want to ensure that we are using the
 # DatabaseCache.  For an explanation of why we use the DatabaseCache, see the
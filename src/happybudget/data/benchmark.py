@@ -0,0 +1,440 @@
+import collections
+import contextlib
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import override_settings
+
+from rest_framework import renderers
+from rest_framework.test import APIClient
+
+from happybudget.lib.drf.renderers import JSONRenderer
+
+from happybudget.app import model
+from happybudget.app.metrics import QueryCounter
+
+from happybudget.app.account.models import BudgetAccount
+from happybudget.app.budget.models import Budget
+from happybudget.app.budget.serializers import BudgetPdfSerializer
+from happybudget.app.subaccount.models import BudgetSubAccount
+from happybudget.app.user.models import User
+
+from .generate import ApplicationDataGenerator
+
+
+BenchmarkScale = collections.namedtuple('BenchmarkScale', [
+    'id', 'num_accounts', 'num_subaccounts', 'num_details'])
+
+# The scales that the benchmarks can be performed at, where the identifier of
+# each scale refers to the approximate number of lines (BudgetAccount(s),
+# BudgetSubAccount(s) and their children BudgetSubAccount(s)) in the generated
+# Budget.
+SCALES = [
+    BenchmarkScale(id='1k', num_accounts=10, num_subaccounts=10, num_details=9),
+    BenchmarkScale(
+        id='10k', num_accounts=20, num_subaccounts=20, num_details=24),
+    BenchmarkScale(
+        id='50k', num_accounts=40, num_subaccounts=40, num_details=30),
+]
+
+
+def get_scale(scale_id):
+    try:
+        return [s for s in SCALES if s.id == scale_id][0]
+    except IndexError as e:
+        raise LookupError(f"Unknown benchmark scale {scale_id}.") from e
+
+
+def num_lines(scale):
+    return scale.num_accounts * (1 + scale.num_subaccounts * (
+        1 + scale.num_details))
+
+
+class Rollback(Exception):
+    pass
+
+
+class BenchmarkContext:
+    """
+    The data that each benchmarked operation is performed against.  The
+    relational data of the :obj:`Budget` is fetched once, before any of the
+    operations are performed, such that the time it takes to fetch the data
+    is not included in the measurements of each operation.
+    """
+
+    def __init__(self, user, budget):
+        self.user = user
+        self.budget = budget
+        self.accounts = list(BudgetAccount.objects.filter(parent=budget))
+        self.subaccounts = list(
+            BudgetSubAccount.objects.filter_by_budget(budget))
+        parent_ids = set([s.object_id for s in self.subaccounts])
+        # The SubAccount(s) at the bottom of the tree, which are the
+        # SubAccount(s) that are estimated from their own rate, quantity and
+        # multiplier as opposed to their children.
+        self.leaves = [s for s in self.subaccounts if s.pk not in parent_ids]
+        # The client is authenticated once, such that logging the User in is
+        # not included in the measurements of the operations that submit
+        # requests.
+        self.client = APIClient(SERVER_NAME=settings.ALLOWED_HOSTS[0])
+        self.client.force_authenticate(self.user)
+        self.client.force_login(self.user)
+
+    def get(self, path):
+        response = self.client.get(path)
+        assert response.status_code == 200, \
+            f"Request to {path} failed with status {response.status_code}."
+        return response
+
+
+BenchmarkOperation = collections.namedtuple('BenchmarkOperation', [
+    'id', 'label', 'func'])
+
+OPERATIONS = []
+
+
+def operation(operation_id, label):
+    def decorator(func):
+        OPERATIONS.append(
+            BenchmarkOperation(id=operation_id, label=label, func=func))
+        return func
+    return decorator
+
+
+@operation('filter_by_budget', 'Filtering Sub Accounts by Budget')
+def filter_by_budget(context):
+    return list(BudgetSubAccount.objects.filter_by_budget(context.budget))
+
+
+@operation('bulk_update', 'Bulk Updating Sub Accounts')
+def bulk_update(context):
+    for subaccount in context.leaves:
+        subaccount.rate = (subaccount.rate or 0.0) + 1.0
+    BudgetSubAccount.objects.bulk_save(context.leaves, update_fields=['rate'])
+
+
+@operation('recalculation', 'Recalculating Budget')
+def recalculation(context):
+    BudgetSubAccount.objects.bulk_calculate_all(context.leaves)
+
+
+@operation('duplication', 'Duplicating Budget')
+def duplication(context):
+    return Budget.objects.duplicate(context.budget, context.user)
+
+
+@operation('pdf_serialization', 'Serializing Budget for PDF')
+def pdf_serialization(context):
+    return BudgetPdfSerializer(context.budget).data
+
+
+@operation('list_budgets', 'Listing Budgets')
+def list_budgets(context):
+    return context.get("/v1/budgets/")
+
+
+@operation('list_budget_children', 'Listing Budget Children')
+def list_budget_children(context):
+    return context.get(f"/v1/budgets/{context.budget.pk}/children/")
+
+
+@operation('list_account_children', 'Listing Account Children')
+def list_account_children(context):
+    return context.get(f"/v1/accounts/{context.accounts[0].pk}/children/")
+
+
+@operation(
+    'list_budget_children_from_instances',
+    'Listing Budget Children Without Values Serialization'
+)
+@override_settings(VALUES_SERIALIZATION_ENABLED=False)
+def list_budget_children_from_instances(context):
+    return list_budget_children(context)
+
+
+@operation(
+    'list_account_children_from_instances',
+    'Listing Account Children Without Values Serialization'
+)
+@override_settings(VALUES_SERIALIZATION_ENABLED=False)
+def list_account_children_from_instances(context):
+    return list_account_children(context)
+
+
+@operation('list_contacts', 'Listing Contacts')
+def list_contacts(context):
+    return context.get("/v1/contacts/")
+
+
+@operation(
+    'list_contacts_from_instances',
+    'Listing Contacts Without Values Serialization'
+)
+@override_settings(VALUES_SERIALIZATION_ENABLED=False)
+def list_contacts_from_instances(context):
+    return list_contacts(context)
+
+
+@operation('list_budget_fringes', 'Listing Budget Fringes')
+def list_budget_fringes(context):
+    return context.get(f"/v1/budgets/{context.budget.pk}/fringes/")
+
+
+def get_operation(operation_id):
+    try:
+        return [o for o in OPERATIONS if o.id == operation_id][0]
+    except IndexError as e:
+        raise LookupError(f"Unknown benchmark operation {operation_id}.") \
+            from e
+
+
+def get_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL,
+            cwd=settings.BASE_DIR
+        ).decode('utf-8').strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+
+
+class BenchmarkSuite:
+    """
+    Generates a :obj:`Budget` at each of the provided scales using the
+    :obj:`ApplicationDataGenerator` with a fixed seed, and measures the time it
+    takes to perform each of the provided operations on the generated data, as
+    well as the number of queries each operation performs.
+
+    Each repetition of an operation is performed inside of a transaction that
+    is rolled back, such that every repetition is performed against the same
+    data.  The generated data itself is also rolled back after the operations
+    at each scale are performed.
+
+    The results are JSON serializable, such that they can be written to a file
+    and compared against the results of a different revision.
+    """
+
+    def __init__(self, scales=None, operations=None, repeat=3, seed=1,
+            cmd=None):
+        self.scales = scales or SCALES
+        self.operations = operations or OPERATIONS
+        self.repeat = repeat
+        self.seed = seed
+        self.cmd = cmd
+
+    def message(self, data):
+        if self.cmd is not None:
+            self.cmd.info(data)
+
+    def generate(self, user, scale):
+        generator = ApplicationDataGenerator(
+            user=user,
+            cmd=self.cmd,
+            seed=self.seed,
+            bulk=True,
+            num_budgets=1,
+            num_accounts=scale.num_accounts,
+            num_subaccounts=scale.num_subaccounts,
+            num_details=scale.num_details,
+            include_contacts=True,
+            num_contacts=10,
+            include_fringes=True,
+            num_fringes=10,
+            include_groups=True,
+            num_groups=3
+        )
+        return generator()[0]
+
+    def measure(self, op, context):
+        timings = []
+        num_queries = 0
+        for _ in range(self.repeat):
+            # Each operation is performed by the User outside of the context of
+            # a request, unless the operation submits a request.
+            setattr(model.model.thread, 'request', None)
+            setattr(model.model.thread, 'user', context.user)
+            try:
+                with transaction.atomic():
+                    counter = QueryCounter()
+                    with connection.execute_wrapper(counter):
+                        start = time.perf_counter()
+                        op.func(context)
+                        timings.append(time.perf_counter() - start)
+                    num_queries = counter.count
+                    raise Rollback()
+            except Rollback:
+                pass
+        return {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+            'queries': num_queries,
+        }
+
+    @contextlib.contextmanager
+    def generated(self, scale):
+        """
+        Generates a :obj:`Budget` at the provided scale and yields the
+        :obj:`BenchmarkContext` for the generated :obj:`Budget`, rolling back
+        the generated data afterwards.
+        """
+        try:
+            with transaction.atomic():
+                user = User.objects.create_superuser(
+                    email='benchmark@happybudget.io',
+                    password='benchmark',
+                    first_name='Benchmark',
+                    last_name='User'
+                )
+                setattr(model.model.thread, 'user', user)
+                self.message(
+                    f"Generating budget with {num_lines(scale)} lines...")
+                start = time.perf_counter()
+                budget = self.generate(user, scale)
+                self.message(
+                    f"Generated budget in {time.perf_counter() - start:.2f} "
+                    "seconds."
+                )
+                yield BenchmarkContext(user, budget)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def run_scale(self, scale):
+        results = []
+        with self.generated(scale) as context:
+            for op in self.operations:
+                self.message(f"{op.label} ({scale.id})...")
+                results.append(dict(
+                    scale=scale.id,
+                    lines=num_lines(scale),
+                    operation=op.id,
+                    repeat=self.repeat,
+                    **self.measure(op, context)
+                ))
+        return results
+
+    def __call__(self):
+        results = []
+        for scale in self.scales:
+            results += self.run_scale(scale)
+        return {
+            'meta': {
+                'revision': get_revision(),
+                'timestamp': datetime.datetime.now(
+                    datetime.timezone.utc).isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'seed': self.seed,
+            },
+            'results': results
+        }
+
+
+# The renderers that the rendering of the JSON responses of the application
+# can be benchmarked for, where the first renderer is the baseline.
+RENDERERS = [
+    ('drf', renderers.JSONRenderer),
+    ('happybudget', JSONRenderer),
+]
+
+
+class RenderingBenchmarkSuite(BenchmarkSuite):
+    """
+    Generates a :obj:`Budget` at each of the provided scales and measures the
+    time it takes and the peak memory that is allocated to render the
+    serialized :obj:`Budget`, including all of its nested
+    :obj:`BudgetAccount`(s) and :obj:`BudgetSubAccount`(s), to JSON with each
+    of the :obj:`RENDERERS`.
+
+    The time and the peak memory are measured separately, since tracing the
+    memory allocations slows down the rendering.
+    """
+
+    def measure(self, renderer_cls, data):
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            rendered = renderer_cls().render(data)
+            timings.append(time.perf_counter() - start)
+        del rendered
+
+        tracemalloc.start()
+        try:
+            renderer_cls().render(data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+            'peak_memory': peak,
+        }
+
+    def run_scale(self, scale):
+        results = []
+        with self.generated(scale) as context:
+            data = BudgetPdfSerializer(context.budget).data
+            rendered = [(renderer_id, renderer_cls().render(data))
+                for renderer_id, renderer_cls in RENDERERS]
+            assert all([r[1] == rendered[0][1] for r in rendered]), \
+                "The renderers rendered different output."
+            for renderer_id, renderer_cls in RENDERERS:
+                self.message(f"Rendering with {renderer_id} ({scale.id})...")
+                results.append(dict(
+                    scale=scale.id,
+                    lines=num_lines(scale),
+                    renderer=renderer_id,
+                    size=len(rendered[0][1]),
+                    repeat=self.repeat,
+                    **self.measure(renderer_cls, data)
+                ))
+        return results
+
+
+def compare(results, baseline):
+    """
+    Compares the provided benchmark results against the results of a baseline
+    run, returning the ratio of the median time and the difference in the
+    number of queries for each operation at each scale that is present in
+    both.
+    """
+    baseline_results = dict(
+        ((r['scale'], r['operation']), r) for r in baseline['results'])
+    comparison = []
+    for result in results['results']:
+        base = baseline_results.get((result['scale'], result['operation']))
+        if base is None:
+            continue
+        comparison.append({
+            'scale': result['scale'],
+            'operation': result['operation'],
+            'median': result['median'],
+            'baseline_median': base['median'],
+            'ratio': result['median'] / base['median']
+            if base['median'] else None,
+            'queries': result['queries'],
+            'baseline_queries': base['queries'],
+        })
+    return comparison
+
+
+def dump(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -1,3 +1,7 @@
+import random
+
+from factory.random import reseed_random
+
 from django.db import transaction, models
 
 from happybudget.lib.utils import empty
@@ -83,6 +87,8 @@ ApplicationDataGeneratorConfigParams = [
     Configuration(attr='pbar', required=False, default=None),
     Configuration(attr='cmd', required=False, default=None),
     Configuration(attr='dry_run', required=False, default=False),
+    Configuration(attr='seed', required=False, default=None),
+    Configuration(attr='bulk', required=False, default=False),
 ]
 
 
@@ -131,6 +137,14 @@ class ApplicationDataGeneratorConfig:
     def dry_run(self):
         return self._dry_run
 
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def bulk(self):
+        return self._bulk
+
     @property
     def num_budgets(self):
         return self._num_budgets
@@ -193,7 +207,8 @@ class ApplicationDataGenerator(ApplicationDataGeneratorConfig):
             super().__init__(**config)
 
     def warn(self, msg):
-        self.cmd.warn(msg)
+        if self.cmd is not None:
+            self.cmd.warn(msg)
 
     def create(self, model_cls, **kwargs):
         build = kwargs.pop('build', False)
@@ -246,11 +261,27 @@ class ApplicationDataGenerator(ApplicationDataGeneratorConfig):
         if pbar is not None:
             self._pbar = pbar
 
+        # Seeding both the random module and the random generator used by the
+        # factories allows the same data to be generated on subsequent runs.
+        if self.seed is not None:
+            random.seed(self.seed)
+            reseed_random(self.seed)
+
         contacts = self.create_contacts()
-        for bi in range(self._num_budgets):
+        if self.bulk:
+            return [
+                self.bulk_create_budget(bi, contacts)
+                for bi in range(self._num_budgets)
+            ]
+        return [
             self.create_budget(bi, contacts)
+            for bi in range(self._num_budgets)
+        ]
 
     def precheck(self):
+        if self.bulk and self.dry_run:
+            raise ConfigurationError(
+                "The generator cannot be run in bulk mode as a dry run.")
         if Color.objects.count() == 0:
             self.warn(
                 "No colors found in database. Did you forget to load the "
@@ -269,6 +300,7 @@ class ApplicationDataGenerator(ApplicationDataGeneratorConfig):
         groups = self.create_groups(parent=budget)
         for j in range(self._num_accounts):
             self.create_account(budget, j, fringes, groups, contacts)
+        return budget
 
     def create_contacts(self):
         contacts = [
@@ -349,3 +381,136 @@ class ApplicationDataGenerator(ApplicationDataGeneratorConfig):
             group=select_random(groups, null_frequency=0.5, allow_null=True),
             contact=select_random(contacts, null_frequency=0.5, allow_null=True)
         )
+
+    def instantiate(self, model_cls, **kwargs):
+        """
+        Instantiates, but does not save, an instance of the provided model for
+        the bulk mode of the generator.  The instances are instantiated directly
+        as opposed to being built by the factories, since the factories would
+        otherwise generate fake data for fields that are not relevant.
+        """
+        for user_field in get_user_fields(model_cls):
+            kwargs.setdefault(user_field, self.user)
+        self.increment_progress()
+        return model_cls(**kwargs)
+
+    def bulk_create_budget(self, i, contacts):
+        """
+        Generates the data for a :obj:`Budget` in bulk mode.
+
+        In bulk mode, each level of the :obj:`Budget`'s ancestry tree is
+        instantiated in memory and inserted with a single bulk create, as
+        opposed to saving each instance individually.  Since bulk creating
+        the instances bypasses the signals and the estimation that would
+        otherwise be performed on save, the :obj:`Budget` is recalculated
+        once after all of the data is generated.
+        """
+        budget = self.create(Budget, name=f"Budget {i + 1}")
+        fringes = self.bulk_create_fringes(budget)
+        budget_groups = self.bulk_create_groups([budget])
+
+        accounts = BudgetAccount.objects.bulk_create([
+            self.instantiate(BudgetAccount,
+                identifier=f"{j}000",
+                description=f"{j}000 Description",
+                parent=budget,
+                group=select_random(
+                    budget_groups[budget.pk],
+                    null_frequency=0.5,
+                    allow_null=True
+                )
+            ) for j in range(self._num_accounts)
+        ], return_created_objects=True)
+
+        subaccounts = self.bulk_create_subaccounts(
+            parents=accounts,
+            count=self._num_subaccounts,
+            fringes=fringes,
+            contacts=contacts,
+            identifier=lambda account, j: f"{account.identifier[:-1]}{j}"
+        )
+        details = self.bulk_create_subaccounts(
+            parents=subaccounts,
+            count=self._num_details,
+            fringes=fringes,
+            contacts=contacts,
+            identifier=lambda subaccount, j: f"{subaccount.identifier}-{j + 1}"
+        )
+        # The SubAccount(s) at the bottom of the tree are the only SubAccount(s)
+        # that are estimated from their own values as opposed to the values of
+        # their children - so recalculating them will recalculate the entire
+        # tree above them.
+        BudgetSubAccount.objects.bulk_calculate_all(details or subaccounts)
+        return budget
+
+    def bulk_create_fringes(self, budget):
+        return Fringe.objects.bulk_create([
+            self.instantiate(Fringe,
+                color=select_random(self.fringe_colors, allow_null=True),
+                name=f"Fringe {j + 1}",
+                budget=budget,
+                rate=1.0,
+                unit=select_random_model_choice(
+                    Fringe, 'UNITS', allow_null=True, null_frequency=0.3)
+            ) for j in range(self.num_fringes // self.num_budgets)
+        ], predetermine_pks=True)
+
+    def bulk_create_groups(self, parents):
+        """
+        Bulk creates the groups for each of the provided parents, which must
+        all be of the same type, returning the created groups indexed by the
+        primary key of their parent.
+        """
+        groups = {p.pk: [] for p in parents}
+        created = Group.objects.bulk_create([
+            self.instantiate(Group,
+                name=f"Group {j + 1}",
+                color=select_random(self.group_colors, allow_null=True),
+                parent=parent
+            ) for parent in parents for j in range(self.num_groups)
+        ], predetermine_pks=True)
+        for group in created:
+            groups[group.object_id].append(group)
+        return groups
+
+    def bulk_create_subaccounts(self, parents, count, fringes, contacts,
+            identifier):
+        if not parents or count == 0:
+            return []
+        groups = self.bulk_create_groups(parents)
+        subaccounts = BudgetSubAccount.objects.bulk_create([
+            self.instantiate(BudgetSubAccount,
+                parent=parent,
+                identifier=identifier(parent, j),
+                description=f"{identifier(parent, j)} Description",
+                group=select_random(
+                    groups[parent.pk], null_frequency=0.5, allow_null=True),
+                contact=select_random(
+                    contacts, null_frequency=0.5, allow_null=True),
+                rate=select_random(
+                    RATES, null_frequency=0.2, allow_null=True),
+                quantity=select_random(
+                    QUANTITIES, null_frequency=0.2, allow_null=True),
+                multiplier=select_random(
+                    MULTIPLIERS, null_frequency=0.6, allow_null=True)
+            ) for parent in parents for j in range(count)
+        ], return_created_objects=True)
+
+        # The polymorphic bulk create reinstantiates the created instances,
+        # which means that the parent cached on the original instance is lost.
+        # Reattaching the parent prevents each created instance from having to
+        # query for its parent when it is recalculated.
+        owners = [parent for parent in parents for _ in range(count)]
+        for subaccount, parent in zip(subaccounts, owners):
+            subaccount.parent = parent
+
+        through = []
+        for subaccount in subaccounts:
+            for fringe in select_random_set(
+                    fringes, allow_null=False, min_count=0, max_count=4):
+                through.append(BudgetSubAccount.fringes.through(
+                    fringe_id=fringe.pk,
+                    subaccount_id=subaccount.pk
+                ))
+        BudgetSubAccount.fringes.through.objects.bulk_create(through)
+        return subaccounts
@@ -17,10 +17,8 @@ def select_random_index(data, **kwargs):
     assert null_frequency <= 1.0 and null_frequency >= 0.0, \
         "The null frequency must be between 0 and 1."
 
-    if null_frequency != 0.0:
-        uniform = random.randint(0, 100)
-        if uniform >= null_frequency <= null_frequency * 100.0:
-            return None
+    if null_frequency != 0.0 and random.random() < null_frequency:
+        return None
     return random.choice(list(range(len(data))))
 
 
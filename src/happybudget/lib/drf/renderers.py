@@ -0,0 +1,86 @@
+import orjson
+import re
+
+from rest_framework import renderers
+
+
+# The formatting of floats by :obj:`orjson` only differs from the formatting
+# of floats by the standard library when the float is represented in
+# exponential notation by either of them, which happens when the float is
+# very large (1e16 and greater) or very small (smaller than 1e-4).  The
+# patterns are applied in two steps, since a pattern that starts with a
+# literal is significantly faster to search for than a pattern that does not.
+EXPONENT = re.compile(rb'e-?\d+(?:[,\]}]|\Z)')
+SMALL_FRACTION = re.compile(rb'0\.0000')
+NUMBER_BEFORE_EXPONENT = re.compile(rb'(?:^|[:,\[])-?\d+(?:\.\d+)?\Z')
+SEPARATOR_BEFORE_FRACTION = re.compile(rb'(?:^|[:,\[])-?\Z')
+
+
+def formats_floats_differently(rendered):
+    """
+    Returns whether or not the JSON rendered by :obj:`orjson` contains a float
+    that the standard library would have formatted differently.  Since the
+    patterns may also match the content of strings, the method can yield
+    false positives - but those only cause the data to be rendered by the
+    standard library.
+    """
+    for match in EXPONENT.finditer(rendered):
+        if NUMBER_BEFORE_EXPONENT.search(
+                rendered, max(match.start() - 32, 0), match.start()):
+            return True
+    for match in SMALL_FRACTION.finditer(rendered):
+        if SEPARATOR_BEFORE_FRACTION.search(
+                rendered, max(match.start() - 2, 0), match.start()):
+            return True
+    return False
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    Extension of `rest_framework.renderers.JSONRenderer` that serializes the
+    data with :obj:`orjson`, which is significantly faster and allocates less
+    memory than the standard library when rendering large responses.
+
+    The rendered output is identical to the output of the
+    `rest_framework.renderers.JSONRenderer`:
+
+    (1) Values that :obj:`orjson` does not natively serialize in the same
+        way as the standard library (such as :obj:`datetime.datetime`,
+        :obj:`datetime.date` and :obj:`decimal.Decimal` instances) are
+        serialized by the default method of the DRF encoder.
+    (2) When the response is requested with indentation, when the DRF JSON
+        settings deviate from the defaults, when the data contains a float
+        that would be formatted differently or when the data cannot be
+        serialized by :obj:`orjson` (e.g. integers larger than 64 bits), the
+        data is rendered by the `rest_framework.renderers.JSONRenderer`.
+
+    The only exception is non-finite floats, which :obj:`orjson` serializes as
+    null whereas the DRF renderer raises an exception.
+    """
+    options = orjson.OPT_PASSTHROUGH_DATETIME
+
+    @property
+    def is_fast(self):
+        return not self.ensure_ascii and self.compact
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.is_fast or self.get_indent(
+                accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if formats_floats_differently(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # We always fully escape \u2028 and \u2029 to ensure we output JSON
+        # that is a strict javascript subset, consistently with the DRF
+        # renderer.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028') \
+                .replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,177 @@
+import atexit
+import copy
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import threading
+
+
+logger = logging.getLogger('happybudget')
+
+
+class QueueListener(logging.handlers.QueueListener):
+    """
+    A :obj:`logging.handlers.QueueListener` that hands the records that were
+    enqueued by each :obj:`QueueHandler` to the handlers that were originally
+    configured for the logger that the :obj:`QueueHandler` replaced, such that
+    a single queue and thread can serve all of the loggers of a process.
+    """
+
+    def __init__(self, maxsize):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.routes = {}
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._sampled = 0
+        self._reported_dropped = 0
+        self._shutdown = False
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    @property
+    def sampled(self):
+        return self._sampled
+
+    def record_dropped(self):
+        with self._lock:
+            self._dropped += 1
+
+    def record_sampled(self):
+        with self._lock:
+            self._sampled += 1
+
+    def handle(self, item):
+        route, record = item
+        for handler in self.routes.get(route, []):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        if self._dropped != self._reported_dropped and self.queue.empty():
+            dropped = self._dropped - self._reported_dropped
+            self._reported_dropped = self._dropped
+            logger.warning(
+                f"Dropped {dropped} log records because the logging queue "
+                "was full."
+            )
+
+    def reset(self):
+        """
+        Replaces the queue and the thread of the listener.  This must be
+        performed in processes that are forked after the listener was started,
+        since the thread of the listener does not exist in the forked process
+        and the locks of the listener may have been held when the process
+        forked.
+        """
+        if self._shutdown:
+            return
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.start()
+
+    def shutdown(self):
+        # Stopping the listener handles the records that remain in the queue.
+        self._shutdown = True
+        if self._thread is not None:
+            self.stop()
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """
+    A :obj:`logging.handlers.QueueHandler` that enqueues records without ever
+    blocking the thread that issued them.  Records are dropped when the queue
+    is full, and debug records are only enqueued at the provided sample rate.
+    """
+
+    def __init__(self, listener, route, debug_sample_rate=1.0):
+        super().__init__(listener.queue)
+        self.listener = listener
+        self.route = route
+        self.debug_sample_rate = debug_sample_rate
+
+    def prepare(self, record):
+        # The record is handled in the same process, so it does not need to be
+        # made picklable - we only need to merge the arguments into the message
+        # such that mutations of the arguments after the record is issued do
+        # not affect the message.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.listener.queue.put_nowait((self.route, record))
+        except queue.Full:
+            self.listener.record_dropped()
+
+    def emit(self, record):
+        if record.levelno <= logging.DEBUG \
+                and random.random() >= self.debug_sample_rate:
+            self.listener.record_sampled()
+            return
+        super().emit(record)
+
+
+def enqueue_handlers(loggers, maxsize=10000, debug_sample_rate=1.0):
+    """
+    Replaces the handlers of each of the provided loggers with a
+    :obj:`QueueHandler`, such that the handlers are performed by the thread of
+    a single :obj:`QueueListener` instead of by the thread issuing the log.
+
+    Returns the started :obj:`QueueListener`.
+    """
+    queue_listener = QueueListener(maxsize=maxsize)
+    for lg in loggers:
+        handlers = [
+            h for h in lg.handlers
+            if not isinstance(h, logging.NullHandler)
+        ]
+        if not handlers:
+            continue
+        queue_listener.routes[lg.name] = handlers
+        lg.handlers = [QueueHandler(
+            listener=queue_listener,
+            route=lg.name,
+            debug_sample_rate=debug_sample_rate
+        )]
+    queue_listener.start()
+    atexit.register(queue_listener.shutdown)
+    os.register_at_fork(after_in_child=queue_listener.reset)
+    return queue_listener
+
+
+# The listener of the current process, if logging is configured to be queued.
+listener = None
+
+
+def configure(config):
+    """
+    Configures logging with the provided configuration, and then places the
+    handlers of the configured loggers behind a :obj:`QueueHandler` when
+    `LOGGING_QUEUE_ENABLED` is set.
+
+    This is used as Django's `LOGGING_CONFIG`, such that the configuration is
+    applied when Django is setup.
+    """
+    # pylint: disable=import-outside-toplevel
+    from django.conf import settings
+    global listener  # pylint: disable=global-statement
+
+    logging.config.dictConfig(config)
+    if not settings.LOGGING_QUEUE_ENABLED:
+        return
+    if listener is not None:
+        listener.shutdown()
+
+    # Both '' and 'root' refer to the root logger.
+    names = [n for n in config.get('loggers', {}) if n not in ('', 'root')]
+    listener = enqueue_handlers(
+        loggers=[logging.getLogger()] + [logging.getLogger(n) for n in names],
+        maxsize=settings.LOGGING_QUEUE_SIZE,
+        debug_sample_rate=settings.LOGGING_DEBUG_SAMPLE_RATE
+    )
@@ -0,0 +1,192 @@
+"""
+Writers that stream tabular data as CSV or XLSX documents, one chunk at a
+time, such that the data never has to be held in memory in its entirety.
+"""
+import csv
+import datetime
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+
+class SpreadsheetFormats:
+    CSV = 'csv'
+    XLSX = 'xlsx'
+    __all__ = [CSV, XLSX]
+
+
+CONTENT_TYPES = {
+    SpreadsheetFormats.CSV: 'text/csv',
+    SpreadsheetFormats.XLSX:
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Values that begin with these characters are interpreted as formulas by
+# spreadsheet applications when a CSV document is opened.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Characters that are not allowed in XML documents.
+ILLEGAL_XML_CHARACTERS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class _Echo:
+    """
+    A file-like object that returns the value that is written to it instead of
+    storing it, such that the rows written by :obj:`csv.writer` can be yielded
+    directly.
+    """
+
+    def write(self, value):
+        return value
+
+
+class _Buffer:
+    """
+    An unseekable file-like object that accumulates the bytes written to it
+    until they are consumed, which allows a :obj:`zipfile.ZipFile` to be
+    written incrementally.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def consume(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(header, rows):
+    """
+    Yields the lines of a CSV document with the provided header and rows,
+    escaping string values that would otherwise be interpreted as formulas.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([csv_value(v) for v in row])
+
+
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'content-types">'
+    '<Default Extension="rels" ContentType="application/'
+    'vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+    'main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+    'relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/'
+    'main"><sheetData>'
+)
+
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def xlsx_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value!r}</v></c>'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    value = ILLEGAL_XML_CHARACTERS.sub('', escape(str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{value}</t></is></c>'
+
+
+def xlsx_row(row):
+    return '<row>' + ''.join([xlsx_cell(v) for v in row]) + '</row>'
+
+
+def stream_xlsx(header, rows, sheet_name="Sheet1", chunk_size=64 * 1024):
+    """
+    Yields the bytes of an XLSX document, with a single worksheet containing
+    the provided header and rows, in chunks of approximately `chunk_size`
+    bytes.
+
+    The worksheet is written with inline strings, as opposed to a shared
+    strings table, such that each row can be written as soon as it is
+    provided.
+    """
+    buffer = _Buffer()
+    # Sheet names cannot be longer than 31 characters.
+    sheet_name = escape(sheet_name[:31], {'"': '&quot;'})
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', XLSX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', XLSX_RELS)
+        zf.writestr('xl/workbook.xml', XLSX_WORKBOOK.format(name=sheet_name))
+        zf.writestr('xl/_rels/workbook.xml.rels', XLSX_WORKBOOK_RELS)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) \
+                as sheet:
+            sheet.write(XLSX_SHEET_START.encode('utf-8'))
+            sheet.write(xlsx_row(header).encode('utf-8'))
+            for row in rows:
+                sheet.write(xlsx_row(row).encode('utf-8'))
+                if buffer.size >= chunk_size:
+                    yield buffer.consume()
+            sheet.write(XLSX_SHEET_END.encode('utf-8'))
+    yield buffer.consume()
+
+
+def stream_spreadsheet(file_format, header, rows, sheet_name="Sheet1"):
+    if file_format == SpreadsheetFormats.CSV:
+        return stream_csv(header, rows)
+    elif file_format == SpreadsheetFormats.XLSX:
+        return stream_xlsx(header, rows, sheet_name=sheet_name)
+    raise LookupError(f"Unsupported spreadsheet format {file_format}.")
@@ -0,0 +1,99 @@
+from happybudget.management import CustomCommand, debug_only
+
+from happybudget.app import cache
+from happybudget.data import benchmark
+
+
+@debug_only
+class Command(CustomCommand):
+    """
+    Generates budgets at fixed scales with a fixed seed and measures the time
+    and number of queries it takes to perform key operations on the generated
+    data.  The generated data is rolled back after the benchmarks are performed.
+
+    Usage:
+    -----
+    >>> python src/manage.py benchmark --scale 1k --scale 10k \
+    >>>     --output benchmark.json
+    >>> python src/manage.py benchmark --scale 1k --compare benchmark.json
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='append',
+            choices=[s.id for s in benchmark.SCALES],
+            help='The scale(s) to perform the benchmarks at.  Defaults to all.',
+        )
+        parser.add_argument(
+            '--operation',
+            action='append',
+            choices=[o.id for o in benchmark.OPERATIONS],
+            help='The operation(s) to benchmark.  Defaults to all.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='The number of times each operation should be performed.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='The seed used to generate the data.',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='The path of the JSON file the results should be written to.',
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            default=None,
+            help=(
+                'The path of a JSON file with the results of a previous run '
+                'that the results should be compared against.'
+            ),
+        )
+
+    @cache.disable()
+    def handle(self, **options):
+        suite = benchmark.BenchmarkSuite(
+            scales=[benchmark.get_scale(s) for s in options['scale'] or []],
+            operations=[
+                benchmark.get_operation(o)
+                for o in options['operation'] or []
+            ],
+            repeat=options['repeat'],
+            seed=options['seed'],
+            cmd=self
+        )
+        results = suite()
+        self.newline()
+        for result in results['results']:
+            self.info(
+                f"{result['scale']:>4} {result['operation']:<24} "
+                f"median {result['median']:.4f}s "
+                f"min {result['min']:.4f}s "
+                f"queries {result['queries']}"
+            )
+        if options['compare']:
+            self.newline()
+            comparison = benchmark.compare(
+                results, benchmark.load(options['compare']))
+            for c in comparison:
+                message = (
+                    f"{c['scale']:>4} {c['operation']:<24} "
+                    f"{c['baseline_median']:.4f}s -> {c['median']:.4f}s "
+                    f"queries {c['baseline_queries']} -> {c['queries']}"
+                )
+                if c['ratio'] is not None and c['ratio'] > 1.0:
+                    self.warning(message)
+                else:
+                    self.success(message)
+        if options['output']:
+            benchmark.dump(results, options['output'])
+            self.success(f"Wrote results to {options['output']}.")
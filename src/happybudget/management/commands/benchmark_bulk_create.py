@@ -0,0 +1,105 @@
+import time
+
+from django.db import transaction
+
+from happybudget.management import CustomCommand, debug_only, Query
+
+from happybudget.app import cache, model
+from happybudget.app.account.models import BudgetAccount
+from happybudget.app.budget.models import Budget
+from happybudget.app.subaccount.models import BudgetSubAccount
+
+
+class Rollback(Exception):
+    pass
+
+
+@debug_only
+class Command(CustomCommand):
+    """
+    Measures the throughput of bulk creating :obj:`BudgetSubAccount`(s), which
+    is the path that budget duplication, template instantiation and the bulk
+    create endpoints go through.
+
+    Unless the `--keep` flag is provided, the created data is rolled back after
+    the benchmark is performed.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=10000,
+            help='The number of sub accounts that should be bulk created.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help=(
+                'The batch size the bulk create should be performed with.  '
+                'Defaults to the batch size configured for the database '
+                'backend.'
+            ),
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Persist the created data instead of rolling it back.',
+        )
+
+    @cache.disable()
+    @Query.User.include(
+        prompt="Provide the user the data should be generated for."
+    )
+    def handle(self, user, **options):
+        # Set the user on the model decorator so that we do not get warnings
+        # about not being able to infer the user from the model save outside of
+        # the request context.
+        setattr(model.model.thread, 'user', user)
+        try:
+            with transaction.atomic():
+                self.benchmark(user, **options)
+                if not options['keep']:
+                    raise Rollback()
+        except Rollback:
+            self.info("Rolled back the created data.")
+
+    def benchmark(self, user, count, batch_size=None, **options):
+        budget = Budget.objects.create(
+            name="Bulk Create Benchmark",
+            created_by=user
+        )
+        account = BudgetAccount.objects.create(
+            parent=budget,
+            identifier="0001",
+            created_by=user,
+            updated_by=user
+        )
+        instances = [
+            BudgetSubAccount(
+                parent=account,
+                identifier=str(i),
+                description=f"Sub Account {i}",
+                rate=10.0,
+                quantity=2.0,
+                created_by=user,
+                updated_by=user
+            ) for i in range(count)
+        ]
+        start = time.perf_counter()
+        created = BudgetSubAccount.objects.bulk_create(
+            instances,
+            batch_size=batch_size,
+            return_created_objects=True
+        )
+        elapsed = time.perf_counter() - start
+
+        assert len(created) == count, \
+            "Suspicious query result: Bulk create tried to create %s " \
+            "instances, but returned %s instances." % (count, len(created))
+        self.success(
+            f"Created {count} sub accounts in {elapsed:.3f} seconds "
+            f"({count / elapsed:.0f} per second)."
+        )
+        return elapsed
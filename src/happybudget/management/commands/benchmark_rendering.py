@@ -0,0 +1,70 @@
+from happybudget.management import CustomCommand, debug_only
+
+from happybudget.app import cache
+from happybudget.data import benchmark
+
+
+@debug_only
+class Command(CustomCommand):
+    """
+    Generates budgets at fixed scales with a fixed seed and measures the time
+    it takes and the peak memory that is allocated to render the serialized
+    budget to JSON with the default DRF renderer and the renderer of the
+    application.  The generated data is rolled back after the benchmarks are
+    performed.
+
+    Usage:
+    -----
+    >>> python src/manage.py benchmark_rendering --scale 10k \
+    >>>     --output rendering.json
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            action='append',
+            choices=[s.id for s in benchmark.SCALES],
+            help='The scale(s) to perform the benchmarks at.  Defaults to all.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='The number of times the budget should be rendered.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='The seed used to generate the data.',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='The path of the JSON file the results should be written to.',
+        )
+
+    @cache.disable()
+    def handle(self, **options):
+        suite = benchmark.RenderingBenchmarkSuite(
+            scales=[benchmark.get_scale(s) for s in options['scale'] or []],
+            repeat=options['repeat'],
+            seed=options['seed'],
+            cmd=self
+        )
+        results = suite()
+        self.newline()
+        baselines = {}
+        for result in results['results']:
+            baseline = baselines.setdefault(result['scale'], result)
+            self.info(
+                f"{result['scale']:>4} {result['renderer']:<12} "
+                f"{result['size'] / 1024 ** 2:.1f}MB "
+                f"median {result['median']:.4f}s "
+                f"({baseline['median'] / result['median']:.1f}x) "
+                f"peak memory {result['peak_memory'] / 1024 ** 2:.1f}MB"
+            )
+        if options['output']:
+            benchmark.dump(results, options['output'])
+            self.success(f"Wrote results to {options['output']}.")
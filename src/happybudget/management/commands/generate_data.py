@@ -14,6 +14,20 @@ class Command(CustomCommand):
             action='store_true',
             help='Instantiate the models but do not persist them to database.',
         )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Seed the random data such that it can be reproduced.',
+        )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help=(
+                'Generate the data with bulk inserts and a single final '
+                'recalculation, which is considerably faster for large budgets.'
+            ),
+        )
 
     @cache.disable()
     @Query.Integer.include(
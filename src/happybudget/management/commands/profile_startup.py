@@ -0,0 +1,173 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from happybudget.management import CustomCommand
+
+
+# The script that is executed in a separate Python process, such that the
+# modules are not already imported by the process running the command.  The
+# script sets up Django and imports the URL configuration, which imports the
+# same modules that a Gunicorn worker imports before it handles a request, and
+# writes the memory allocated by the modules that were imported to the file
+# provided as the first argument.
+STARTUP_SCRIPT = """
+import json
+import resource
+import sys
+import tracemalloc
+
+tracemalloc.start()
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+
+snapshot = tracemalloc.take_snapshot()
+tracemalloc.stop()
+with open(sys.argv[1], 'w') as f:
+    json.dump({
+        'maxrss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'allocations': [
+            [stat.traceback[0].filename, stat.size]
+            for stat in snapshot.statistics('filename')
+        ]
+    }, f)
+"""
+
+IMPORT_TIME_LINE = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def group_module(module):
+    """
+    Groups the provided module by the application that it belongs to, or the
+    top level package that it belongs to if it does not belong to the
+    application.
+    """
+    parts = module.split('.')
+    if parts[0] == 'happybudget':
+        if len(parts) > 2 and parts[1] == 'app':
+            return '.'.join(parts[:3])
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def group_filename(filename):
+    """
+    Groups the provided filename by the application module that it belongs
+    to, or the top level package that it belongs to if it does not belong to
+    the application.
+    """
+    source_root = os.path.dirname(settings.BASE_DIR)
+    if filename.startswith(source_root + os.sep):
+        module = os.path.splitext(os.path.relpath(filename, source_root))[0]
+        return group_module(module.replace(os.sep, '.'))
+    match = re.search(r'[/\\](?:site|dist)-packages[/\\]([^/\\]+)', filename)
+    if match:
+        return group_module(match.group(1).split('.py')[0])
+    return '<stdlib>'
+
+
+class Command(CustomCommand):
+    """
+    Reports the time it takes to import, and the memory allocated by, each of
+    the application modules and third party packages that are imported when
+    the application starts, such that the cold start time and the memory of
+    each worker process can be tuned.
+
+    The application is started in a separate Python process with the same
+    settings module, using Python's `-X importtime` option and
+    :obj:`tracemalloc`.
+
+    Usage:
+    -----
+    >>> python src/manage.py profile_startup --limit 20
+    """
+    # The application is started in a separate process, so it does not need to
+    # be checked in this process.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help='The number of modules that should be reported.',
+        )
+
+    def profile(self):
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [str(os.path.dirname(settings.BASE_DIR))]
+            + [p for p in [env.get('PYTHONPATH')] if p]
+        )
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            process = subprocess.run(
+                [
+                    sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT,
+                    output.name
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=False
+            )
+            if process.returncode != 0:
+                raise CommandError(
+                    f"Could not start the application:\n{process.stderr}")
+            with open(output.name) as f:
+                return json.load(f), process.stderr
+
+    def handle(self, limit, **options):
+        self.info("Starting the application in a separate process...")
+        data, stderr = self.profile()
+
+        # The self time of each imported module, which does not include the
+        # time it takes to import its dependencies, in microseconds.
+        import_times = {}
+        total_time = 0
+        for line in stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                group = group_module(match.group(4))
+                import_times[group] = import_times.get(group, 0) \
+                    + int(match.group(1))
+                total_time += int(match.group(1))
+
+        memory = {}
+        for filename, size in data['allocations']:
+            group = group_filename(filename)
+            memory[group] = memory.get(group, 0) + size
+
+        self.newline()
+        self.info(f"{'Module':<40} {'Import (ms)':>12} {'Memory (KB)':>12}")
+        groups = sorted(
+            set(import_times) | set(memory),
+            key=lambda g: import_times.get(g, 0),
+            reverse=True
+        )
+        for group in groups[:limit]:
+            self.info(
+                f"{group:<40} {import_times.get(group, 0) / 1000:>12.1f} "
+                f"{memory.get(group, 0) / 1024:>12.1f}"
+            )
+        self.newline()
+        # The maximum resident set size is reported in kilobytes on Linux, but
+        # in bytes on macOS.
+        maxrss = data['maxrss'] if sys.platform != 'darwin' \
+            else data['maxrss'] / 1024
+        self.success(
+            f"Imported in {total_time / 1000000:.2f} seconds, allocating "
+            f"{sum(memory.values()) / (1024 * 1024):.1f} MB with a maximum "
+            f"resident set size of {maxrss / 1024:.1f} MB."
+        )
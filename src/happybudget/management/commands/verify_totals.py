@@ -0,0 +1,116 @@
+import collections
+import os
+
+from happybudget.management import CustomCommand
+
+from happybudget.app.budget import totals
+
+
+class Command(CustomCommand):
+    """
+    Recomputes the calculated values of every :obj:`Budget` and
+    :obj:`Template` from the raw lines, :obj:`Fringe`(s), :obj:`Markup`(s) and
+    :obj:`Actual`(s) with a pool of processes, and reports the stored values
+    that do not match along with the magnitude of the differences.
+
+    Unless the `--repair` flag is provided, the stored values are not altered.
+
+    Usage:
+    -----
+    >>> python src/manage.py verify_totals --workers 8
+    >>> python src/manage.py verify_totals --budget 1 --budget 2 --repair
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--budget',
+            type=int,
+            action='append',
+            help=(
+                'The ID of the budget or template that should be verified.  '
+                'Defaults to all.'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help=(
+                'The number of processes the budgets should be verified '
+                'with.  Defaults to the number of CPUs.'
+            ),
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=totals.TOLERANCE,
+            help=(
+                'The absolute difference between a stored and recomputed '
+                'value that is not considered a mismatch.'
+            ),
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=25,
+            help='The number of the largest mismatches that should be listed.',
+        )
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Replace the mismatched stored values with the recomputed '
+            'values.',
+        )
+
+    def handle(self, **options):
+        report = totals.verify_budgets(
+            budgets=options['budget'],
+            workers=options['workers'],
+            tolerance=options['tolerance'],
+            repair=options['repair']
+        )
+        mismatches = report.mismatches
+
+        if mismatches:
+            summary = collections.defaultdict(list)
+            for mismatch in mismatches:
+                summary[(mismatch.type, mismatch.field)].append(
+                    mismatch.difference)
+            self.newline()
+            for (row_type, field), differences in sorted(summary.items()):
+                self.warning(
+                    f"{row_type:<10} {field:<32} "
+                    f"mismatches {len(differences):<6} "
+                    f"total {sum(differences):.4f} "
+                    f"max {max(differences):.4f}"
+                )
+            self.newline()
+            for mismatch in mismatches[:options['limit']]:
+                self.warning(
+                    f"{mismatch.type:<10} {mismatch.pk:<8} "
+                    f"{mismatch.field:<32} stored {mismatch.stored:.4f} "
+                    f"expected {mismatch.expected:.4f} "
+                    f"difference {mismatch.difference:.4f}"
+                )
+
+        stats = report.stats
+        self.newline()
+        self.info(
+            f"Verified {stats['budgets']} budget(s) and {stats['rows']} "
+            f"row(s) in {stats['duration']:.3f}s "
+            f"({stats['budgets_per_second']:.1f} budgets/s, "
+            f"{stats['rows_per_second']:.1f} rows/s)."
+        )
+        if not mismatches:
+            self.success("The stored totals of all budgets are consistent.")
+        elif options['repair']:
+            self.success(
+                f"Repaired {stats['repaired']} mismatch(es) in "
+                f"{stats['mismatched_budgets']} budget(s)."
+            )
+        else:
+            self.warning(
+                f"Found {stats['mismatches']} mismatch(es) in "
+                f"{stats['mismatched_budgets']} budget(s).  Run with "
+                "--repair to replace the stored values."
+            )
@@ -0,0 +1,30 @@
+import pytest
+
+
+pytestmark = pytest.mark.performance
+
+
+def test_get_account_children_performance(api_client, user, generated_budget,
+        assert_performance):
+    account = generated_budget.children.first()
+    api_client.force_login(user)
+    with assert_performance('get-account-children'):
+        response = api_client.get("/v1/accounts/%s/children/" % account.pk)
+    assert response.status_code == 200
+
+
+def test_bulk_update_account_children_performance(api_client, user,
+        generated_budget, assert_performance):
+    account = generated_budget.children.first()
+    subaccounts = account.children.all()
+    api_client.force_login(user)
+    with assert_performance('bulk-update-account-children'):
+        response = api_client.patch(
+            "/v1/accounts/%s/bulk-update-children/" % account.pk,
+            format='json',
+            data={'data': [
+                {'id': s.pk, 'multiplier': 2.0}
+                for s in subaccounts
+            ]}
+        )
+    assert response.status_code == 200
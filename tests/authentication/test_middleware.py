@@ -108,7 +108,7 @@ def test_get_cookie_user_passes_cookie_args(settings, middleware_patch, rf,
     with middleware_patch(
             'parse_token', return_value=(AnonymousUser(), None)) as mock_fn:
         get_cookie_user(request)
-    assert mock_fn.mock_calls == [mock.call('token')]
+    assert mock_fn.mock_calls == [mock.call('token', cache=True)]
 
 
 @ pytest.mark.freeze_time('2021-01-01')
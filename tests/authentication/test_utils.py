@@ -3,6 +3,7 @@ from unittest import mock
 
 import pytest
 
+from happybudget.app.authentication.cache import token_cache as cache
 from happybudget.app.authentication.tokens import AuthToken, AccessToken
 from happybudget.app.authentication.exceptions import InvalidToken, ExpiredToken
 from happybudget.app.authentication.utils import parse_token
@@ -86,3 +87,59 @@ def test_access_token_invalid_token_raises_invalid_error(user):
     token.payload.pop('jti')  # Remove jti claim to trigger verify failure
     with pytest.raises(InvalidToken):
         parse_token(str(token), token_cls=AccessToken)
+
+
+@pytest.fixture
+def token_cache(settings):
+    settings.JWT_TOKEN_CACHE_SIZE = 2
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+class TestParseCachedAuthTokens:
+    def test_cached_token_skips_verification(self, user, token_cache,
+            django_assert_num_queries):
+        token = AuthToken.for_user(user)
+        returned_user, _ = parse_token(str(token), cache=True)
+        assert returned_user.pk == user.pk
+        assert len(token_cache) == 1
+
+        with django_assert_num_queries(0):
+            cached_user, token_obj = parse_token(str(token), cache=True)
+        assert cached_user.pk == user.pk
+        assert cached_user is not returned_user
+        assert token_obj['user_id'] == user.pk
+
+    def test_token_not_cached_unless_requested(self, user, token_cache):
+        parse_token(str(AuthToken.for_user(user)))
+        assert len(token_cache) == 0
+
+    def test_access_token_not_cached(self, user, token_cache):
+        parse_token(str(AccessToken.for_user(user)), token_cls=AccessToken,
+            cache=True)
+        assert len(token_cache) == 0
+
+    def test_cache_is_bounded(self, f, token_cache):
+        tokens = [str(AuthToken.for_user(u)) for u in f.create_user(count=3)]
+        for token in tokens:
+            parse_token(token, cache=True)
+        assert len(token_cache) == 2
+        assert token_cache.get(tokens[0]) is None
+        assert token_cache.get(tokens[2]) is not None
+
+    def test_saving_user_revokes_cached_token(self, user, token_cache):
+        token = str(AuthToken.for_user(user))
+        parse_token(token, cache=True)
+        assert token_cache.get(token) is not None
+        user.is_active = False
+        user.save()
+        assert token_cache.get(token) is None
+
+    def test_cached_token_expires(self, user, token_cache, freezer):
+        freezer.move_to('2021-01-01')
+        token = str(AuthToken.for_user(user))
+        parse_token(token, cache=True)
+        assert token_cache.get(token) is not None
+        freezer.move_to('2021-01-01 00:02:00')
+        assert token_cache.get(token) is None
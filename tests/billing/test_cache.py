@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import json
+import time
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from happybudget.app.billing.utils import get_product_internal_id
+
+
+def sign_webhook_payload(payload, secret):
+    timestamp = int(time.time())
+    signature = hmac.new(
+        secret.encode('utf-8'),
+        f"{timestamp}.{payload}".encode('utf-8'),
+        hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def test_product_internal_id_cached(stripe_cache, mock_stripe, products):
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert mock_stripe.Product.retrieve.call_count == 1
+    assert stripe_cache.stats.hits == 1
+    assert stripe_cache.stats.misses == 1
+
+
+def test_shared_cache_invalidated_by_other_process(settings, stripe_cache,
+        mock_stripe, products):
+    settings.CACHE_ENABLED = True
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert mock_stripe.Product.retrieve.call_count == 1
+
+    # Invalidating the shared cache, as the process that receives the webhook
+    # event would, must not leave a stale copy in the memory of this process.
+    cache.delete(stripe_cache.cache_key('product', products[0].id))
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert mock_stripe.Product.retrieve.call_count == 2
+
+
+def test_product_internal_id_not_cached_when_disabled(mock_stripe, products):
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert get_product_internal_id(products[0].id) == "happybudget_standard"
+    assert mock_stripe.Product.retrieve.call_count == 2
+
+
+@override_settings(BILLING_ENABLED=True)
+def test_customer_cached_between_users(stripe_cache, standard_product_user,
+        models, mock_stripe):
+    user = models.User.objects.get(pk=standard_product_user.pk)
+    assert user.billing_status == "active"
+    user = models.User.objects.get(pk=standard_product_user.pk)
+    assert user.billing_status == "active"
+    assert mock_stripe.Customer.retrieve.call_count == 1
+
+    # Flushing the cache for the user should force a reload from Stripe.
+    user.flush_stripe_cache()
+    assert user.billing_status == "active"
+    assert mock_stripe.Customer.retrieve.call_count == 2
+
+
+@override_settings(BILLING_ENABLED=True)
+def test_webhook_invalidates_customer(api_client, settings, stripe_cache,
+        standard_product_user, models, mock_stripe):
+    settings.STRIPE_WEBHOOK_SECRET = 'whsec_test'
+    user = models.User.objects.get(pk=standard_product_user.pk)
+    assert user.billing_status == "active"
+    assert mock_stripe.Customer.retrieve.call_count == 1
+
+    payload = json.dumps({
+        "id": "evt_1",
+        "object": "event",
+        "type": "customer.subscription.updated",
+        "data": {"object": {
+            "id": "sub_1",
+            "object": "subscription",
+            "customer": standard_product_user.stripe_id
+        }}
+    })
+    api_client.credentials(HTTP_STRIPE_SIGNATURE=sign_webhook_payload(
+        payload, settings.STRIPE_WEBHOOK_SECRET))
+    response = api_client.post(
+        "/v1/billing/webhook/",
+        data=payload,
+        content_type="application/json"
+    )
+    assert response.status_code == 200
+
+    user = models.User.objects.get(pk=standard_product_user.pk)
+    assert user.billing_status == "active"
+    assert mock_stripe.Customer.retrieve.call_count == 2
+
+
+@override_settings(BILLING_ENABLED=True)
+def test_webhook_invalid_signature(api_client, settings, stripe_cache):
+    settings.STRIPE_WEBHOOK_SECRET = 'whsec_test'
+    api_client.credentials(HTTP_STRIPE_SIGNATURE="t=1,v1=invalid")
+    response = api_client.post(
+        "/v1/billing/webhook/",
+        data=json.dumps({"id": "evt_1", "object": "event"}),
+        content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert response.json()['errors'][0]['code'] == 'invalid_webhook'
+
+
+@override_settings(BILLING_ENABLED=True)
+def test_webhook_disabled_without_secret(api_client, settings, stripe_cache):
+    settings.STRIPE_WEBHOOK_SECRET = None
+    response = api_client.post(
+        "/v1/billing/webhook/",
+        data=json.dumps({"id": "evt_1", "object": "event"}),
+        content_type="application/json"
+    )
+    assert response.status_code == 404
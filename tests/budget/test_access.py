@@ -0,0 +1,71 @@
+from happybudget.app.authentication.models import AnonymousPublicToken
+from happybudget.app.budget.access import get_budget_access
+
+
+def test_budget_access_is_memoized_per_request(rf, user, f, models):
+    budget = f.create_budget()
+    request = rf.get('/')
+    request.user = user
+    request.public_token = AnonymousPublicToken()
+
+    access = get_budget_access(request, budget)
+    assert get_budget_access(request, budget) is access
+    # A different instance of the same Budget should use the same access.
+    assert get_budget_access(
+        request, models.Budget.objects.get(pk=budget.pk)) is access
+
+    another_request = rf.get('/')
+    another_request.user = user
+    another_request.public_token = AnonymousPublicToken()
+    assert get_budget_access(another_request, budget) is not access
+
+
+def test_budget_access_owner(rf, user, f):
+    budget = f.create_budget()
+    another_budget = f.create_budget(created_by=f.create_user())
+    request = rf.get('/')
+    request.user = user
+    request.public_token = AnonymousPublicToken()
+
+    assert get_budget_access(request, budget).is_owner is True
+    assert get_budget_access(request, another_budget).is_owner is False
+
+
+def test_budget_access_collaborator_queried_once(rf, user, f, models,
+        django_assert_num_queries):
+    budget = f.create_budget(created_by=f.create_user())
+    f.create_collaborator(
+        instance=budget,
+        user=user,
+        access_type=models.Collaborator.ACCESS_TYPES.editor
+    )
+    request = rf.get('/')
+    request.user = user
+    request.public_token = AnonymousPublicToken()
+
+    with django_assert_num_queries(1):
+        for _ in range(3):
+            access = get_budget_access(request, budget)
+            assert access.is_collaborator is True
+            assert access.collaborator_access_type \
+                == models.Collaborator.ACCESS_TYPES.editor
+
+
+def test_budget_access_uses_annotated_access(rf, user, f, models,
+        django_assert_num_queries):
+    budget = f.create_budget(created_by=f.create_user())
+    f.create_collaborator(
+        instance=budget,
+        user=user,
+        access_type=models.Collaborator.ACCESS_TYPES.view_only
+    )
+    budget = models.Budget.objects.annotate_access(user).get(pk=budget.pk)
+    request = rf.get('/')
+    request.user = user
+    request.public_token = AnonymousPublicToken()
+
+    with django_assert_num_queries(0):
+        access = get_budget_access(request, budget)
+        assert access.is_owner is False
+        assert access.collaborator_access_type \
+            == models.Collaborator.ACCESS_TYPES.view_only
@@ -0,0 +1,129 @@
+import mock
+import pytest
+
+from django.db import DatabaseError
+
+from happybudget.app.account.models import Account
+from happybudget.app.budget import changes
+from happybudget.app.budget.models import BudgetChange
+
+
+def update_subaccounts(api_client, account, subaccounts, **data):
+    return api_client.patch(
+        "/v1/accounts/%s/bulk-update-children/?changes" % account.pk,
+        format='json',
+        data={'data': [{'id': s.pk, **data} for s in subaccounts]}
+    )
+
+
+def test_bulk_update_responds_with_changes(api_client, user, budget_f):
+    budget = budget_f.create_budget()
+    accounts = budget_f.create_account(parent=budget, count=2)
+    subaccounts = budget_f.create_subaccount(parent=accounts[0], count=2)
+    budget_f.create_subaccount(parent=accounts[1], quantity=1, rate=10)
+
+    api_client.force_login(user)
+    response = update_subaccounts(
+        api_client, accounts[0], subaccounts, quantity=2, rate=5)
+    assert response.status_code == 200
+    assert 'budget' not in response.json()
+    assert response.json()['parent']['nominal_value'] == 20.0
+
+    changes = response.json()['changes']
+    assert changes['version'] == 1
+    assert [(c['type'], c['id']) for c in changes['data']] == [
+        ('budget', budget.pk),
+        ('account', accounts[0].pk),
+    ]
+    assert changes['data'][0]['accumulated_value'] == 30.0
+    assert changes['data'][1]['accumulated_value'] == 20.0
+
+
+def test_bulk_update_without_changes_includes_budget(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccounts = f.create_subaccount(parent=account, count=2)
+
+    api_client.force_login(user)
+    response = api_client.patch(
+        "/v1/accounts/%s/bulk-update-children/" % account.pk,
+        format='json',
+        data={'data': [{'id': s.pk, 'quantity': 1, 'rate': 1}
+            for s in subaccounts]}
+    )
+    assert response.status_code == 200
+    assert 'changes' not in response.json()
+    assert response.json()['budget']['nominal_value'] == 2.0
+    budget.refresh_from_db()
+    assert budget.version == 1
+
+
+def test_get_changes_since_version(api_client, user, f):
+    budget = f.create_budget()
+    accounts = f.create_account(parent=budget, count=2)
+    subaccounts = [
+        f.create_subaccount(parent=accounts[0]),
+        f.create_subaccount(parent=accounts[1])
+    ]
+    api_client.force_login(user)
+
+    response = api_client.get("/v1/budgets/%s/changes/" % budget.pk)
+    assert response.status_code == 200
+    assert response.json() == {'version': 0, 'data': []}
+
+    update_subaccounts(api_client, accounts[0], subaccounts[:1], quantity=1,
+        rate=2)
+    update_subaccounts(api_client, accounts[1], subaccounts[1:], quantity=1,
+        rate=3)
+
+    response = api_client.get("/v1/budgets/%s/changes/?since=1" % budget.pk)
+    assert response.status_code == 200
+    assert response.json()['version'] == 2
+    assert [(c['type'], c['id'], c['accumulated_value'])
+        for c in response.json()['data']] == [
+            ('budget', budget.pk, 5.0),
+            ('account', accounts[1].pk, 3.0),
+    ]
+
+    response = api_client.get("/v1/budgets/%s/changes/?since=0" % budget.pk)
+    assert [(c['type'], c['id']) for c in response.json()['data']] == [
+        ('budget', budget.pk),
+        ('account', accounts[0].pk),
+        ('account', accounts[1].pk),
+    ]
+
+    response = api_client.get("/v1/budgets/%s/changes/?since=2" % budget.pk)
+    assert response.json() == {'version': 2, 'data': []}
+
+
+def test_get_changes_invalid_version(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/changes/?since=foo" % budget.pk)
+    assert response.status_code == 400
+
+
+def test_changes_not_recorded_for_failed_request(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccount = f.create_subaccount(parent=account)
+    api_client.force_login(user)
+    response = update_subaccounts(
+        api_client, account, [subaccount], quantity='foo')
+    assert response.status_code == 400
+    budget.refresh_from_db()
+    assert budget.version == 0
+
+
+def test_changes_flushed_atomically(f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    with mock.patch.object(
+            BudgetChange.objects, 'bulk_create', side_effect=DatabaseError):
+        with pytest.raises(DatabaseError):
+            with changes.recording():
+                changes.record_rows(budget.pk, Account, [account.pk])
+    # The version is not bumped without the rows that changed at the version.
+    budget.refresh_from_db()
+    assert budget.version == 0
+    assert BudgetChange.objects.count() == 0
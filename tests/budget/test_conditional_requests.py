@@ -0,0 +1,144 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', [
+    "/v1/budgets/{budget}/",
+    "/v1/budgets/{budget}/children/",
+    "/v1/accounts/{account}/",
+    "/v1/accounts/{account}/children/",
+    "/v1/subaccounts/{subaccount}/",
+    "/v1/subaccounts/{subaccount}/children/",
+])
+def test_conditional_get(api_client, user, f, path):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccount = f.create_subaccount(parent=account)
+    path = path.format(
+        budget=budget.pk, account=account.pk, subaccount=subaccount.pk)
+
+    api_client.force_login(user)
+    response = api_client.get(path)
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert response['Last-Modified'] is not None
+
+    response = api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response['ETag'] == etag
+
+    # Updating a SubAccount of the Budget should update the Budget, which
+    # should invalidate the ETag of every endpoint of the Budget.
+    response = api_client.patch(
+        "/v1/subaccounts/%s/" % subaccount.pk,
+        data={"description": "Updated"}
+    )
+    assert response.status_code == 200
+
+    response = api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+def test_conditional_get_does_not_build_response(api_client, user, f,
+        django_assert_max_num_queries):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    f.create_subaccount(parent=account, count=10)
+
+    api_client.force_login(user)
+    response = api_client.get("/v1/accounts/%s/children/" % account.pk)
+    etag = response['ETag']
+
+    # Only the session and the Account (along with the Budget that is used to
+    # check permissions) should be read - none of the children.
+    with django_assert_max_num_queries(10):
+        response = api_client.get(
+            "/v1/accounts/%s/children/" % account.pk,
+            HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 304
+
+
+def test_conditional_get_creating_child(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    etag = response['ETag']
+
+    response = api_client.post(
+        "/v1/budgets/%s/children/" % budget.pk,
+        data={"identifier": "1000"}
+    )
+    assert response.status_code == 201
+
+    response = api_client.get(
+        "/v1/budgets/%s/children/" % budget.pk, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()['data']) == 1
+
+
+def test_conditional_get_varies_by_user(api_client, user, admin_user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/" % budget.pk)
+    etag = response['ETag']
+
+    # The permissions must still be checked before the response is answered
+    # as not modified.
+    api_client.force_login(admin_user)
+    response = api_client.get(
+        "/v1/budgets/%s/" % budget.pk, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 403
+
+
+def test_conditional_get_public_token(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/" % budget.pk)
+    etag = response['ETag']
+
+    f.create_public_token(instance=budget)
+    response = api_client.get(
+        "/v1/budgets/%s/" % budget.pk, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()['public_token'] is not None
+
+
+@pytest.mark.freeze_time
+@pytest.mark.parametrize('path', [
+    "/v1/subaccounts/{subaccount}/",
+    "/v1/accounts/{account}/children/",
+])
+def test_conditional_get_invalidated_by_attachments(api_client, user, f,
+        freezer, test_uploaded_file, path):
+    freezer.move_to('2020-01-01')
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    attachment = f.create_attachment(name='attachment.jpeg')
+    subaccount = f.create_subaccount(parent=account, attachments=[attachment])
+    path = path.format(account=account.pk, subaccount=subaccount.pk)
+
+    api_client.force_login(user)
+    etag = api_client.get(path)['ETag']
+
+    freezer.move_to('2020-01-02')
+    response = api_client.delete("/v1/subaccounts/%s/attachments/%s/" % (
+        subaccount.pk, attachment.pk))
+    assert response.status_code == 204
+
+    response = api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    etag = response['ETag']
+
+    freezer.move_to('2020-01-03')
+    response = api_client.post(
+        "/v1/subaccounts/%s/attachments/" % subaccount.pk,
+        data={'file': test_uploaded_file('test.jpeg')}
+    )
+    assert response.status_code == 201
+
+    response = api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
@@ -0,0 +1,174 @@
+import csv
+import io
+import mock
+import zipfile
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from happybudget.app.budget.exports import BudgetExport
+
+
+def read_csv(response):
+    content = b''.join(response.streaming_content).decode('utf-8')
+    return list(csv.reader(io.StringIO(content)))
+
+
+def test_export_budget_lines(api_client, user, f):
+    budget = f.create_budget(name="Test Budget")
+    fringes = [
+        f.create_fringe(budget=budget, name="Fringe A"),
+        f.create_fringe(budget=budget, name="Fringe B"),
+    ]
+    markup = f.create_markup(parent=budget, identifier="Markup")
+    accounts = [
+        f.create_account(parent=budget, identifier="1000", markups=[markup]),
+        f.create_account(parent=budget, identifier="2000"),
+    ]
+    subaccount = f.create_subaccount(
+        parent=accounts[0],
+        identifier="1100",
+        description="Sub Account",
+        quantity=2,
+        rate=5.0,
+        fringes=fringes
+    )
+    f.create_subaccount(
+        parent=subaccount, identifier="1101", quantity=1, rate=3.0)
+    f.create_subaccount(
+        parent=accounts[1], identifier=None, description="No Identifier")
+
+    api_client.force_login(user)
+    response = api_client.get(
+        "/v1/budgets/%s/children/export/" % budget.pk)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/csv'
+    assert response['Content-Disposition'] == \
+        'attachment; filename="test-budget-lines.csv"'
+
+    rows = read_csv(response)
+    assert rows[0][:4] == ['Path', 'Type', 'Identifier', 'Description']
+    assert [r[:3] for r in rows[1:]] == [
+        ['1000', 'account', '1000'],
+        ['1000 / 1100', 'subaccount', '1100'],
+        ['1000 / 1100 / 1101', 'subaccount', '1101'],
+        ['2000', 'account', '2000'],
+        ['2000 / No Identifier', 'subaccount', ''],
+    ]
+    assert rows[1][10] == 'Markup'
+    assert rows[2][9] == 'Fringe A, Fringe B'
+    assert rows[3][9] == ''
+    # The nominal value of a SubAccount without children is derived from its
+    # quantity and rate.
+    assert float(rows[3][11]) == 3.0
+
+
+def test_export_budget_lines_queries_per_level(f):
+    def export_queries(num_subaccounts):
+        budget = f.create_budget()
+        account = f.create_account(parent=budget)
+        for subaccount in f.create_subaccount(
+                parent=account, count=num_subaccounts):
+            f.create_subaccount(parent=subaccount, count=2)
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(BudgetExport(budget).lines())
+        assert len(rows) == 1 + 3 * num_subaccounts
+        return len(queries)
+
+    # The number of queries only depends on the depth of the tree.
+    assert export_queries(1) == export_queries(5)
+
+
+def test_export_budget_lines_buffers_chunk_of_accounts(f, settings):
+    settings.EXPORT_ACCOUNT_CHUNK_SIZE = 1
+    budget = f.create_budget()
+    accounts = f.create_account(parent=budget, count=3)
+    for account in accounts:
+        for subaccount in f.create_subaccount(parent=account, count=2):
+            f.create_subaccount(parent=subaccount)
+
+    load_subaccounts = BudgetExport.load_subaccounts
+    buffered = []
+
+    def record_buffered(export, *args, **kwargs):
+        children = load_subaccounts(export, *args, **kwargs)
+        buffered.append(sum([len(rows) for rows in children.values()]))
+        return children
+
+    with mock.patch.object(BudgetExport, 'load_subaccounts', record_buffered):
+        rows = list(BudgetExport(budget).lines())
+    assert len(rows) == 3 * 5
+    # Only the subaccounts nested under a single account are held in memory
+    # at a time.
+    assert buffered == [4, 4, 4]
+
+
+def test_export_budget_lines_xlsx(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget, identifier="1000")
+    f.create_subaccount(parent=account, identifier="<1100 & more>")
+
+    api_client.force_login(user)
+    response = api_client.get(
+        "/v1/budgets/%s/children/export/?file_type=xlsx" % budget.pk)
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith(
+        'application/vnd.openxmlformats-officedocument')
+
+    content = b''.join(response.streaming_content)
+    with zipfile.ZipFile(io.BytesIO(content)) as zf:
+        assert zf.testzip() is None
+        sheet = zf.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    assert sheet.count('<row>') == 3
+    assert '&lt;1100 &amp; more&gt;' in sheet
+
+
+def test_export_unsupported_file_type(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.get(
+        "/v1/budgets/%s/children/export/?file_type=pdf" % budget.pk)
+    assert response.status_code == 400
+
+
+def test_export_actuals(api_client, user, f):
+    budget = f.create_budget(name="Test Budget")
+    account = f.create_account(parent=budget)
+    subaccount = f.create_subaccount(parent=account, identifier="1100")
+    markup = f.create_markup(parent=budget, identifier="Markup")
+    f.create_actual(budget=budget, owner=subaccount, name="A", value=10.0)
+    f.create_actual(budget=budget, owner=markup, name="=B", value=5.0)
+    f.create_actual(budget=budget, name="C", value=None)
+
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/actuals/export/" % budget.pk)
+    assert response.status_code == 200
+    rows = read_csv(response)
+    assert rows[0][:2] == ['Name', 'Owner']
+    assert [(r[0], r[1], r[-1]) for r in rows[1:]] == [
+        ('A', '1100', '10.0'),
+        # Values that would be interpreted as formulas are escaped.
+        ("'=B", 'Markup', '5.0'),
+        ('C', '', ''),
+    ]
+
+
+def test_export_actuals_chunked(api_client, user, f, settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccount = f.create_subaccount(parent=account, identifier="1100")
+    for i in range(5):
+        f.create_actual(budget=budget, owner=subaccount, name=str(i))
+
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/actuals/export/" % budget.pk)
+    rows = read_csv(response)
+    assert [r[:2] for r in rows[1:]] == [[str(i), '1100'] for i in range(5)]
+
+
+def test_export_actuals_not_owner(api_client, f, admin_user):
+    budget = f.create_budget()
+    api_client.force_login(admin_user)
+    response = api_client.get("/v1/budgets/%s/actuals/export/" % budget.pk)
+    assert response.status_code == 403
@@ -0,0 +1,267 @@
+import mock
+import pytest
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from happybudget.app.io.models import ImportJob
+from happybudget.app.io.tasks import delete_expired_import_jobs, perform_import
+
+
+def csv_file(content, name="import.csv"):
+    return SimpleUploadedFile(
+        name, content.encode('utf-8'), content_type='text/csv')
+
+
+@pytest.mark.parametrize('batch_size', [1, 500])
+def test_import_budget_subaccounts(api_client, user, f, models, batch_size):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget, identifier="1000")
+    fringes = [
+        f.create_fringe(budget=budget, name="Fringe A", rate=0.5, cutoff=None),
+        f.create_fringe(budget=budget, name="Fringe B", rate=0.5, cutoff=None)
+    ]
+    unit = f.create_subaccount_unit(title="Days")
+    contact = f.create_contact(first_name="Jack", last_name="Johnson")
+
+    api_client.force_login(user)
+    with override_settings(IMPORT_BATCH_SIZE=batch_size):
+        response = api_client.post(
+            "/v1/budgets/%s/children/import/" % budget.pk,
+            data={'file': csv_file(
+                "Account,Identifier,Description,Quantity,Rate,Unit,"
+                "Contact,Fringes\n"
+                "1000,1100,First,2,10,days,Jack Johnson,\"Fringe A, Fringe B\"\n"
+                "1000,1200,Second,1,5,,,\n"
+                "\n"
+                "2000,2100,Third,3,10,,,Fringe A\n"
+            )},
+            format='multipart'
+        )
+    assert response.status_code == 202
+    assert response.json() == {
+        'id': response.json()['id'],
+        'entity': 'subaccounts',
+        'budget_id': budget.pk,
+        'status': ImportJob.COMPLETED,
+        'processed': 3,
+        'created': 3,
+        'num_errors': 0,
+        'errors': [],
+        'detail': None
+    }
+
+    subaccounts = models.BudgetSubAccount.objects.order_by('identifier')
+    assert [s.identifier for s in subaccounts] == ["1100", "1200", "2100"]
+    assert subaccounts[0].unit == unit
+    assert subaccounts[0].contact == contact
+    assert set(subaccounts[0].fringes.all()) == set(fringes)
+    assert list(subaccounts[2].fringes.all()) == [fringes[0]]
+
+    # The Account that did not exist yet should have been created.
+    created_account = models.BudgetAccount.objects.get(identifier="2000")
+    assert subaccounts[2].parent == created_account
+
+    account.refresh_from_db()
+    assert account.accumulated_value == 25.0
+    assert account.accumulated_fringe_contribution == 20.0
+    created_account.refresh_from_db()
+    assert created_account.accumulated_value == 30.0
+    assert created_account.accumulated_fringe_contribution == 15.0
+    budget.refresh_from_db()
+    assert budget.accumulated_value == 55.0
+    assert budget.accumulated_fringe_contribution == 35.0
+
+
+def test_import_budget_subaccounts_recalculated_in_batches(api_client, user,
+        f, models):
+    budget = f.create_budget()
+    manager = models.BudgetSubAccount.objects
+    api_client.force_login(user)
+    with override_settings(IMPORT_BATCH_SIZE=2):
+        with mock.patch.object(manager, 'bulk_calculate_all',
+                wraps=manager.bulk_calculate_all) as bulk_calculate_all:
+            response = api_client.post(
+                "/v1/budgets/%s/children/import/" % budget.pk,
+                data={'file': csv_file(
+                    "Account,Identifier,Quantity,Rate\n"
+                    "1000,1100,1,10\n"
+                    "1000,1200,2,10\n"
+                    "2000,2100,3,10\n"
+                    "2000,2200,4,10\n"
+                    "1000,1300,5,10\n"
+                )},
+                format='multipart'
+            )
+    assert response.status_code == 202
+    assert response.json()['created'] == 5
+    assert [len(c.args[0]) for c in bulk_calculate_all.mock_calls] == [2, 2, 1]
+
+    account = models.BudgetAccount.objects.get(identifier="1000")
+    assert account.accumulated_value == 80.0
+    budget.refresh_from_db()
+    assert budget.accumulated_value == 150.0
+
+
+def test_import_budget_subaccounts_row_errors(api_client, user, f, models):
+    budget = f.create_budget()
+    f.create_account(parent=budget, identifier="1000")
+    f.create_fringe(budget=budget, name="Fringe A")
+
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/children/import/" % budget.pk,
+        data={'file': csv_file(
+            "Account,Identifier,Quantity,Rate,Fringes\n"
+            "1000,1100,2,10,Fringe A\n"
+            "1000,1200,two,10,\n"
+            "1000,1300,1,10,Fringe C\n"
+        )},
+        format='multipart'
+    )
+    assert response.status_code == 202
+    assert response.json()['status'] == ImportJob.COMPLETED
+    assert response.json()['processed'] == 3
+    assert response.json()['created'] == 1
+    assert response.json()['num_errors'] == 2
+    assert response.json()['errors'] == [
+        {'row': 3, 'errors': {'quantity': ['A valid number is required.']}},
+        {'row': 4, 'errors': {
+            'fringes': ['No fringe exists with the label "Fringe C".']}},
+    ]
+    assert models.BudgetSubAccount.objects.count() == 1
+
+
+def test_import_budget_subaccounts_missing_column(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/children/import/" % budget.pk,
+        data={'file': csv_file("Identifier,Quantity\n1100,2\n")},
+        format='multipart'
+    )
+    assert response.status_code == 202
+    assert response.json()['status'] == ImportJob.FAILED
+    assert response.json()['detail'] == (
+        "The document is missing the required column(s) account.")
+
+
+def test_import_budget_invalid_file_extension(api_client, user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/children/import/" % budget.pk,
+        data={'file': csv_file("Account\n1000\n", name="import.xlsx")},
+        format='multipart'
+    )
+    assert response.status_code == 400
+
+
+def test_import_budget_actuals(api_client, user, f, models):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget, identifier="1000")
+    subaccount = f.create_subaccount(parent=account, identifier="1100")
+    actual_type = f.create_actual_type(title="Wire")
+    contact = f.create_contact(first_name="Jack", last_name="Johnson")
+
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/actuals/import/" % budget.pk,
+        data={'file': csv_file(
+            "Name,Owner,Date,Type,Contact,Purchase Order,Value\n"
+            "First,1100,2022-01-01,Wire,Jack Johnson,PO-1,10\n"
+            "Second,1100,2022-01-02,,,,20.5\n"
+            "Third,,,,,,5\n"
+            "Fourth,9999,,,,,5\n"
+        )},
+        format='multipart'
+    )
+    assert response.status_code == 202
+    assert response.json()['created'] == 3
+    assert response.json()['errors'] == [{'row': 5, 'errors': {
+        'owner': ['No sub account exists with the label "9999".']}}]
+
+    actuals = models.Actual.objects.order_by('name')
+    assert [a.name for a in actuals] == ["First", "Second", "Third"]
+    assert actuals[0].owner == subaccount
+    assert actuals[0].actual_type == actual_type
+    assert actuals[0].contact == contact
+    assert actuals[2].owner is None
+
+    subaccount.refresh_from_db()
+    assert subaccount.actual == 30.5
+    account.refresh_from_db()
+    assert account.actual == 30.5
+    budget.refresh_from_db()
+    assert budget.actual == 30.5
+
+
+def test_get_import_job(api_client, user, admin_user, f):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/children/import/" % budget.pk,
+        data={'file': csv_file("Account,Identifier\n1000,1100\n")},
+        format='multipart'
+    )
+    job_id = response.json()['id']
+
+    response = api_client.get("/v1/io/imports/%s/" % job_id)
+    assert response.status_code == 200
+    assert response.json()['status'] == ImportJob.COMPLETED
+    assert response.json()['created'] == 1
+
+    api_client.force_login(admin_user)
+    response = api_client.get("/v1/io/imports/%s/" % job_id)
+    assert response.status_code == 404
+
+
+@override_settings(IMPORT_ASYNC=True)
+def test_import_job_performed_by_task(api_client, user, f, models):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    # The task is performed in the test process, but it only has access to the
+    # state of the job that was persisted by the request.
+    with mock.patch.object(perform_import, 'delay') as delay:
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            response = api_client.post(
+                "/v1/budgets/%s/children/import/" % budget.pk,
+                data={'file': csv_file("Account,Identifier\n1000,1100\n")},
+                format='multipart'
+            )
+    assert response.status_code == 202
+    assert response.json()['status'] == ImportJob.PENDING
+    job_id = response.json()['id']
+    delay.assert_called_once_with(job_id)
+    filename = ImportJob.objects.get(pk=job_id).filename
+    assert default_storage.exists(filename)
+
+    assert perform_import(job_id) == {
+        'processed': 1, 'created': 1, 'errors': 0}
+    assert not default_storage.exists(filename)
+    assert models.BudgetSubAccount.objects.count() == 1
+
+    response = api_client.get("/v1/io/imports/%s/" % job_id)
+    assert response.status_code == 200
+    assert response.json()['status'] == ImportJob.COMPLETED
+
+
+@pytest.mark.freeze_time
+def test_delete_expired_import_jobs(user, freezer):
+    freezer.move_to('2022-01-01')
+    expired = [
+        ImportJob.objects.create(
+            entity='contacts', user=user, filename='a.csv'),
+        ImportJob.objects.create(
+            entity='contacts', user=user, filename='b.csv',
+            status=ImportJob.COMPLETED),
+    ]
+    freezer.move_to('2022-01-03')
+    job = ImportJob.objects.create(
+        entity='contacts', user=user, filename='c.csv')
+
+    with mock.patch.object(default_storage, 'delete') as delete:
+        assert delete_expired_import_jobs() == {'deleted': 2}
+    delete.assert_called_once_with(expired[0].filename)
+    assert list(ImportJob.objects.all()) == [job]
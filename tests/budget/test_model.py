@@ -17,3 +17,47 @@ def test_bulk_create_budgets(models, user):
     assert [b.name for b in budgets] == ["Budget 2", "Budget 1"]
     assert all([b.created_by == user] for b in budgets)
     assert all([b.updated_by == user] for b in budgets)
+
+
+def test_collaborating_budgets(models, f):
+    users = f.create_user(count=3)
+    budgets = f.create_budget(count=3, created_by=users[0])
+    f.create_collaborator(instance=budgets[0], user=users[1])
+    f.create_collaborator(instance=budgets[2], user=users[1])
+    f.create_collaborator(instance=budgets[2], user=users[2])
+
+    qs = models.Budget.objects.collaborating(users[1])
+    assert sorted([b.pk for b in qs]) == [budgets[0].pk, budgets[2].pk]
+    assert qs.count() == 2
+
+
+def test_annotate_access(models, f, django_assert_num_queries):
+    users = f.create_user(count=2)
+    budgets = [
+        f.create_budget(created_by=users[0]),
+        f.create_budget(created_by=users[1]),
+        f.create_budget(created_by=users[1]),
+    ]
+    f.create_collaborator(
+        instance=budgets[1],
+        user=users[0],
+        access_type=models.Collaborator.ACCESS_TYPES.editor
+    )
+    # A collaboration for another user should not affect the access of the
+    # first user.
+    f.create_collaborator(
+        instance=budgets[0],
+        user=users[1],
+        access_type=models.Collaborator.ACCESS_TYPES.owner
+    )
+    with django_assert_num_queries(1):
+        annotated = {
+            b.pk: (b.access_user_id, b.user_is_owner, b.user_access_type)
+            for b in models.Budget.objects.annotate_access(users[0])
+        }
+    assert annotated == {
+        budgets[0].pk: (users[0].pk, True, None),
+        budgets[1].pk: (
+            users[0].pk, False, models.Collaborator.ACCESS_TYPES.editor),
+        budgets[2].pk: (users[0].pk, False, None),
+    }
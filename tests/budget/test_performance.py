@@ -0,0 +1,71 @@
+import pytest
+
+
+pytestmark = pytest.mark.performance
+
+
+def test_get_budgets_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budgets'):
+        response = api_client.get("/v1/budgets/")
+    assert response.status_code == 200
+
+
+def test_get_budget_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budget'):
+        response = api_client.get("/v1/budgets/%s/" % generated_budget.pk)
+    assert response.status_code == 200
+
+
+def test_get_budget_children_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budget-children'):
+        response = api_client.get(
+            "/v1/budgets/%s/children/" % generated_budget.pk)
+    assert response.status_code == 200
+
+
+def test_get_budget_fringes_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budget-fringes'):
+        response = api_client.get(
+            "/v1/budgets/%s/fringes/" % generated_budget.pk)
+    assert response.status_code == 200
+
+
+def test_get_budget_groups_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budget-groups'):
+        response = api_client.get(
+            "/v1/budgets/%s/groups/" % generated_budget.pk)
+    assert response.status_code == 200
+
+
+def test_get_budget_pdf_performance(api_client, user, generated_budget,
+        assert_performance):
+    api_client.force_login(user)
+    with assert_performance('get-budget-pdf'):
+        response = api_client.get("/v1/budgets/%s/pdf/" % generated_budget.pk)
+    assert response.status_code == 200
+
+
+def test_bulk_update_budget_children_performance(api_client, user,
+        generated_budget, assert_performance):
+    accounts = generated_budget.children.all()
+    api_client.force_login(user)
+    with assert_performance('bulk-update-budget-children'):
+        response = api_client.patch(
+            "/v1/budgets/%s/bulk-update-children/" % generated_budget.pk,
+            format='json',
+            data={'data': [
+                {'id': a.pk, 'description': 'New Description'}
+                for a in accounts
+            ]}
+        )
+    assert response.status_code == 200
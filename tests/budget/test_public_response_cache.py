@@ -0,0 +1,93 @@
+import datetime
+import pytest
+
+from django.test import override_settings
+
+from happybudget.app.budget.public_cache import public_response_cache
+
+
+@pytest.fixture(autouse=True)
+def public_cache():
+    public_response_cache.clear()
+    with override_settings(
+            PUBLIC_RESPONSE_CACHE_TTL=datetime.timedelta(minutes=10)):
+        yield public_response_cache
+    public_response_cache.clear()
+
+
+def test_public_response_cached(api_client, f, django_assert_max_num_queries):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    f.create_subaccount(parent=account, count=3)
+    public_token = f.create_public_token(instance=budget)
+
+    api_client.include_public_token(public_token)
+    response = api_client.get("/v1/accounts/%s/children/" % account.pk)
+    assert response.status_code == 200
+
+    # Only the token and the version of the budget are queried, inside of the
+    # savepoint of the request.
+    with django_assert_max_num_queries(5):
+        cached = api_client.get("/v1/accounts/%s/children/" % account.pk)
+    assert cached.status_code == 200
+    assert cached.content == response.content
+    assert cached['ETag'] == response['ETag']
+
+
+def test_public_response_cache_invalidated_on_change(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget, description='Original')
+    public_token = f.create_public_token(instance=budget)
+
+    api_client.include_public_token(public_token)
+    response = api_client.get("/v1/accounts/%s/" % account.pk)
+    assert response.json()['description'] == 'Original'
+
+    api_client.force_login(user)
+    response = api_client.patch(
+        "/v1/accounts/%s/" % account.pk, data={'description': 'Changed'})
+    assert response.status_code == 200
+    api_client.logout()
+
+    response = api_client.get("/v1/accounts/%s/" % account.pk)
+    assert response.json()['description'] == 'Changed'
+
+
+def test_public_response_not_modified(api_client, f):
+    budget = f.create_budget()
+    public_token = f.create_public_token(instance=budget)
+
+    api_client.include_public_token(public_token)
+    response = api_client.get("/v1/budgets/%s/" % budget.pk)
+    assert response.status_code == 200
+
+    response = api_client.get(
+        "/v1/budgets/%s/" % budget.pk,
+        HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == 304
+
+
+def test_authenticated_response_not_cached(api_client, user, f):
+    budget = f.create_budget()
+    public_token = f.create_public_token(instance=budget)
+
+    api_client.force_login(user)
+    api_client.include_public_token(public_token)
+    response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    assert response.status_code == 200
+    assert len(public_response_cache._entries) == 0
+
+
+def test_expired_token_response_not_cached(api_client, f):
+    budget = f.create_budget()
+    public_token = f.create_public_token(
+        instance=budget,
+        expires_at=datetime.datetime(2000, 1, 1).replace(
+            tzinfo=datetime.timezone.utc)
+    )
+
+    api_client.include_public_token(public_token)
+    response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    assert response.status_code == 401
+    assert len(public_response_cache._entries) == 0
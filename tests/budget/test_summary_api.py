@@ -0,0 +1,101 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def test_get_budget_summary(api_client, user, f):
+    budget = f.create_budget()
+    fringe = f.create_fringe(budget=budget, rate=0.5)
+    budget_markup = f.create_markup(parent=budget, rate=0.1)
+    accounts = [
+        f.create_account(
+            parent=budget, identifier="1000", markups=[budget_markup]),
+        f.create_account(parent=budget, identifier="2000"),
+    ]
+    subaccounts = [
+        f.create_subaccount(
+            parent=accounts[0], quantity=2, rate=5.0, fringes=[fringe]),
+        f.create_subaccount(parent=accounts[1], quantity=1, rate=3.0)
+    ]
+    f.create_actual(budget=budget, owner=subaccounts[0], value=4.0)
+
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/summary/" % budget.pk)
+    assert response.status_code == 200
+
+    budget.refresh_from_db()
+    for account in accounts:
+        account.refresh_from_db()
+
+    def estimated(obj, markup):
+        return obj.accumulated_value + obj.accumulated_fringe_contribution \
+            + markup
+
+    budget_estimated = estimated(
+        budget, budget.accumulated_markup_contribution)
+    assert response.json() == {
+        "id": budget.pk,
+        "name": budget.name,
+        "nominal_value": budget.accumulated_value,
+        "fringe_contribution": budget.accumulated_fringe_contribution,
+        "markup_contribution": budget.accumulated_markup_contribution,
+        "estimated": budget_estimated,
+        "actual": budget.actual,
+        "variance": budget_estimated - budget.actual,
+        "children": [{
+            "id": account.pk,
+            "identifier": account.identifier,
+            "description": account.description,
+            "nominal_value": account.accumulated_value,
+            "fringe_contribution": account.accumulated_fringe_contribution,
+            "markup_contribution": account.markup_contribution
+            + account.accumulated_markup_contribution,
+            "estimated": estimated(
+                account,
+                account.markup_contribution
+                + account.accumulated_markup_contribution
+            ),
+            "actual": account.actual,
+            "variance": estimated(
+                account,
+                account.markup_contribution
+                + account.accumulated_markup_contribution
+            ) - account.actual,
+        } for account in accounts]
+    }
+    assert response.json()['nominal_value'] == 13.0
+    assert response.json()['fringe_contribution'] == 5.0
+    assert response.json()['actual'] == 4.0
+    assert [c['nominal_value'] for c in response.json()['children']] == \
+        [10.0, 3.0]
+
+
+def test_get_template_summary(api_client, user, f):
+    template = f.create_template()
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/summary/" % template.pk)
+    assert response.status_code == 404
+
+
+def test_budget_summary_queries_independent_of_budget_size(api_client, user,
+        f):
+    def create_budget(num_accounts):
+        budget = f.create_budget()
+        fringe = f.create_fringe(budget=budget)
+        for _ in range(num_accounts):
+            account = f.create_account(parent=budget)
+            f.create_subaccount(
+                parent=account, count=3, quantity=1, rate=2.0,
+                fringes=[fringe])
+        return budget
+
+    def get_summary(budget):
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get("/v1/budgets/%s/summary/" % budget.pk)
+        assert response.status_code == 200
+        return response, len(context.captured_queries)
+
+    api_client.force_login(user)
+    _, num_queries = get_summary(create_budget(1))
+    response, num_queries_large = get_summary(create_budget(20))
+    assert num_queries_large == num_queries
+    assert len(response.json()['children']) == 20
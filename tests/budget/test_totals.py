@@ -0,0 +1,169 @@
+import datetime
+from io import StringIO
+import logging
+import mock
+import pytest
+
+from django.core.management import call_command
+
+from happybudget.app.account.models import Account
+from happybudget.app.budget.models import BaseBudget
+from happybudget.app.budget.tasks import verify_stored_totals
+from happybudget.app.budget.totals import (
+    BudgetTree, verify_budget, verify_budgets)
+from happybudget.app.subaccount.models import SubAccount
+
+
+@pytest.fixture
+def create_tree(f, budget_f):
+    def inner():
+        budget = budget_f.create_budget()
+        fringes = [
+            f.create_fringe(budget=budget, rate=0.1, cutoff=20),
+            f.create_fringe(budget=budget, rate=5, unit=1),
+        ]
+        accounts = budget_f.create_account(parent=budget, count=2)
+        subaccounts = [
+            budget_f.create_subaccount(
+                parent=accounts[0],
+                quantity=2,
+                rate=10,
+                multiplier=2,
+                fringes=fringes
+            ),
+            budget_f.create_subaccount(parent=accounts[0]),
+            budget_f.create_subaccount(parent=accounts[1], quantity=3, rate=3),
+        ]
+        budget_f.create_subaccount(
+            parent=subaccounts[1], quantity=5, rate=2, fringes=[fringes[0]])
+        budget_f.create_subaccount(parent=subaccounts[1], quantity=1, rate=7)
+        f.create_markup(
+            parent=accounts[0], subaccounts=[subaccounts[0]], rate=0.2)
+        f.create_markup(parent=subaccounts[1], flat=True, rate=15)
+        f.create_markup(parent=budget, accounts=[accounts[1]], rate=0.5)
+        f.create_markup(parent=budget, flat=True, rate=30)
+        if budget_f.domain == 'budget':
+            f.create_actual(budget=budget, owner=subaccounts[0], value=40)
+            f.create_actual(budget=budget, owner=subaccounts[2], value=None)
+        return budget, accounts, subaccounts
+    return inner
+
+
+def test_verify_consistent_budget(create_tree):
+    budget, _, _ = create_tree()
+    budget.refresh_from_db()
+    assert budget.nominal_value == 66.0
+
+    result = verify_budget(budget.pk)
+    assert result.rows == 8
+    assert result.mismatches == []
+    assert result.repaired is False
+
+
+@pytest.mark.freeze_time('2021-01-01')
+def test_verify_and_repair_drifted_budget(create_tree, freezer):
+    budget, accounts, subaccounts = create_tree()
+    expected = SubAccount.objects.get(pk=subaccounts[0].pk).fringe_contribution
+    SubAccount.non_polymorphic.filter(pk=subaccounts[0].pk) \
+        .update(fringe_contribution=1.0)
+    Account.non_polymorphic.filter(pk=accounts[1].pk) \
+        .update(accumulated_value=0.0, markup_contribution=0.0)
+    BaseBudget.non_polymorphic.filter(pk=budget.pk) \
+        .update(accumulated_value=100.0)
+
+    result = verify_budget(budget.pk)
+    assert sorted([(m.type, m.pk, m.field) for m in result.mismatches]) == [
+        ('account', accounts[1].pk, 'accumulated_value'),
+        ('account', accounts[1].pk, 'markup_contribution'),
+        ('budget', budget.pk, 'accumulated_value'),
+        ('subaccount', subaccounts[0].pk, 'fringe_contribution'),
+    ]
+    budget_mismatch = [m for m in result.mismatches if m.type == 'budget'][0]
+    assert budget_mismatch.expected == 66.0
+    assert budget_mismatch.difference == 34.0
+
+    version = BaseBudget.non_polymorphic.get(pk=budget.pk).version
+    freezer.move_to(datetime.datetime(2021, 1, 2))
+    result = verify_budget(budget.pk, repair=True)
+    assert result.repaired is True
+    assert verify_budget(budget.pk).mismatches == []
+
+    assert SubAccount.objects.get(pk=subaccounts[0].pk).fringe_contribution \
+        == expected
+    assert Account.objects.get(pk=accounts[1].pk).accumulated_value == 9.0
+    budget = BaseBudget.non_polymorphic.get(pk=budget.pk)
+    assert budget.accumulated_value == 66.0
+    # The repaired rows are provided to clients following the changes.
+    assert budget.version == version + 1
+    assert budget.changes.filter(version=budget.version).count() == 3
+    # The budget is marked as updated so that cached responses are invalid.
+    assert budget.updated_at == datetime.datetime(2021, 1, 2).replace(
+        tzinfo=datetime.timezone.utc)
+
+
+def test_repair_does_not_overwrite_concurrent_changes(create_tree):
+    budget, accounts, subaccounts = create_tree()
+    SubAccount.non_polymorphic.filter(pk=subaccounts[0].pk) \
+        .update(fringe_contribution=1.0)
+    Account.non_polymorphic.filter(pk=accounts[1].pk) \
+        .update(accumulated_value=0.0)
+
+    get_mismatches = BudgetTree.get_mismatches
+
+    def get_mismatches_and_change(tree, **kwargs):
+        mismatches = get_mismatches(tree, **kwargs)
+        # The row is changed after the values are read and before the repair.
+        SubAccount.non_polymorphic.filter(pk=subaccounts[0].pk) \
+            .update(fringe_contribution=2.0)
+        return mismatches
+
+    with mock.patch.object(
+            BudgetTree, 'get_mismatches', get_mismatches_and_change):
+        result = verify_budget(budget.pk, repair=True)
+    assert result.repaired is True
+
+    assert SubAccount.objects.get(pk=subaccounts[0].pk).fringe_contribution \
+        == 2.0
+    assert Account.objects.get(pk=accounts[1].pk).accumulated_value == 9.0
+
+
+def test_verify_stored_totals_task(create_tree, caplog):
+    budget, accounts, _ = create_tree()
+    create_tree()
+    Account.non_polymorphic.filter(pk=accounts[0].pk) \
+        .update(accumulated_fringe_contribution=0.0)
+
+    with caplog.at_level(logging.INFO, logger='greenbudget'):
+        stats = verify_stored_totals()
+    errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(errors) == 1
+    assert errors[0].largest_mismatches[0]['pk'] == accounts[0].pk
+    assert errors[0].largest_mismatches[0]['field'] == \
+        'accumulated_fringe_contribution'
+
+    assert stats['budgets'] == 2
+    assert stats['rows'] == 16
+    assert stats['mismatches'] == 1
+    assert stats['mismatched_budgets'] == 1
+    assert stats['repaired'] == 0
+    assert stats['rows_per_second'] > 0
+
+    assert verify_budgets(budgets=[budget.pk], repair=True).repaired == 1
+    assert verify_stored_totals()['mismatches'] == 0
+
+
+def test_verify_totals_command(create_tree):
+    budget, _, _ = create_tree()
+    BaseBudget.non_polymorphic.filter(pk=budget.pk) \
+        .update(accumulated_markup_contribution=0.0)
+
+    out = StringIO()
+    call_command('verify_totals', workers=1, stdout=out)
+    assert "Found 1 mismatch(es) in 1 budget(s)" in out.getvalue()
+    assert "accumulated_markup_contribution" in out.getvalue()
+
+    out = StringIO()
+    call_command('verify_totals', budget=[budget.pk], workers=1, repair=True,
+        stdout=out)
+    assert "Repaired 1 mismatch(es) in 1 budget(s)." in out.getvalue()
+    assert verify_budget(budget.pk).mismatches == []
@@ -12,6 +12,7 @@ from happybudget.app import model
 from .factories import *  # noqa
 from .http import *  # noqa
 from .models import *  # noqa
+from .performance import *  # noqa
 from .permissions import *  # noqa
 from .plaid import *  # noqa
 from .static import *  # noqa
@@ -24,6 +25,18 @@ def pytest_addoption(parser):
         action="store_true",
         help="Run tests that require a postgres database.",
     )
+    parser.addoption(
+        "--update-performance-baseline",
+        action="store_true",
+        help=(
+            "Record the measurements of the performance tests as the new "
+            "baseline instead of asserting them against the current baseline."
+        ),
+    )
+
+
+def pytest_sessionfinish():
+    update_performance_baseline()  # noqa
 
 
 @pytest.fixture
@@ -0,0 +1,26 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+
+def test_import_contacts(api_client, user, models):
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/contacts/import/",
+        data={'file': SimpleUploadedFile("contacts.csv", (
+            "First Name,Last Name,Contact Type,Email,Rate\n"
+            "Jack,Johnson,Vendor,jack@gmail.com,100\n"
+            "Jill,Johnson,employee,,\n"
+            "Jane,Doe,Actor,jane@gmail.com,\n"
+        ).encode('utf-8'), content_type='text/csv')},
+        format='multipart'
+    )
+    assert response.status_code == 202
+    assert response.json()['created'] == 2
+    assert response.json()['errors'] == [{'row': 4, 'errors': {
+        'contact_type': ['No contact type exists with the label "Actor".']}}]
+
+    contacts = models.Contact.objects.order_by('first_name')
+    assert [(c.full_name, c.contact_type, c.rate) for c in contacts] == [
+        ("Jack Johnson", models.Contact.TYPES.vendor, 100),
+        ("Jill Johnson", models.Contact.TYPES.employee, None),
+    ]
+    assert all([c.created_by == user for c in contacts])
@@ -0,0 +1,48 @@
+from happybudget.data import benchmark
+
+
+def test_benchmark_context_client_authenticated_once(user, f):
+    budget = f.create_budget()
+    context = benchmark.BenchmarkContext(user, budget)
+    assert context.client is context.client
+    response = context.get("/v1/budgets/%s/" % budget.pk)
+    assert response.json()['id'] == budget.pk
+
+
+def test_compare():
+    baseline = {'results': [
+        {'scale': '1k', 'operation': 'duplication', 'median': 2.0,
+            'queries': 40},
+        {'scale': '1k', 'operation': 'bulk_update', 'median': 0.0,
+            'queries': 3},
+        {'scale': '10k', 'operation': 'duplication', 'median': 8.0,
+            'queries': 40},
+    ]}
+    results = {'results': [
+        {'scale': '1k', 'operation': 'duplication', 'median': 1.0,
+            'queries': 20},
+        {'scale': '1k', 'operation': 'bulk_update', 'median': 0.5,
+            'queries': 3},
+        {'scale': '1k', 'operation': 'list_contacts', 'median': 0.1,
+            'queries': 4},
+    ]}
+    assert benchmark.compare(results, baseline) == [
+        {
+            'scale': '1k',
+            'operation': 'duplication',
+            'median': 1.0,
+            'baseline_median': 2.0,
+            'ratio': 0.5,
+            'queries': 20,
+            'baseline_queries': 40,
+        },
+        {
+            'scale': '1k',
+            'operation': 'bulk_update',
+            'median': 0.5,
+            'baseline_median': 0.0,
+            'ratio': None,
+            'queries': 3,
+            'baseline_queries': 3,
+        },
+    ]
@@ -28,5 +28,7 @@ def test_find_and_delete_empty_groups(f, models):
         )
     ]
     f.create_account(parent=budget, group=groups[1])
-    find_and_delete_empty_groups()
-    assert models.Group.objects.count() == 2
+    result = find_and_delete_empty_groups()
+    assert result == {'scanned': 2, 'fixed': 1}
+    assert [g.pk for g in models.Group.objects.all()] \
+        == [groups[1].pk, groups[2].pk]
@@ -59,10 +59,9 @@ def api_client(settings):
 
         def generic(self, *args, **kwargs):
             kwargs_with_headers = copy.deepcopy(self._dynamic_headers)
-            if self._dynamic_headers:
-                # Headers provided on request should always override those set
-                # dynamically on the client.
-                kwargs_with_headers.update(**kwargs)
+            # Headers provided on request should always override those set
+            # dynamically on the client.
+            kwargs_with_headers.update(**kwargs)
             return super().generic(*args, **kwargs_with_headers)
 
         def include_public_token(self, token):
@@ -47,5 +47,7 @@ def test_find_and_delete_empty_attachments(f, models):
         attachments=[attachments[4]]
     )
 
-    find_and_delete_empty_attachments()
+    result = find_and_delete_empty_attachments()
+    assert result == {'scanned': 4, 'fixed': 1}
     assert models.Attachment.objects.count() == 4
+    assert not models.Attachment.objects.filter(pk=attachments[0].pk).exists()
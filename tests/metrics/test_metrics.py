@@ -0,0 +1,203 @@
+# pylint: disable=redefined-outer-name
+import json
+import mock
+import os
+import pytest
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from happybudget.app import metrics
+from happybudget.app.billing.utils import get_product_internal_id
+from happybudget.app.middleware import MetricsMiddleware
+
+
+@pytest.fixture
+def enable_metrics(settings):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = None
+    settings.METRICS_DIRECTORY = None
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+def test_request_metrics(api_client, user, enable_metrics):
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/")
+    assert response.status_code == 200
+
+    labels = {'view': 'budget:budget-list', 'method': 'GET'}
+    assert metrics.HTTP_REQUESTS.value(status=200, **labels) == 1
+    assert metrics.HTTP_REQUEST_DURATION.count(**labels) == 1
+    assert metrics.HTTP_REQUEST_QUERIES.count(**labels) == 1
+
+
+def test_request_metrics_unresolved(enable_metrics):
+    middleware = MetricsMiddleware(lambda request: HttpResponse(status=404))
+    response = middleware(RequestFactory().get("/not-a-path/"))
+    assert response.status_code == 404
+    assert metrics.HTTP_REQUESTS.value(
+        view='unresolved', method='GET', status=404) == 1
+
+
+def test_request_metrics_disabled(api_client, user, settings):
+    settings.METRICS_ENABLED = False
+    metrics.registry.clear()
+    api_client.force_login(user)
+    api_client.get("/v1/budgets/")
+    assert metrics.HTTP_REQUEST_DURATION.count(
+        view='budget:budget-list', method='GET') == 0
+    with pytest.raises(MiddlewareNotUsed):
+        MetricsMiddleware(lambda request: HttpResponse())
+
+
+def test_metrics_endpoint(api_client, user, enable_metrics):
+    api_client.force_login(user)
+    api_client.get("/v1/budgets/")
+    response = api_client.get("/metrics")
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    content = response.content.decode('utf-8')
+    assert "# TYPE happybudget_http_request_duration_seconds histogram" \
+        in content
+    assert (
+        'happybudget_http_requests_total{view="budget:budget-list",'
+        'method="GET",status="200"} 1.0'
+    ) in content
+    assert (
+        'happybudget_http_request_duration_seconds_count{'
+        'view="budget:budget-list",method="GET"} 1.0'
+    ) in content
+    assert (
+        'happybudget_http_request_duration_seconds_bucket{'
+        'view="budget:budget-list",method="GET",le="+Inf"} 1.0'
+    ) in content
+
+
+def test_metrics_endpoint_requires_token(settings, enable_metrics):
+    settings.METRICS_TOKEN = "metrics-token"
+    middleware = MetricsMiddleware(lambda request: HttpResponse())
+    response = middleware(RequestFactory().get("/metrics"))
+    assert response.status_code == 401
+    response = middleware(RequestFactory().get(
+        "/metrics", HTTP_AUTHORIZATION="Bearer metrics-token"))
+    assert response.status_code == 200
+
+
+def test_metrics_aggregated_across_processes(api_client, settings, tmp_path,
+        enable_metrics):
+    settings.METRICS_DIRECTORY = str(tmp_path)
+    metrics.OUTBOUND_REQUESTS.inc(service='stripe', outcome='success')
+    metrics.OUTBOUND_REQUEST_DURATION.observe(0.2, service='stripe')
+    # Simulate the snapshot written by another worker process.
+    with open(tmp_path / "1.json", "w") as f:
+        json.dump({
+            'happybudget_outbound_requests_total': [
+                [['stripe', 'success'], 2.0]
+            ],
+            'happybudget_outbound_request_duration_seconds': [
+                [['stripe'], [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0.4, 1]]
+            ]
+        }, f)
+    response = api_client.get("/metrics")
+    content = response.content.decode('utf-8')
+    assert (
+        'happybudget_outbound_requests_total{service="stripe",'
+        'outcome="success"} 3.0'
+    ) in content
+    assert (
+        'happybudget_outbound_request_duration_seconds_bucket{'
+        'service="stripe",le="0.25"} 1.0'
+    ) in content
+    assert (
+        'happybudget_outbound_request_duration_seconds_bucket{'
+        'service="stripe",le="0.5"} 2.0'
+    ) in content
+    assert (
+        'happybudget_outbound_request_duration_seconds_count{'
+        'service="stripe"} 2.0'
+    ) in content
+
+
+def test_track_outbound_error(enable_metrics):
+    with pytest.raises(ValueError):
+        with metrics.track_outbound('plaid'):
+            raise ValueError()
+    assert metrics.OUTBOUND_REQUESTS.value(
+        service='plaid', outcome='error') == 1
+    assert metrics.OUTBOUND_REQUEST_DURATION.count(service='plaid') == 1
+
+
+def test_stripe_cache_metrics(stripe_cache, mock_stripe, products,
+        enable_metrics):
+    get_product_internal_id(products[0].id)
+    get_product_internal_id(products[0].id)
+    assert metrics.CACHE_REQUESTS.value(cache='stripe', result='hit') == 1
+    assert metrics.CACHE_REQUESTS.value(cache='stripe', result='miss') == 1
+
+
+def test_task_metrics(user, enable_metrics):
+    task = mock.MagicMock()
+    task.name = 'happybudget.app.user.tasks.send_mail'
+    metrics.track_task_prerun(task_id='1', task=task)
+    user.save()
+    metrics.track_task_postrun(task_id='1', task=task, state='SUCCESS')
+
+    assert metrics.TASKS.value(task=task.name, state='SUCCESS') == 1
+    assert metrics.TASK_DURATION.count(task=task.name) == 1
+    assert metrics.TASK_QUERIES.count(task=task.name) == 1
+
+
+def test_metrics_snapshot_archived_on_exit(api_client, settings, tmp_path,
+        enable_metrics):
+    settings.METRICS_DIRECTORY = str(tmp_path)
+    registry = metrics.Registry()
+    counter = registry.counter('test_total', 'Test.', ['kind'])
+    histogram = registry.histogram(
+        'test_seconds', 'Test.', ['kind'], buckets=(1.0, ))
+    counter.inc(kind='a')
+    histogram.observe(0.5, kind='a')
+    with mock.patch('atexit.register') as register:
+        registry.flush(force=True)
+        registry.flush(force=True)
+    path = registry.snapshot_path
+    assert os.path.basename(path).startswith(f"{os.getpid()}-")
+    # The exit handler is only registered once per process.
+    assert len(register.mock_calls) == 1
+
+    # Simulate the snapshot of a worker that exited without archiving it.
+    with open(tmp_path / "1-1.json", "w") as f:
+        json.dump({
+            'test_total': [[['a'], 2.0], [['b'], 1.0]],
+            'test_seconds': [[['a'], [0, 1, 2.0, 1]]]
+        }, f)
+    before = registry.render()
+    metrics.archive_snapshots(str(tmp_path), [str(tmp_path / "1-1.json")])
+    metrics.archive_snapshots(str(tmp_path), [path])
+    assert sorted(os.listdir(tmp_path)) == ['archive.json', 'archive.lock']
+
+    # The counts of the exited processes are retained.
+    registry.clear()
+    after = registry.render()
+    assert 'test_total{kind="a"} 3.0' in before
+    assert 'test_total{kind="a"} 3.0' in after
+    assert 'test_total{kind="b"} 1.0' in after
+    assert 'test_seconds_count{kind="a"} 2.0' in after
+    assert 'test_seconds_sum{kind="a"} 2.5' in after
+
+
+def test_metrics_archived_snapshot_not_counted_twice(settings, tmp_path,
+        enable_metrics):
+    settings.METRICS_DIRECTORY = str(tmp_path)
+    registry = metrics.Registry()
+    registry.counter('test_total', 'Test.')
+    with open(tmp_path / "1-1.json", "w") as f:
+        json.dump({'test_total': [[[], 2.0]]}, f)
+    # Simulate a reader that reads the snapshot of the exited process after
+    # it is archived but before it is removed.
+    with mock.patch('os.remove'):
+        metrics.archive_snapshots(str(tmp_path), [str(tmp_path / "1-1.json")])
+    assert os.path.exists(tmp_path / "1-1.json")
+    assert 'test_total 2.0' in registry.render()
@@ -0,0 +1,139 @@
+# pylint: disable=redefined-outer-name
+import contextlib
+import json
+import os
+import time
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import Client
+
+from happybudget.app.metrics import QueryCounter
+from happybudget.data.generate import ApplicationDataGenerator
+
+
+PERFORMANCE_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'performance.json')
+
+# The measurements recorded over the course of the test session when the
+# tests are run with the `--update-performance-baseline` flag, which are
+# written to the baseline file when the test session finishes.
+recorded_measurements = {}
+
+
+def load_performance_baseline():
+    with open(PERFORMANCE_BASELINE) as f:
+        return json.load(f)
+
+
+def update_performance_baseline():
+    """
+    Writes the measurements recorded over the course of the test session to
+    the baseline file, preserving the baselines of the measurements that were
+    not recorded in the session.
+    """
+    if not recorded_measurements:
+        return
+    baseline = load_performance_baseline()
+    baseline['measurements'].update(**recorded_measurements)
+    baseline['measurements'] = dict(sorted(baseline['measurements'].items()))
+    with open(PERFORMANCE_BASELINE, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+@pytest.fixture
+def generated_budget(user, set_model_middleware_user):
+    """
+    Generates a :obj:`Budget`, with accounts, subaccounts, details, fringes,
+    groups and contacts, for the provided :obj:`User` using the application
+    data generator.  The data is generated with a fixed seed, such that the
+    number of queries performed by the endpoints operating on the generated
+    data is deterministic.
+    """
+    set_model_middleware_user(user)
+    generator = ApplicationDataGenerator(
+        user=user,
+        seed=1,
+        bulk=True,
+        num_budgets=1,
+        num_accounts=4,
+        num_subaccounts=4,
+        num_details=3,
+        num_contacts=5,
+        num_fringes=4,
+        num_groups=2
+    )
+    budget = generator()[0]
+    set_model_middleware_user(None)
+    return budget
+
+
+@pytest.fixture
+def assert_performance(request, user):
+    """
+    Returns a context manager that measures the number of SQL queries performed
+    and the wall time elapsed inside of the block, and asserts that neither
+    exceeds the checked in baseline for the provided key by more than the
+    tolerance defined in the baseline file.
+
+    The tolerance of the number of queries and the time are both relative to
+    the baseline, but the time is also given an absolute allowance - since the
+    time of fast requests is dominated by noise.
+
+    Usage:
+    -----
+    >>> with assert_performance('budget-children'):
+    >>>     api_client.get("/v1/budgets/1/children/")
+
+    When the tests are run with the `--update-performance-baseline` flag, the
+    measurements are recorded as the new baseline instead of being asserted.
+    Changes to the baseline should be reviewed like any other change.
+    """
+    updating = request.config.getoption('update_performance_baseline')
+
+    # The URL configuration, the middleware and the modules used to
+    # authenticate the user, among others, are loaded lazily on the first
+    # request of the test session - which would otherwise be included in the
+    # measurement of whichever test happens to run first.  Loading the URL
+    # configuration alone is not sufficient, so an authenticated request is
+    # performed before anything is measured.
+    client = Client()
+    client.force_login(user)
+    client.get("/v1/budgets/")
+
+    @contextlib.contextmanager
+    def inner(key):
+        # The content types are cached by the process when they are first
+        # retrieved, so whether or not retrieving them is measured would
+        # otherwise depend on the tests that ran before.
+        ContentType.objects.clear_cache()
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            yield
+            elapsed = time.perf_counter() - start
+        measurement = {'queries': counter.count, 'time': round(elapsed, 4)}
+
+        if updating:
+            recorded_measurements[key] = measurement
+            return
+
+        baseline = load_performance_baseline()
+        expected = baseline['measurements'].get(key)
+        assert expected is not None, \
+            f"There is no performance baseline for {key}.  Run the tests " \
+            "with the `--update-performance-baseline` flag to record one."
+
+        tolerance = baseline['tolerance']
+        max_queries = expected['queries'] * (1 + tolerance['queries'])
+        max_time = expected['time'] * (1 + tolerance['time']) \
+            + tolerance['time_allowance']
+        assert measurement['queries'] <= max_queries, \
+            f"The number of queries for {key} increased from " \
+            f"{expected['queries']} to {measurement['queries']}."
+        assert measurement['time'] <= max_time, \
+            f"The time for {key} increased from {expected['time']}s to " \
+            f"{measurement['time']}s."
+    return inner
@@ -0,0 +1,95 @@
+import datetime
+import logging
+import mock
+import pytest
+
+from happybudget.app import querylog
+from happybudget.app.querylog import normalize_sql, log_slow_queries
+
+
+@pytest.mark.parametrize('sql,expected', [
+    (
+        'SELECT "budget"."id" FROM "budget" WHERE "budget"."id" = 5',
+        'SELECT "budget"."id" FROM "budget" WHERE "budget"."id" = ?'
+    ),
+    (
+        "SELECT * FROM \"user\" WHERE \"email\" = 'it''s@happybudget.io'",
+        'SELECT * FROM "user" WHERE "email" = ?'
+    ),
+    (
+        'SELECT * FROM "account" WHERE "id" IN (%s, %s, %s)',
+        'SELECT * FROM "account" WHERE "id" IN (...)'
+    ),
+    (
+        'SELECT *\n  FROM "account_2"\n  WHERE "rate" > 1.5',
+        'SELECT * FROM "account_2" WHERE "rate" > ?'
+    ),
+])
+def test_normalize_sql(sql, expected):
+    assert normalize_sql(sql) == expected
+
+
+def test_log_slow_queries(settings, caplog, f):
+    settings.SLOW_QUERY_THRESHOLD = datetime.timedelta(seconds=0)
+    budget = f.create_budget()
+    accounts = f.create_account(parent=budget, count=3)
+    with caplog.at_level(logging.WARNING, logger='happybudget'):
+        with log_slow_queries("Test") as query_log:
+            for account in accounts:
+                assert account.budget.pk == budget.pk
+            list(budget.children.all())
+    # Polymorphic querysets perform an additional query to fetch the fields of
+    # the child models.
+    assert query_log.count == 2
+    assert len(query_log.slow_entries) == 2
+    assert len(caplog.records) == 1
+    assert caplog.records[0].num_queries == 2
+    assert "Test performed 2 queries" in caplog.records[0].getMessage()
+
+
+def test_log_slow_queries_not_logged(settings, caplog, f):
+    budget = f.create_budget()
+    with caplog.at_level(logging.WARNING, logger='happybudget'):
+        # The Budget does not have children, so the polymorphic queryset does
+        # not need to perform an additional query.
+        with log_slow_queries("Test") as query_log:
+            list(budget.children.all())
+    assert query_log.count == 1
+    assert caplog.records == []
+
+
+def test_slow_query_log_middleware(api_client, user, settings, caplog,
+        budget_f):
+    settings.SLOW_QUERY_LOG_ENABLED = True
+    settings.SLOW_QUERY_COUNT_THRESHOLD = 0
+    budget = budget_f.create_budget()
+    budget_f.create_account(parent=budget, count=2)
+    api_client.force_login(user)
+    with caplog.at_level(logging.WARNING, logger='happybudget'):
+        response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    assert response.status_code == 200
+    records = [r for r in caplog.records if hasattr(r, 'num_queries')]
+    assert len(records) == 1
+    assert records[0].label == "GET /v1/budgets/%s/children/" % budget.pk
+    assert records[0].num_queries > 0
+    # The queries performed to retrieve the Budget are attributed to the view
+    # mixin that retrieves it.
+    assert "happybudget/app/views/mixins.py" in records[0].getMessage()
+
+
+def test_slow_query_log_task(settings, caplog, f):
+    settings.SLOW_QUERY_LOG_ENABLED = True
+    settings.SLOW_QUERY_COUNT_THRESHOLD = 1
+    budget = f.create_budget()
+    task = mock.MagicMock()
+    task.name = 'happybudget.app.group.tasks.find_and_delete_empty_groups'
+    with caplog.at_level(logging.WARNING, logger='happybudget'):
+        querylog.track_task_prerun(task_id='1', task=task)
+        list(budget.children.all())
+        list(budget.children.all())
+        querylog.track_task_postrun(task_id='1', task=task)
+    records = [r for r in caplog.records if hasattr(r, 'num_queries')]
+    assert len(records) == 1
+    assert records[0].label == f"Task {task.name}"
+    assert records[0].num_queries == 2
+    assert querylog._active_tasks == {}
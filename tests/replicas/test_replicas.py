@@ -0,0 +1,89 @@
+import pytest
+
+from django.db import connections
+
+from happybudget.app.replicas import read_from_replica, ReplicaRouter
+from happybudget.app.budget.models import Budget
+
+
+@pytest.fixture
+def replica(settings):
+    settings.REPLICA_DATABASE = 'replica'
+    return connections['replica']
+
+
+@pytest.fixture
+def replica_queries(replica):
+    queries = []
+
+    def wrapper(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with replica.execute_wrapper(wrapper):
+        yield queries
+
+
+def test_router_reads_from_replica_in_context(replica):
+    router = ReplicaRouter()
+    assert router.db_for_read(Budget) is None
+    with read_from_replica():
+        assert router.db_for_read(Budget) == 'replica'
+        with read_from_replica():
+            assert router.db_for_read(Budget) == 'replica'
+        assert router.db_for_read(Budget) == 'replica'
+    assert router.db_for_read(Budget) is None
+
+
+def test_router_does_not_read_from_unconfigured_replica(settings):
+    settings.REPLICA_DATABASE = None
+    with read_from_replica():
+        assert ReplicaRouter().db_for_read(Budget) is None
+
+
+def test_router_writes_replica_instances_to_default(replica):
+    router = ReplicaRouter()
+    budget = Budget(name="Test Budget")
+    budget._state.db = 'replica'
+    assert router.db_for_write(Budget, instance=budget) == 'default'
+    assert router.allow_migrate('replica', 'budget') is False
+    assert router.allow_migrate('default', 'budget') is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_children_reads_from_replica(api_client, user, f, replica_queries):
+    budget = f.create_budget()
+    f.create_account(parent=budget, count=2)
+    api_client.force_login(user)
+    response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    assert response.status_code == 200
+    assert response.json()['count'] == 2
+    assert len(replica_queries) != 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_pins_client_to_default(api_client, user, f, replica_queries):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.post(
+        "/v1/budgets/%s/children/" % budget.pk,
+        data={'identifier': '1000'}
+    )
+    assert response.status_code == 201
+    assert 'happybudgetpinned' in response.cookies
+
+    response = api_client.get("/v1/budgets/%s/children/" % budget.pk)
+    assert response.status_code == 200
+    assert response.json()['count'] == 1
+    assert replica_queries == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_writes_are_not_routed_to_replica(api_client, user, f,
+        replica_queries):
+    budget = f.create_budget()
+    api_client.force_login(user)
+    response = api_client.patch(
+        "/v1/budgets/%s/" % budget.pk, data={'name': 'Updated'})
+    assert response.status_code == 200
+    assert replica_queries == []
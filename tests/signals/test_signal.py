@@ -0,0 +1,81 @@
+import threading
+
+from happybudget.app import signals
+
+
+class Sender:
+    pass
+
+
+class OtherSender:
+    pass
+
+
+def test_disable_signal():
+    received = []
+    signal = signals.Signal(add_to_registry=False)
+
+    def receiver(**kwargs):
+        received.append(kwargs['sender'])
+
+    signal.connect(receiver, weak=False)
+    with signal.disable():
+        signal.send(sender=Sender)
+    signal.send(sender=Sender)
+    assert received == [Sender]
+
+
+def test_disable_signal_for_sender():
+    received = []
+    signal = signals.Signal(add_to_registry=False)
+
+    def sender_receiver(**kwargs):
+        received.append(('sender', kwargs['sender']))
+
+    def any_receiver(**kwargs):
+        received.append(('any', kwargs['sender']))
+
+    signal.connect(sender_receiver, sender=Sender, weak=False)
+    signal.connect(any_receiver, weak=False)
+    with signal.disable(sender=Sender):
+        signal.send(sender=Sender)
+        signal.send(sender=OtherSender)
+    assert received == [('any', Sender), ('any', OtherSender)]
+
+
+def test_disable_signals_only_disables_in_current_thread():
+    received = []
+    signal = signals.Signal(add_to_registry=False)
+
+    def receiver(**kwargs):
+        received.append(threading.current_thread().name)
+
+    signal.connect(receiver, weak=False)
+
+    thread = threading.Thread(
+        target=lambda: signal.send(sender=Sender), name='other')
+    with signals.disable(signals=[signal]):
+        signal.send(sender=Sender)
+        thread.start()
+        thread.join()
+    assert received == ['other']
+
+
+def test_disable_decorator_is_reentrant():
+    received = []
+    signal = signals.Signal(add_to_registry=False)
+
+    def receiver(**kwargs):
+        received.append(kwargs['sender'])
+
+    signal.connect(receiver, weak=False)
+
+    @signals.disable(signals=[signal])
+    def nested(depth):
+        if depth:
+            nested(depth - 1)
+        signal.send(sender=Sender)
+
+    nested(2)
+    signal.send(sender=OtherSender)
+    assert received == [OtherSender]
@@ -10,6 +10,7 @@ import pytest
 from stripe.util import convert_to_stripe_object
 
 from happybudget.app.billing import stripe
+from happybudget.app.billing.cache import stripe_cache as _stripe_cache
 
 
 def object_id(prefix, length=8):
@@ -54,6 +55,20 @@ def stripe_resource(object_type, prefix=None, required_kwargs=None):
     return decorated
 
 
+@pytest.fixture
+def stripe_cache(settings):
+    """
+    Enables the :obj:`StripeCache`, which is disabled by default in tests, and
+    ensures that it is empty before and after the test.
+    """
+    settings.STRIPE_CACHE_TTL = datetime.timedelta(minutes=5)
+    _stripe_cache.clear()
+    _stripe_cache.reset_stats()
+    yield _stripe_cache
+    _stripe_cache.clear()
+    _stripe_cache.reset_stats()
+
+
 @pytest.fixture
 def mock_stripe_data():
     return {
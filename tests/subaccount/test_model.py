@@ -1,4 +1,8 @@
+import pytest
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 def test_bulk_create_subaccounts(user, budget_f, models):
@@ -55,3 +59,45 @@ def test_bulk_create_subaccounts(user, budget_f, models):
     assert [b.identifier for b in subaccounts] == [
         "Sub Account 1", "Sub Account 3", "Sub Account 2"]
     assert all([b.budget == budget] for b in accounts)
+
+
+def count_inserts(queries, model_cls):
+    table = model_cls._meta.db_table
+    return len([
+        q for q in queries
+        if q['sql'].startswith(f'INSERT INTO "{table}"')
+    ])
+
+
+@pytest.mark.parametrize('batch_size,num_batches', [(None, 2), (3, 4)])
+def test_bulk_create_subaccounts_in_batches(user, budget_f, models, settings,
+        batch_size, num_batches):
+    settings.BULK_CREATE_BATCH_SIZES = {'sqlite': 5}
+    budget = budget_f.create_budget()
+    account = budget_f.create_account(parent=budget)
+    subaccounts = [
+        budget_f.subaccount_cls(
+            parent=account,
+            identifier=f"Sub Account {i}",
+            created_by=user,
+            updated_by=user
+        ) for i in range(10)
+    ]
+    with CaptureQueriesContext(connection) as context:
+        created_subaccounts = budget_f.subaccount_cls.objects.bulk_create(
+            subaccounts,
+            batch_size=batch_size,
+            return_created_objects=True
+        )
+    assert count_inserts(context.captured_queries, models.SubAccount) \
+        == num_batches
+    assert count_inserts(
+        context.captured_queries, budget_f.subaccount_cls) == num_batches
+
+    # The fields of the base model should be populated on each created child
+    # from the base model it points to.
+    assert [s.identifier for s in created_subaccounts] == [
+        f"Sub Account {i}" for i in range(10)]
+    assert all([s.parent == account for s in created_subaccounts])
+    assert all([s.created_by == user for s in created_subaccounts])
+    assert budget_f.subaccount_cls.objects.count() == 10
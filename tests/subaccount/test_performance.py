@@ -0,0 +1,14 @@
+import pytest
+
+
+pytestmark = pytest.mark.performance
+
+
+def test_get_subaccount_children_performance(api_client, user,
+        generated_budget, assert_performance):
+    subaccount = generated_budget.children.first().children.first()
+    api_client.force_login(user)
+    with assert_performance('get-subaccount-children'):
+        response = api_client.get(
+            "/v1/subaccounts/%s/children/" % subaccount.pk)
+    assert response.status_code == 200
@@ -1,5 +1,6 @@
 from happybudget.app import signals
-from happybudget.app.subaccount.tasks import fix_corrupted_fringe_relationships
+from happybudget.app.subaccount.tasks import (
+    fix_corrupted_fringe_relationships, get_corrupted_fringe_relationships)
 
 
 def test_find_and_remove_corrupted_fringe_relationships(f):
@@ -40,9 +41,36 @@ def test_find_and_remove_corrupted_fringe_relationships(f):
             )
         ]
 
-    fix_corrupted_fringe_relationships()
+    result = fix_corrupted_fringe_relationships()
+    assert result == {'scanned': 6, 'fixed': 2}
     assert [f.pk for f in subaccounts[0].fringes.all()] == [fringes[0].pk]
     assert [f.pk for f in subaccounts[1].fringes.all()] \
         == [fringes[0].pk, fringes[1].pk]
     assert [f.pk for f in subaccounts[2].fringes.all()] == []
     assert [f.pk for f in subaccounts[3].fringes.all()] == [fringes[2].pk]
+
+
+def test_find_corrupted_fringe_relationships_nested(f):
+    budgets = [f.create_budget(), f.create_budget()]
+    fringes = [
+        f.create_fringe(budget=budgets[0]),
+        f.create_fringe(budget=budgets[1]),
+    ]
+    account = f.create_account(parent=budgets[0])
+    parent_subaccount = f.create_subaccount(parent=account)
+    with signals.disable():
+        # Should be fixed - the nested SubAccount belongs to the first Budget
+        # through its parent SubAccount.
+        subaccount = f.create_subaccount(
+            parent=parent_subaccount,
+            fringes=[fringes[0], fringes[1]]
+        )
+
+    corrupted = get_corrupted_fringe_relationships()
+    assert [tuple(c) for c in corrupted] == [
+        (subaccount.pk, budgets[0].pk, fringes[1].pk, budgets[1].pk)]
+
+    result = fix_corrupted_fringe_relationships()
+    assert result == {'scanned': 2, 'fixed': 1}
+    assert [f.pk for f in subaccount.fringes.all()] == [fringes[0].pk]
+    assert get_corrupted_fringe_relationships() == []
@@ -0,0 +1,172 @@
+from io import BytesIO
+from PIL import Image
+import pytest
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+
+def assert_values_serialization_identical(api_client, path):
+    response = api_client.get(path)
+    assert response.status_code == 200
+    with override_settings(VALUES_SERIALIZATION_ENABLED=False):
+        expected = api_client.get(path)
+    assert expected.status_code == 200
+    assert response.content == expected.content
+    return response
+
+
+def create_table(budget_f, f, parent, budget):
+    unit = f.create_subaccount_unit()
+    fringes = [f.create_fringe(budget=budget) for _ in range(2)]
+    group = f.create_group(parent=parent)
+    subaccounts = [
+        budget_f.create_subaccount(
+            parent=parent,
+            unit=unit,
+            quantity=2.5,
+            rate=10,
+            multiplier=3,
+            fringes=fringes,
+            group=group
+        ),
+        budget_f.create_subaccount(
+            parent=parent,
+            quantity=None,
+            rate=None,
+            fringes=[fringes[1]]
+        ),
+        budget_f.create_subaccount(parent=parent, quantity=1, rate=5),
+    ]
+    budget_f.create_subaccount(parent=subaccounts[2], count=2, rate=1)
+    return subaccounts
+
+
+def test_budget_children_values_serialization(api_client, user, budget_f, f):
+    budget = budget_f.create_budget()
+    accounts = budget_f.create_account(parent=budget, count=3)
+    group = f.create_group(parent=budget)
+    budget_f.create_account(parent=budget, group=group, count=2)
+    budget_f.create_subaccount(parent=accounts[1], count=2)
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client, "/v1/budgets/%s/children/" % budget.pk)
+    assert response.json()['count'] == 5
+
+
+def test_account_children_values_serialization(api_client, user, budget_f, f):
+    budget = budget_f.create_budget()
+    account = budget_f.create_account(parent=budget)
+    subaccounts = create_table(budget_f, f, account, budget)
+    if budget_f.domain == 'budget':
+        subaccounts[0].attachments.set(f.create_attachment(count=2))
+        subaccounts[1].contact = f.create_contact()
+        subaccounts[1].save()
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client, "/v1/accounts/%s/children/" % account.pk)
+    assert response.json()['count'] == 3
+
+
+def test_subaccount_children_values_serialization(api_client, user, budget_f,
+        f):
+    budget = budget_f.create_budget()
+    account = budget_f.create_account(parent=budget)
+    subaccount = budget_f.create_subaccount(parent=account)
+    create_table(budget_f, f, subaccount, budget)
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client, "/v1/subaccounts/%s/children/" % subaccount.pk)
+    assert response.json()['count'] == 3
+
+
+def test_children_values_serialization_filtered_by_ids(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccounts = f.create_subaccount(parent=account, count=3)
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client,
+        "/v1/accounts/%s/children/?ids=%s,%s"
+        % (account.pk, subaccounts[2].pk, subaccounts[0].pk)
+    )
+    assert [r['id'] for r in response.json()['data']] == [
+        subaccounts[0].pk, subaccounts[2].pk]
+
+
+def test_actuals_values_serialization(api_client, user, f):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    subaccount = f.create_subaccount(parent=account)
+    markup = f.create_markup(parent=account)
+    actual_type = f.create_actual_type()
+    contact = f.create_contact()
+    actuals = [
+        f.create_actual(
+            budget=budget,
+            owner=subaccount,
+            actual_type=actual_type,
+            contact=contact
+        ),
+        f.create_actual(budget=budget, owner=markup, date=None),
+        f.create_actual(budget=budget, actual_type=actual_type),
+    ]
+    actuals[0].attachments.set(f.create_attachment(count=2))
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client, "/v1/budgets/%s/actuals/" % budget.pk)
+    assert response.json()['count'] == 3
+
+
+def test_contacts_values_serialization(api_client, user, f):
+    image = BytesIO()
+    Image.new('RGB', (100, 100)).save(image, 'jpeg')
+    contacts = [
+        f.create_contact(
+            image=SimpleUploadedFile('contact.jpeg', image.getvalue())),
+        f.create_contact(first_name=None),
+        f.create_contact(last_name=None, contact_type=None),
+    ]
+    contacts[1].attachments.set(f.create_attachment(count=2))
+
+    api_client.force_login(user)
+    response = assert_values_serialization_identical(
+        api_client, "/v1/contacts/")
+    assert response.json()['count'] == 3
+
+    assert_values_serialization_identical(
+        api_client, "/v1/contacts/?search=%s" % contacts[0].first_name)
+
+
+@pytest.mark.parametrize('path', [
+    "/v1/budgets/{budget}/children/",
+    "/v1/accounts/{account}/children/",
+    "/v1/budgets/{budget}/actuals/",
+    "/v1/contacts/",
+])
+def test_values_serialization_queries_independent_of_table_size(api_client,
+        user, f, django_assert_max_num_queries, path):
+    budget = f.create_budget()
+    account = f.create_account(parent=budget)
+    unit = f.create_subaccount_unit()
+    actual_type = f.create_actual_type()
+    fringe = f.create_fringe(budget=budget)
+    for _ in range(25):
+        f.create_account(parent=budget)
+        subaccount = f.create_subaccount(
+            parent=account, unit=unit, fringes=[fringe])
+        subaccount.attachments.set([f.create_attachment()])
+        f.create_actual(
+            budget=budget, owner=subaccount, actual_type=actual_type)
+        f.create_contact().attachments.set([f.create_attachment()])
+
+    api_client.force_login(user)
+    path = path.format(budget=budget.pk, account=account.pk)
+    with django_assert_max_num_queries(20):
+        response = api_client.get(path)
+    assert response.json()['count'] in (25, 26)
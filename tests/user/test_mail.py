@@ -0,0 +1,105 @@
+import datetime
+import mock
+import pytest
+
+from django.test import TestCase, override_settings
+
+from happybudget.app.user.exceptions import EmailError
+from happybudget.app.user.mail import (
+    PasswordRecoveryMail, LocMemBackend, get_template)
+from happybudget.app.user.models import EmailDelivery
+from happybudget.app.user.tasks import (
+    delete_expired_email_deliveries, send_mail)
+
+
+@pytest.fixture
+def outbox():
+    LocMemBackend.outbox.clear()
+    yield LocMemBackend.outbox
+    LocMemBackend.outbox.clear()
+
+
+@pytest.fixture
+def message_data(user):
+    return PasswordRecoveryMail(user, token=None).to_message_data()
+
+
+@override_settings(EMAIL_ENABLED=True)
+def test_send_mail_synchronously(user, outbox):
+    user.send_password_recovery_email()
+    assert len(outbox) == 1
+    assert outbox[0].to == [{'email': user.email}]
+    assert outbox[0].template_id == get_template("password_recovery").id
+
+
+@override_settings(EMAIL_ENABLED=True, EMAIL_ASYNC=True)
+def test_send_mail_asynchronously(user, outbox):
+    mail = PasswordRecoveryMail(user, token=None)
+    with mock.patch.object(send_mail, 'delay') as m:
+        with TestCase.captureOnCommitCallbacks(execute=False) as callbacks:
+            mail.send()
+        # The task is not delivered until the transaction is committed.
+        assert m.mock_calls == []
+        assert len(callbacks) == 1
+        callbacks[0]()
+    assert outbox == []
+    assert m.mock_calls == [mock.call(
+        mail.to_message_data(),
+        idempotency_key=mail.idempotency_key
+    )]
+
+
+def test_send_mail_task_is_idempotent(message_data, outbox):
+    assert send_mail.apply(
+        args=(message_data, ), kwargs={'idempotency_key': 'key'}).get() is True
+    assert send_mail.apply(
+        args=(message_data, ), kwargs={'idempotency_key': 'key'}).get() \
+        is False
+    assert len(outbox) == 1
+    assert outbox[0].params == message_data['params']
+    assert EmailDelivery.objects.filter(idempotency_key='key').count() == 1
+
+
+@pytest.mark.freeze_time('2020-01-01')
+def test_send_mail_task_idempotency_expires(message_data, outbox, freezer):
+    assert send_mail.apply(
+        args=(message_data, ), kwargs={'idempotency_key': 'key'}).get() is True
+    freezer.move_to(datetime.datetime(2020, 1, 1, 2))
+    assert send_mail.apply(
+        args=(message_data, ), kwargs={'idempotency_key': 'key'}).get() is True
+    assert len(outbox) == 2
+
+
+@pytest.mark.freeze_time
+def test_delete_expired_email_deliveries(freezer):
+    freezer.move_to('2020-01-01')
+    EmailDelivery.objects.create(idempotency_key='expired')
+    freezer.move_to('2020-01-01 02:00')
+    delivery = EmailDelivery.objects.create(idempotency_key='key')
+    assert delete_expired_email_deliveries() == {'deleted': 1}
+    assert list(EmailDelivery.objects.all()) == [delivery]
+
+
+def test_send_mail_task_retries(message_data, outbox):
+    original_send = LocMemBackend.send
+    attempts = []
+
+    def fail_once(backend, message):
+        attempts.append(message)
+        if len(attempts) == 1:
+            raise EmailError()
+        return original_send(backend, message)
+
+    with mock.patch.object(LocMemBackend, 'send', fail_once):
+        send_mail.apply(
+            args=(message_data, ), kwargs={'idempotency_key': 'key'})
+    assert len(attempts) == 2
+    assert len(outbox) == 1
+
+
+@override_settings(EMAIL_ENABLED=True, EMAIL_ASYNC=True)
+def test_send_mail_synchronously_overrides_setting(user, outbox):
+    with mock.patch.object(send_mail, 'delay') as m:
+        user.send_password_recovery_email(asynchronous=False)
+    assert m.mock_calls == []
+    assert len(outbox) == 1
@@ -1,5 +1,7 @@
 import pytest
 
+from django.test import override_settings
+
 
 @pytest.mark.parametrize('filename,directory,expected', [
     ('SavedFile.jpg', 'd', 'users/1/temp/d/savedfile.jpg'),
@@ -35,3 +37,46 @@ def test_upload_temp_user_file_to(user, filename, directory, expected):
 ])
 def test_upload_user_file_to(user, filename, directory, expected):
     assert user.upload_file_to(filename, directory=directory) == expected
+
+
+def test_user_metrics(user, staff_user, f, django_assert_num_queries):
+    another_user = f.create_user()
+    budgets = f.create_budget(count=3)
+    f.create_budget(archived=True)
+    f.create_template(count=2)
+    f.create_template(community=True, created_by=staff_user)
+    collaborated = f.create_budget(count=2, created_by=another_user)
+    f.create_collaborator(instance=collaborated[0], user=user)
+    f.create_collaborator(instance=collaborated[1], user=user)
+    # Collaborators on the User's own Budget(s) should not affect the counts.
+    f.create_collaborator(instance=budgets[0], user=another_user)
+    f.create_collaborator(instance=budgets[1], user=f.create_user())
+
+    with django_assert_num_queries(1):
+        assert user.metrics == {
+            'num_budgets': 4,
+            'num_archived_budgets': 1,
+            'num_templates': 2,
+            'num_collaborating_budgets': 2
+        }
+    # Community Template(s) should not be counted.
+    assert staff_user.num_templates == 0
+
+
+@override_settings(CACHE_ENABLED=True)
+def test_user_metrics_cache_invalidated(user, f, django_assert_num_queries):
+    f.create_budget()
+    assert user.num_budgets == 1
+    with django_assert_num_queries(1):
+        # The cached metrics should be retrieved from the database cache.
+        assert user.num_budgets == 1
+
+    f.create_budget()
+    assert user.num_budgets == 2
+
+    collaborated = f.create_budget(created_by=f.create_user())
+    collaborator = f.create_collaborator(instance=collaborated, user=user)
+    assert user.num_collaborating_budgets == 1
+
+    collaborator.delete()
+    assert user.num_collaborating_budgets == 0
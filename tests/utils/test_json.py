@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+
+from happybudget.lib.drf.parsers import JSONParser
+from happybudget.lib.drf.renderers import JSONRenderer
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    {'value': 1.5, 'count': 4, 'name': 'Budget', 'empty': None},
+    {'value': decimal.Decimal('10.25'), 'other': decimal.Decimal('0')},
+    {'created_at': datetime.datetime(
+        2022, 1, 1, 12, 30, 45, 123456, tzinfo=datetime.timezone.utc)},
+    {'created_at': datetime.datetime(2022, 1, 1, 12, 30, 45)},
+    {'date': datetime.date(2022, 1, 1), 'time': datetime.time(12, 30, 45, 5)},
+    {'duration': datetime.timedelta(days=1, seconds=5)},
+    {'id': uuid.UUID('f47ac10b-58cc-4372-a567-0e02b2c3d479')},
+    {'large': 1.5e16, 'small': 0.00005, 'exponent': 1e-07},
+    {'large': decimal.Decimal('1e20'), 'small': decimal.Decimal('0.00001')},
+    {'integer': 2 ** 70},
+    {'text': 'Line separator \u2028 and paragraph separator \u2029'},
+    {'text': 'Unicode é and control \x00 characters', 'color': '#3e3e3e'},
+    {1: 'Non string key'},
+    [{'nested': [1, 2.5, {'deep': (1, 2)}]}, 'string', True, False],
+])
+def test_renderer_output_identical(data):
+    expected = renderers.JSONRenderer().render(data)
+    assert JSONRenderer().render(data) == expected
+
+
+def test_renderer_output_identical_indent():
+    data = {'value': 1.5, 'children': [1, 2]}
+    expected = renderers.JSONRenderer().render(
+        data, 'application/json; indent=4')
+    assert JSONRenderer().render(data, 'application/json; indent=4') \
+        == expected
+
+
+@pytest.mark.parametrize('body', [
+    b'{"value": 1.5, "name": "Budget", "children": [1, 2, null]}',
+    b'{"integer": 12345678901234567890123}',
+    '{"text": "Unicode é"}'.encode('utf-8'),
+    b'[]',
+])
+def test_parser_output_identical(body):
+    expected = parsers.JSONParser().parse(io.BytesIO(body))
+    assert JSONParser().parse(io.BytesIO(body)) == expected
+
+
+@pytest.mark.parametrize('body', [
+    b'{"value": NaN}',
+    b'{"value": 1.5',
+    b'',
+])
+def test_parser_errors_identical(body):
+    with pytest.raises(ParseError) as expected:
+        parsers.JSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError) as e:
+        JSONParser().parse(io.BytesIO(body))
+    assert str(e.value) == str(expected.value)
@@ -0,0 +1,97 @@
+import logging
+
+from happybudget.lib.logging.handlers import (
+    QueueListener, QueueHandler, enqueue_handlers)
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_enqueue_handlers():
+    handler = CollectingHandler()
+    lg = logging.getLogger('happybudget.tests.queue')
+    lg.handlers = [handler]
+    lg.setLevel(logging.DEBUG)
+
+    listener = enqueue_handlers([lg])
+    try:
+        assert len(lg.handlers) == 1
+        assert isinstance(lg.handlers[0], QueueHandler)
+        data = {'foo': 'bar'}
+        lg.info("Data: %s", data)
+        data['foo'] = 'baz'
+    finally:
+        listener.shutdown()
+
+    assert [r.getMessage() for r in handler.records] == [
+        "Data: {'foo': 'bar'}"]
+
+
+def test_enqueue_handlers_respects_handler_level():
+    handler = CollectingHandler(level=logging.WARNING)
+    lg = logging.getLogger('happybudget.tests.queue.level')
+    lg.handlers = [handler]
+    lg.setLevel(logging.DEBUG)
+
+    listener = enqueue_handlers([lg])
+    try:
+        lg.info("Info")
+        lg.warning("Warning")
+    finally:
+        listener.shutdown()
+    assert [r.getMessage() for r in handler.records] == ["Warning"]
+
+
+def test_queue_handler_drops_records_when_full():
+    # The listener is not started, such that the queue is never consumed.
+    listener = QueueListener(maxsize=2)
+    handler = QueueHandler(listener=listener, route='test')
+    lg = logging.getLogger('happybudget.tests.queue.full')
+    lg.handlers = [handler]
+    lg.setLevel(logging.DEBUG)
+    lg.propagate = False
+
+    for i in range(5):
+        lg.info("Record %s", i)
+    assert listener.queue.qsize() == 2
+    assert listener.dropped == 3
+
+
+def test_queue_handler_samples_debug_records():
+    listener = QueueListener(maxsize=10)
+    handler = QueueHandler(
+        listener=listener, route='test', debug_sample_rate=0.0)
+    lg = logging.getLogger('happybudget.tests.queue.sampled')
+    lg.handlers = [handler]
+    lg.setLevel(logging.DEBUG)
+    lg.propagate = False
+
+    lg.debug("Debug")
+    lg.info("Info")
+    assert listener.queue.qsize() == 1
+    assert listener.sampled == 1
+
+
+def test_listener_reset():
+    handler = CollectingHandler()
+    lg = logging.getLogger('happybudget.tests.queue.reset')
+    lg.handlers = [handler]
+    lg.setLevel(logging.DEBUG)
+
+    listener = enqueue_handlers([lg])
+    try:
+        original_queue = listener.queue
+        listener.stop()
+        # Simulate the listener being reset after the process is forked.
+        listener.reset()
+        assert listener.queue is not original_queue
+        lg.info("After Reset")
+    finally:
+        listener.shutdown()
+    assert [r.getMessage() for r in handler.records] == ["After Reset"]